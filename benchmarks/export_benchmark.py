@@ -0,0 +1,118 @@
+"""Check that the streaming export keeps memory flat as the export grows.
+
+Streams one user's projects, then the whole table, through the ASGI app and
+asserts the peak RSS grew by less than ``--max-growth-mb`` in between.
+
+Usage: ``uv run python -m benchmarks.export_benchmark --users 1000 --per-user 1000``
+"""
+
+import argparse
+import asyncio
+import resource
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from starlette.types import Message
+
+from benchmarks.seed import seed, truncate
+from db import sessionmanager
+from main import app
+from models import User
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def export(user_id: Optional[int], export_format: str) -> Dict[str, float]:
+    """Run one export, discarding the body as it is sent."""
+    query = f"format={export_format}"
+    if user_id is not None:
+        query += f"&user_id={user_id}"
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/projects/export",
+        "raw_path": b"/api/projects/export",
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    sent = {"bytes": 0, "lines": 0}
+
+    async def receive() -> Message:
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            sent["bytes"] += len(body)
+            sent["lines"] += body.count(b"\n")
+
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": sent["lines"],
+        "mb": round(sent["bytes"] / 2**20, 1),
+        "rows_per_s": round(sent["lines"] / elapsed),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+async def main(users: int, per_user: int, max_growth_mb: float, keep: bool) -> None:
+    sessionmanager.init_db()
+    assert sessionmanager.engine and sessionmanager.session_factory
+    await seed(sessionmanager.engine, users=users, projects_per_user=per_user)
+
+    try:
+        async with sessionmanager.session_factory() as db:
+            user_id = (
+                await db.execute(select(User.id).where(User.username == "bench_user_1"))
+            ).scalar_one()
+
+        small = await export(user_id, "ndjson")
+        full_ndjson = await export(None, "ndjson")
+        full_csv = await export(None, "csv")
+        growth = (
+            max(full_ndjson["peak_rss_mb"], full_csv["peak_rss_mb"])
+            - small["peak_rss_mb"]
+        )
+
+        logger.info(
+            "Export benchmark",
+            extra={
+                "one_user": small,
+                "all_ndjson": full_ndjson,
+                "all_csv": full_csv,
+                "rss_growth_mb": round(growth, 1),
+            },
+        )
+        assert growth < max_growth_mb, (
+            f"Peak RSS grew by {growth:.1f} MB exporting the whole table"
+        )
+    finally:
+        if not keep:
+            await truncate(sessionmanager.engine)
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--per-user", type=int, default=1000)
+    parser.add_argument("--max-growth-mb", type=float, default=32.0)
+    parser.add_argument("--keep", action="store_true", help="keep seeded rows")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.per_user, args.max_growth_mb, args.keep))
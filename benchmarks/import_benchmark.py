@@ -0,0 +1,117 @@
+"""Measure import throughput in rows/sec.
+
+Compares the COPY-based import pipeline for users and projects against the
+multi-row INSERT used by ``POST /api/projects/bulk``.
+
+Usage: ``uv run python -m benchmarks.import_benchmark --rows 200000``
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Dict, List
+
+from sqlalchemy import select
+
+from benchmarks.seed import seed, truncate
+from db import sessionmanager
+from dependencies.import_operations import ImportOperations
+from dependencies.project_operations import ProjectOperations
+from models import User
+from schemas.project_schemas import ProjectCreateSchema
+from utils.constants import MAX_BULK_ITEMS
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+def project_record(index: int, user_ids: List[int]) -> Dict:
+    return {
+        "user_id": user_ids[index % len(user_ids)],
+        "project_name": f"Imported {index}",
+        "description": "Imported project description. " * 10,
+        "highlights": ["Migrated", "Imported"],
+        "technologies_used": ["Python"],
+        "start_date": "2024-01-01",
+        "display_order": index,
+    }
+
+
+async def ndjson_chunks(records: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    lines: List[bytes] = []
+    async for record in records:
+        lines.append(json.dumps(record).encode() + b"\n")
+        if len(lines) == 1000:
+            yield b"".join(lines)
+            lines = []
+    if lines:
+        yield b"".join(lines)
+
+
+async def projects(rows: int, user_ids: List[int]) -> AsyncIterator[Dict]:
+    for i in range(rows):
+        yield project_record(i, user_ids)
+
+
+async def users(rows: int) -> AsyncIterator[Dict]:
+    for i in range(rows):
+        yield {"username": f"import_{i}", "email": f"import_{i}@example.com"}
+
+
+async def main(rows: int, bulk_rows: int, keep: bool) -> None:
+    sessionmanager.init_db()
+    assert sessionmanager.engine and sessionmanager.session_factory
+    await seed(sessionmanager.engine, users=100, projects_per_user=0)
+
+    try:
+        async with sessionmanager.session_factory() as db:
+            user_ids = list(
+                await db.scalars(select(User.id).where(User.username.like("bench_%")))
+            )
+
+            start = time.perf_counter()
+            user_result = await ImportOperations(db).import_users(
+                ndjson_chunks(users(rows)), "ndjson"
+            )
+            users_per_s = user_result.inserted / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            project_result = await ImportOperations(db).import_projects(
+                ndjson_chunks(projects(rows, user_ids)), "ndjson"
+            )
+            copy_per_s = project_result.inserted / (time.perf_counter() - start)
+
+            ops = ProjectOperations(db)
+            payloads = [
+                ProjectCreateSchema.model_validate(project_record(i, user_ids))
+                for i in range(bulk_rows)
+            ]
+            start = time.perf_counter()
+            for offset in range(0, bulk_rows, MAX_BULK_ITEMS):
+                await ops.create_projects(payloads[offset : offset + MAX_BULK_ITEMS])
+            bulk_per_s = bulk_rows / (time.perf_counter() - start)
+
+        logger.info(
+            "Import benchmark",
+            extra={
+                "rows": rows,
+                "copy_users_rows_per_s": round(users_per_s),
+                "copy_projects_rows_per_s": round(copy_per_s),
+                "bulk_insert_rows": bulk_rows,
+                "bulk_insert_rows_per_s": round(bulk_per_s),
+            },
+        )
+    finally:
+        if not keep:
+            await truncate(sessionmanager.engine)
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--bulk-rows", type=int, default=20000)
+    parser.add_argument("--keep", action="store_true", help="keep imported rows")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.bulk_rows, args.keep))
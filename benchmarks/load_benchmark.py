@@ -0,0 +1,337 @@
+"""Replay a weighted request mix against the app and compare with a baseline.
+
+Each line of the trace file is one endpoint of the mix::
+
+    {"name": "users.get", "method": "GET", "path": "/api/users/{user_id}",
+     "params": {}, "json": null, "weight": 20}
+
+Strings may reference the seeded fixtures: ``{user_id}``, ``{writer_user_id}``,
+``{disposable_user_id}`` (a fresh user per request, for deletes),
+``{portfolio_10}``, ``{portfolio_100}``, ``{portfolio_1000}`` (users with that
+many projects), ``{project_id}`` (a project of ``{portfolio_10}``) and
+``{unique}``. Requests go straight to the ASGI app with ``--concurrency``
+clients; latency percentiles, RPS and DB queries per request are reported
+per endpoint. Results are compared with ``--baseline`` and the run exits
+non-zero on a regression; ``--save-baseline`` records a new one.
+
+Usage: ``uv run python -m benchmarks.load_benchmark --requests 2000``
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import delete, insert, select, text
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from db import sessionmanager
+from main import app
+from models import Project, User
+from settings import settings
+from utils.logger import get_logger, request_ctx_var
+
+logger = get_logger()
+
+BENCHMARKS_DIR = Path(__file__).parent
+DEFAULT_TRACE = BENCHMARKS_DIR / "traces" / "default_mix.jsonl"
+DEFAULT_BASELINE = BENCHMARKS_DIR / "baselines" / "load_baseline.json"
+PORTFOLIO_SIZES = (10, 100, 1000)
+CREATE_USER_PATH = "/api/users/create"
+
+PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+SEED_PORTFOLIO = text(
+    """
+    INSERT INTO projects (
+        user_id, project_name, description, highlights, technologies_used,
+        is_featured, display_order, is_active, created_at
+    )
+    SELECT
+        :user_id,
+        'Project ' || p,
+        repeat('Load test project description. ', 20),
+        '["Shipped on time", "Reduced latency"]'::json,
+        '["Python", "PostgreSQL"]'::json,
+        p % 10 = 0,
+        p,
+        true,
+        now()
+    FROM generate_series(1, :projects) AS p
+    """
+)
+
+
+def record_db_queries(app: ASGIApp, counts: Dict[str, int]) -> ASGIApp:
+    """Wrap ``app`` to store each request's ``db_queries`` by request ID.
+
+    The count is read from the request context as the last body message is
+    sent, while the request's context is still current.
+    """
+
+    async def recording_app(scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_recording(message: Message) -> None:
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                ctx = request_ctx_var.get()
+                if ctx:
+                    counts[ctx.request_id] = ctx.db_queries
+            await send(message)
+
+        await app(scope, receive, send_recording)
+
+    return recording_app
+
+
+def load_trace(path: Path) -> List[Dict[str, Any]]:
+    with path.open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def uses_disposable_user(entry: Dict[str, Any]) -> bool:
+    return "{disposable_user_id}" in json.dumps(entry)
+
+
+def schedule(
+    trace: List[Dict[str, Any]], requests: int, seed: int
+) -> List[Dict[str, Any]]:
+    """Draw ``requests`` entries from the trace according to their weights."""
+    rng = random.Random(seed)
+    weights = [entry.get("weight", 1) for entry in trace]
+    return rng.choices(trace, weights=weights, k=requests)
+
+
+class Fixtures:
+    """Users and projects the trace placeholders resolve to.
+
+    ``user_ids`` holds every user this run seeded or created, so that only
+    those are removed afterwards.
+    """
+
+    def __init__(
+        self, values: Dict[str, int], disposable: List[int], user_ids: List[int]
+    ) -> None:
+        self.values = values
+        self.disposable: Iterator[int] = iter(disposable)
+        self.user_ids = user_ids
+
+    def resolve(self, name: str) -> Any:
+        if name == "unique":
+            return uuid4().hex[:12]
+        if name == "disposable_user_id":
+            return next(self.disposable)
+        return self.values[name]
+
+    def render(self, value: Any) -> Any:
+        """Substitute placeholders, keeping ints for values that are only one."""
+        if isinstance(value, str):
+            whole = PLACEHOLDER.fullmatch(value)
+            if whole:
+                return self.resolve(whole.group(1))
+            return PLACEHOLDER.sub(lambda m: str(self.resolve(m.group(1))), value)
+        if isinstance(value, list):
+            return [self.render(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self.render(item) for key, item in value.items()}
+        return value
+
+
+async def seed_fixtures(prefix: str, disposable: int) -> Fixtures:
+    assert sessionmanager.session_factory
+    names = ["user", "writer", *(f"portfolio_{n}" for n in PORTFOLIO_SIZES)]
+    names += [f"disposable_{i}" for i in range(disposable)]
+
+    async with sessionmanager.session_factory() as db:
+        result = await db.execute(
+            insert(User)
+            .returning(User.username, User.id)
+            .values(
+                [
+                    {"username": f"{prefix}{name}", "email": f"{prefix}{name}@x.com"}
+                    for name in names
+                ]
+            )
+        )
+        ids = {username[len(prefix) :]: user_id for username, user_id in result}
+        for size in PORTFOLIO_SIZES:
+            await db.execute(
+                SEED_PORTFOLIO,
+                {"user_id": ids[f"portfolio_{size}"], "projects": size},
+            )
+        project_id = await db.scalar(
+            select(Project.id)
+            .where(Project.user_id == ids["portfolio_10"])
+            .order_by(Project.id)
+            .limit(1)
+        )
+        await db.commit()
+
+    assert project_id is not None
+    values = {
+        "user_id": ids["user"],
+        "writer_user_id": ids["writer"],
+        "project_id": project_id,
+        **{f"portfolio_{n}": ids[f"portfolio_{n}"] for n in PORTFOLIO_SIZES},
+    }
+    return Fixtures(
+        values,
+        [ids[f"disposable_{i}"] for i in range(disposable)],
+        list(ids.values()),
+    )
+
+
+async def remove_fixtures(fixtures: Fixtures) -> None:
+    """Delete the seeded users and the ones the mix created, with their projects."""
+    assert sessionmanager.session_factory
+    async with sessionmanager.session_factory() as db:
+        await db.execute(delete(User).where(User.id.in_(fixtures.user_ids)))
+        await db.commit()
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+async def replay(
+    plan: List[Dict[str, Any]], fixtures: Fixtures, concurrency: int
+) -> Dict[str, Any]:
+    timings: Dict[str, List[float]] = {}
+    queries: Dict[str, List[int]] = {}
+    errors: Dict[str, int] = {}
+    db_queries: Dict[str, int] = {}
+    pending = iter(plan)
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        for entry in pending:
+            name = entry["name"]
+            request_id = uuid4().hex
+            start = time.perf_counter()
+            response = await client.request(
+                entry["method"],
+                fixtures.render(entry["path"]),
+                params=fixtures.render(entry.get("params")),
+                json=fixtures.render(entry.get("json")),
+                headers={"X-Request-ID": request_id},
+            )
+            elapsed = time.perf_counter() - start
+            timings.setdefault(name, []).append(elapsed * 1000)
+            queries.setdefault(name, []).append(db_queries.pop(request_id))
+            if response.status_code >= 400:
+                errors[name] = errors.get(name, 0) + 1
+            elif entry["method"] == "POST" and entry["path"] == CREATE_USER_PATH:
+                fixtures.user_ids.append(response.json()["id"])
+
+    transport = httpx.ASGITransport(app=record_db_queries(app, db_queries))
+    async with httpx.AsyncClient(transport=transport, base_url="http://load") as c:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(c) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    endpoints = {}
+    for name in sorted(timings):
+        ordered = sorted(timings[name])
+        endpoints[name] = {
+            "requests": len(ordered),
+            "errors": errors.get(name, 0),
+            "p50_ms": round(percentile(ordered, 0.50), 3),
+            "p95_ms": round(percentile(ordered, 0.95), 3),
+            "p99_ms": round(percentile(ordered, 0.99), 3),
+            "queries": round(statistics.mean(queries[name]), 2),
+            "max_queries": max(queries[name]),
+        }
+    return {"rps": round(len(plan) / elapsed, 1), "endpoints": endpoints}
+
+
+def regressions(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Describe every way ``results`` is worse than ``baseline``."""
+    found = []
+    if results["rps"] < baseline["rps"] * (1 - tolerance):
+        found.append(f"rps {results['rps']} < baseline {baseline['rps']}")
+
+    for name, current in results["endpoints"].items():
+        previous = baseline["endpoints"].get(name)
+        if previous is None:
+            continue
+        if current["max_queries"] > previous["max_queries"]:
+            found.append(
+                f"{name}: max_queries {current['max_queries']} "
+                f"> baseline {previous['max_queries']}"
+            )
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            found.append(
+                f"{name}: p95_ms {current['p95_ms']} > baseline {previous['p95_ms']}"
+            )
+        if current["errors"] > previous["errors"]:
+            found.append(
+                f"{name}: errors {current['errors']} > baseline {previous['errors']}"
+            )
+    return found
+
+
+async def main(args: argparse.Namespace) -> int:
+    # Access logs would dominate the profile; the rate limiter is not under test
+    settings.LOG_ACCESS_SAMPLE_RATE = 0.0
+
+    sessionmanager.init_db()
+
+    plan = schedule(load_trace(args.trace), args.requests, args.seed)
+    deletes = [uses_disposable_user(entry) for entry in plan]
+    warmup = [entry for entry, delete in zip(plan, deletes) if not delete][
+        : len(plan) // 10
+    ]
+    fixtures = await seed_fixtures(f"load_{uuid4().hex[:8]}_", sum(deletes))
+    try:
+        # Warm the pool and caches so the first requests are not outliers
+        await replay(warmup, fixtures, 1)
+        results = await replay(plan, fixtures, args.concurrency)
+    finally:
+        await remove_fixtures(fixtures)
+        await sessionmanager.close()
+
+    logger.info(
+        "Load benchmark",
+        extra={
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            **results,
+        },
+    )
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        logger.info("Saved load baseline", extra={"path": str(args.baseline)})
+        return 0
+
+    if not args.baseline.exists():
+        return 0
+    found = regressions(results, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in found:
+        logger.warning("Load regression: %s", regression)
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trace", type=Path, default=DEFAULT_TRACE)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the request mix")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown of p95 latency and RPS",
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args)))
@@ -0,0 +1,50 @@
+"""Measure the per-request cost of the metrics middleware.
+
+Compares the bare health endpoint with the same app wrapped in
+``MetricsMiddleware``, and times rendering ``/metrics``. Metrics are kept in
+process memory unless ``METRICS_DIR`` is set, in which case the file-backed
+multiprocess mode used under gunicorn is measured.
+
+Usage: ``uv run python -m benchmarks.metrics_benchmark --requests 20000``
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict
+
+from benchmarks.middleware_benchmark import build_app, us_per_request
+from settings import settings
+from utils.logger import get_logger
+from utils.metrics import render_metrics
+from utils.middleware import MetricsMiddleware
+
+logger = get_logger()
+
+
+async def main(requests: int) -> None:
+    settings.LOG_ACCESS_SAMPLE_RATE = 0.0
+    mode = "multiprocess" if settings.METRICS_DIR else "memory"
+
+    results: Dict[str, float] = {
+        "none_us_per_request": round(
+            await us_per_request(build_app("none"), requests), 2
+        )
+    }
+
+    app = build_app("none")
+    app.add_middleware(MetricsMiddleware)
+    results[f"{mode}_us_per_request"] = round(await us_per_request(app, requests), 2)
+
+    start = time.perf_counter()
+    render_metrics()
+    results[f"{mode}_render_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+    logger.info("Metrics benchmark", extra={"requests": requests, **results})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
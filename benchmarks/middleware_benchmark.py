@@ -0,0 +1,109 @@
+"""Compare the request-context middleware with the BaseHTTPMiddleware it replaced.
+
+Each variant wraps the same ``/`` health endpoint and is called directly
+through ASGI, so the numbers are the per-request cost of the middleware stack
+without any HTTP server or client in the way.
+
+Usage: ``uv run python -m benchmarks.middleware_benchmark --requests 20000``
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict
+from uuid import uuid4
+
+from fastapi import FastAPI, Request
+from starlette.types import ASGIApp, Message
+
+from settings import settings
+from utils.logger import (
+    RequestContextVar,
+    get_logger,
+    request_ctx_var,
+    sample_access_log,
+)
+from utils.middleware import RequestContextMiddleware
+
+logger = get_logger()
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/")
+    async def healthz() -> str:
+        return "ok!"
+
+    if variant == "base_http":
+
+        @app.middleware("http")
+        async def logging_middleware(request: Request, call_next):
+            request_id = str(uuid4())
+            request_ctx_var.set(
+                RequestContextVar(
+                    request_id=request_id,
+                    request_path=f"{request.method} {request.url.path}",
+                )
+            )
+            if sample_access_log():
+                logger.info("REquest log")
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            return response
+
+    elif variant == "pure_asgi":
+        app.add_middleware(RequestContextMiddleware)
+
+    return app
+
+
+async def us_per_request(app: ASGIApp, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        pass
+
+    for _ in range(requests // 10):
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    # Access logging costs the same in both variants; leave it out of the numbers
+    settings.LOG_ACCESS_SAMPLE_RATE = 0.0
+
+    results: Dict[str, float] = {}
+    for variant in ("none", "base_http", "pure_asgi"):
+        results[f"{variant}_us_per_request"] = round(
+            await us_per_request(build_app(variant), requests), 2
+        )
+
+    logger.info("Middleware benchmark", extra={"requests": requests, **results})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
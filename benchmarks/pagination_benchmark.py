@@ -0,0 +1,90 @@
+"""Compare offset and keyset pagination latency on the first and a deep page.
+
+Usage: ``uv run python -m benchmarks.pagination_benchmark --page 10000 --limit 10``
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import select
+
+from benchmarks.seed import seed, truncate
+from db import sessionmanager
+from dependencies.project_operations import ProjectOperations
+from models import Project, User
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+async def median_ms(fn: Callable[[], Awaitable[object]], repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def main(page: int, limit: int, repeat: int, keep: bool) -> None:
+    sessionmanager.init_db()
+    assert sessionmanager.engine and sessionmanager.session_factory
+    await seed(sessionmanager.engine, users=1, projects_per_user=(page + 1) * limit)
+
+    try:
+        async with sessionmanager.session_factory() as db:
+            user_id = (
+                await db.execute(select(User.id).where(User.username == "bench_user_1"))
+            ).scalar_one()
+            ops = ProjectOperations(db)
+            skip = (page - 1) * limit
+
+            # Keyset of the row just before the deep page
+            boundary = (
+                await db.execute(
+                    select(Project.display_order, Project.id)
+                    .where(Project.user_id == user_id)
+                    .order_by(Project.display_order, Project.id)
+                    .offset(skip - 1)
+                    .limit(1)
+                )
+            ).one()
+            after = (boundary.display_order, boundary.id)
+
+            offset_first = await median_ms(
+                lambda: ops.get_all_projects(user_id, skip=0, limit=limit), repeat
+            )
+            offset_deep = await median_ms(
+                lambda: ops.get_all_projects(user_id, skip=skip, limit=limit), repeat
+            )
+            keyset_deep = await median_ms(
+                lambda: ops.get_all_projects(user_id, limit=limit, after=after), repeat
+            )
+
+        logger.info(
+            "Pagination benchmark",
+            extra={
+                "page": page,
+                "limit": limit,
+                "offset_page_1_ms": round(offset_first, 2),
+                "offset_deep_page_ms": round(offset_deep, 2),
+                "keyset_deep_page_ms": round(keyset_deep, 2),
+            },
+        )
+    finally:
+        if not keep:
+            await truncate(sessionmanager.engine)
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="keep seeded rows")
+    args = parser.parse_args()
+    asyncio.run(main(args.page, args.limit, args.repeat, args.keep))
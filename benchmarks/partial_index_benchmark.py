@@ -0,0 +1,116 @@
+"""Show the active/featured partial indexes only touch the rows they return.
+
+Each mode lists a large portfolio (75% active, 10% featured projects) and
+is explained twice: as planned, and with the partial indexes dropped inside
+a rolled-back transaction, so the full ``(user_id, display_order, id)``
+index has to filter. Rows read and buffers are those of the projects scan.
+
+Usage: ``uv run python -m benchmarks.partial_index_benchmark --projects 100000``
+"""
+
+import argparse
+import asyncio
+import json
+from typing import Any, Dict
+
+from sqlalchemy import Select, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from benchmarks.query_plans import iter_plan_nodes
+from benchmarks.seed import seed, truncate
+from db import sessionmanager
+from dependencies.project_operations import ProjectOperations
+from models import Project, User
+from schemas.project_schemas import ProjectResponseSchema
+from utils.logger import get_logger
+from utils.serialization import response_columns
+
+logger = get_logger()
+
+PARTIAL_INDEXES = (
+    "ix_projects_active_user_id_display_order_id",
+    "ix_projects_featured_user_id_display_order_id",
+)
+MODES: Dict[str, Dict[str, Any]] = {
+    "active": {"active_only": True},
+    "featured": {"featured_only": True},
+}
+
+
+async def scan_stats(
+    engine: AsyncEngine, query: Select, without_partial_indexes: bool
+) -> Dict[str, Any]:
+    """Index used, rows read and buffers of the projects scan of ``query``."""
+    sql = query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        if without_partial_indexes:
+            for index in PARTIAL_INDEXES:
+                await conn.execute(text(f"DROP INDEX {index}"))
+        plan = (
+            await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"))
+        ).scalar_one()
+        await transaction.rollback()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    scan = next(
+        node
+        for node in iter_plan_nodes(plan[0]["Plan"])
+        if node.get("Relation Name") == "projects"
+    )
+    # Row counts are per loop, i.e. per parallel worker
+    loops = scan["Actual Loops"]
+    return {
+        "index": scan.get("Index Name", scan["Node Type"]),
+        "rows_returned": scan["Actual Rows"] * loops,
+        "rows_read": (scan["Actual Rows"] + scan.get("Rows Removed by Filter", 0))
+        * loops,
+        "buffers": scan["Shared Hit Blocks"] + scan["Shared Read Blocks"],
+        "ms": round(plan[0]["Execution Time"], 2),
+    }
+
+
+async def main(projects: int, limit: int, keep: bool) -> None:
+    sessionmanager.init_db()
+    assert sessionmanager.engine and sessionmanager.session_factory
+    engine = sessionmanager.engine
+    await seed(engine, users=1, projects_per_user=projects)
+
+    try:
+        async with sessionmanager.session_factory() as db:
+            user_id = (
+                await db.execute(select(User.id).where(User.username == "bench_user_1"))
+            ).scalar_one()
+            ops = ProjectOperations(db)
+        columns = response_columns(Project.__table__, ProjectResponseSchema)
+
+        for mode, kwargs in MODES.items():
+            for page, page_limit in (("first_page", limit), ("all", projects)):
+                query = ops._all_projects_query(
+                    user_id, 0, page_limit, None, **kwargs
+                ).with_only_columns(*columns)
+                logger.info(
+                    "Partial index benchmark",
+                    extra={
+                        "mode": mode,
+                        "page": page,
+                        "partial_index": await scan_stats(engine, query, False),
+                        "full_index": await scan_stats(engine, query, True),
+                    },
+                )
+    finally:
+        if not keep:
+            await truncate(engine)
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="keep seeded rows")
+    args = parser.parse_args()
+    asyncio.run(main(args.projects, args.limit, args.keep))
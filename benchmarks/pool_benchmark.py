@@ -0,0 +1,93 @@
+"""Compare throughput of a persistent pool against per-request engine disposal.
+
+Usage: ``uv run python -m benchmarks.pool_benchmark --requests 500 --concurrency 20``
+"""
+
+import argparse
+import asyncio
+import time
+from typing import AsyncGenerator, Tuple
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import get_db, sessionmanager
+from main import app
+from utils.logger import get_logger
+
+logger = get_logger()
+
+ENDPOINT = "/api/users/list?limit=10"
+
+
+async def get_db_dispose_per_request() -> AsyncGenerator[AsyncSession, None]:
+    """Previous behaviour: the engine is thrown away after every request."""
+    if not sessionmanager.session_factory:
+        sessionmanager.init_db()
+
+    async for session in sessionmanager.get_session():
+        yield session
+
+    await sessionmanager.close()
+
+
+async def run(requests: int, concurrency: int) -> Tuple[float, int]:
+    """Fire ``requests`` GETs with bounded concurrency.
+
+    Returns requests/sec and the number of failed requests.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    failures = 0
+
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one() -> None:
+            nonlocal failures
+            async with semaphore:
+                response = await client.get(ENDPOINT)
+                if response.is_error:
+                    failures += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    return requests / elapsed, failures
+
+
+async def main(requests: int, concurrency: int) -> None:
+    # The persistent pool runs first: the disposal run leaks connections from
+    # engines thrown away mid-request, which would otherwise skew this one.
+    sessionmanager.init_db()
+    after, after_failures = await run(requests, concurrency)
+    stats = sessionmanager.pool_stats()
+    await sessionmanager.close()
+
+    app.dependency_overrides[get_db] = get_db_dispose_per_request
+    before, before_failures = await run(requests, concurrency)
+    app.dependency_overrides.clear()
+    await sessionmanager.close()
+
+    logger.info(
+        "Pool benchmark",
+        extra={
+            "endpoint": ENDPOINT,
+            "requests": requests,
+            "concurrency": concurrency,
+            "rps_dispose_per_request": round(before, 1),
+            "failures_dispose_per_request": before_failures,
+            "rps_persistent_pool": round(after, 1),
+            "failures_persistent_pool": after_failures,
+            "speedup": round(after / before, 2),
+            "pool": stats.model_dump(),
+        },
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
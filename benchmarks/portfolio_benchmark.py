@@ -0,0 +1,115 @@
+"""Compare the portfolio endpoint with the two-call flow it replaces.
+
+The two-call flow is ``GET /api/users/{id}`` followed by
+``GET /api/projects/list?user_id=...`` for every project; the portfolio is
+one ``GET /api/users/{id}/portfolio``. Requests go straight to the ASGI app,
+one at a time, for portfolios of each ``--sizes`` projects.
+
+Usage: ``uv run python -m benchmarks.portfolio_benchmark --sizes 10 100 1000``
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import insert, text
+
+from benchmarks.load_benchmark import SEED_PORTFOLIO, percentile
+from db import sessionmanager
+from main import app
+from models import User
+from settings import settings
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+async def seed_portfolios(prefix: str, sizes: List[int]) -> Dict[int, int]:
+    """Create one user per size with that many projects; returns size -> user id."""
+    assert sessionmanager.session_factory
+    async with sessionmanager.session_factory() as db:
+        result = await db.execute(
+            insert(User)
+            .returning(User.id)
+            .values(
+                [
+                    {"username": f"{prefix}{size}", "email": f"{prefix}{size}@x.com"}
+                    for size in sizes
+                ]
+            )
+        )
+        user_ids = dict(zip(sizes, result.scalars().all()))
+        for size, user_id in user_ids.items():
+            await db.execute(SEED_PORTFOLIO, {"user_id": user_id, "projects": size})
+        await db.commit()
+    return user_ids
+
+
+async def timings_ms(fn: Callable[[], Awaitable[int]], repeat: int) -> List[float]:
+    """Sorted latencies of ``fn``, which returns the number of queries it sent."""
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+async def main(sizes: List[int], repeat: int) -> None:
+    settings.LOG_ACCESS_SAMPLE_RATE = 0.0
+    sessionmanager.init_db()
+    prefix = f"portfolio_{uuid4().hex[:8]}_"
+    user_ids = await seed_portfolios(prefix, sizes)
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://b") as c:
+            for size, user_id in user_ids.items():
+
+                async def two_calls(user_id: int = user_id, size: int = size) -> int:
+                    with sessionmanager.count_queries() as statements:
+                        user = await c.get(f"/api/users/{user_id}")
+                        projects = await c.get(
+                            "/api/projects/list",
+                            params={"user_id": user_id, "limit": size},
+                        )
+                    assert user.status_code == projects.status_code == 200
+                    return len(statements)
+
+                async def portfolio(user_id: int = user_id) -> int:
+                    with sessionmanager.count_queries() as statements:
+                        response = await c.get(f"/api/users/{user_id}/portfolio")
+                    assert response.status_code == 200
+                    return len(statements)
+
+                results: Dict[str, float] = {}
+                for name, fn in (("two_calls", two_calls), ("portfolio", portfolio)):
+                    results[f"{name}_queries"] = await fn()  # warm-up
+                    ordered = await timings_ms(fn, repeat)
+                    results[f"{name}_p50_ms"] = round(statistics.median(ordered), 2)
+                    results[f"{name}_p95_ms"] = round(percentile(ordered, 0.95), 2)
+                logger.info(
+                    "Portfolio benchmark",
+                    extra={"projects": size, "repeat": repeat, **results},
+                )
+    finally:
+        assert sessionmanager.session_factory
+        async with sessionmanager.session_factory() as db:
+            await db.execute(
+                text("DELETE FROM users WHERE username LIKE :prefix"),
+                {"prefix": f"{prefix}%"},
+            )
+            await db.commit()
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.repeat))
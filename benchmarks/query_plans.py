@@ -0,0 +1,100 @@
+"""Seed a large projects table and assert the hot queries use index scans.
+
+Usage: ``uv run python -m benchmarks.query_plans --users 20000 --projects-per-user 100``
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import Select, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from benchmarks.seed import seed, truncate
+from db import sessionmanager
+from models import Project
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+def iter_plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+async def explain(engine: AsyncEngine, query: Select) -> Dict[str, Any]:
+    """Run EXPLAIN ANALYZE for ``query`` and return the JSON plan."""
+    sql = query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    async with engine.connect() as conn:
+        result = await conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"))
+        plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+def assert_index_scan(name: str, plan: Dict[str, Any]) -> None:
+    node_types: List[str] = [
+        node["Node Type"]
+        for node in iter_plan_nodes(plan["Plan"])
+        if node.get("Relation Name") == "projects"
+    ]
+    assert node_types, f"{name}: projects not scanned"
+    assert "Seq Scan" not in node_types, f"{name}: sequential scan {node_types}"
+    assert "Sort" not in [n["Node Type"] for n in iter_plan_nodes(plan["Plan"])], (
+        f"{name}: explicit sort"
+    )
+    logger.info(
+        "Query plan",
+        extra={
+            "query": name,
+            "scans": node_types,
+            "execution_ms": plan["Execution Time"],
+        },
+    )
+
+
+async def main(users: int, projects_per_user: int, keep: bool) -> None:
+    sessionmanager.init_db()
+    assert sessionmanager.engine
+    engine = sessionmanager.engine
+
+    start = time.perf_counter()
+    await seed(engine, users, projects_per_user)
+    logger.info("Seed time", extra={"seconds": round(time.perf_counter() - start, 1)})
+
+    user_id = users // 2
+    listing = (
+        select(Project)
+        .where(Project.user_id == user_id)
+        .order_by(Project.display_order)
+        .offset(0)
+        .limit(100)
+    )
+    lookup = select(Project).where(
+        Project.id == users * projects_per_user // 2, Project.user_id == user_id
+    )
+
+    try:
+        assert_index_scan("get_all_projects", await explain(engine, listing))
+        assert_index_scan("get_project_by_id", await explain(engine, lookup))
+    finally:
+        if not keep:
+            await truncate(engine)
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--projects-per-user", type=int, default=100)
+    parser.add_argument("--keep", action="store_true", help="keep seeded rows")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.projects_per_user, args.keep))
@@ -0,0 +1,67 @@
+"""Measure per-request overhead of each rate limit backend.
+
+Usage: ``uv run python -m benchmarks.rate_limit_benchmark --redis-url redis://localhost:6379/0``
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from utils.logger import get_logger
+from utils.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimitBackend,
+    RedisRateLimitBackend,
+    SharedMemoryRateLimitBackend,
+    parse_rate,
+)
+from utils.redis_client import RedisClient
+
+logger = get_logger()
+
+
+async def overhead_us(backend: RateLimitBackend, requests: int, clients: int) -> float:
+    """Average microseconds per ``hit`` spread over ``clients`` distinct keys."""
+    rate = parse_rate("1000000/minute")
+    start = time.perf_counter()
+    for i in range(requests):
+        await backend.hit(f"/:10.0.{i % clients // 256}.{i % 256}", rate)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def main(requests: int, clients: int, redis_url: Optional[str]) -> None:
+    backends: List[RateLimitBackend] = [MemoryRateLimitBackend(max_keys=65536)]
+
+    path = os.path.join(tempfile.gettempdir(), f"ratelimit-bench-{os.getpid()}")
+    SharedMemoryRateLimitBackend.create(path, slots=65536)
+    backends.append(SharedMemoryRateLimitBackend(path))
+
+    if redis_url:
+        backends.append(RedisRateLimitBackend(RedisClient(redis_url)))
+
+    results: Dict[str, float] = {}
+    try:
+        for backend in backends:
+            results[f"{backend.name}_us_per_request"] = round(
+                await overhead_us(backend, requests, clients), 2
+            )
+            await backend.close()
+    finally:
+        os.remove(path)
+
+    logger.info(
+        "Rate limit benchmark",
+        extra={"requests": requests, "clients": clients, **results},
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--clients", type=int, default=10000)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.clients, args.redis_url))
@@ -0,0 +1,170 @@
+"""Measure full-text search latency over millions of projects.
+
+Project text is drawn from a skewed vocabulary, so common words match a large
+share of the table and tail words only a handful of rows, as in real
+portfolios.
+
+Usage: ``uv run python -m benchmarks.search_benchmark --users 2000 --per-user 1000``
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import select, text
+
+from benchmarks.seed import SEED_USERS, truncate
+from db import sessionmanager
+from dependencies.project_operations import ProjectOperations
+from models import User
+from utils.logger import get_logger
+
+logger = get_logger()
+
+COMMON_WORDS = [
+    "python", "postgresql", "api", "dashboard", "optimized", "latency",
+    "pipeline", "service", "mobile", "realtime", "analytics", "scalable",
+    "frontend", "backend", "react", "kubernetes", "search", "payments",
+    "migration", "cache", "queue", "streaming", "machine", "learning",
+    "security", "testing", "automation", "monitoring", "deployment", "compiler",
+]  # fmt: skip
+VOCABULARY_SIZE = 20000
+
+
+def random_words(count: int) -> str:
+    """SQL drawing ``count`` words per row; word n has odds ~ n^(-2/3)."""
+    # Referencing p re-evaluates the subquery for every row
+    return f"""
+        (
+            SELECT string_agg(
+                CASE WHEN pick <= cardinality(common) THEN common[pick]
+                ELSE 'term' || pick END,
+                ' '
+            )
+            FROM (
+                SELECT 1 + floor(:vocabulary * random() ^ 3)::int AS pick
+                FROM generate_series(1, {count})
+                WHERE p > 0
+            ) AS picks
+        )
+    """
+
+
+# The first words of the vocabulary are real ones, the long tail synthetic
+SEED_SEARCH_PROJECTS = text(
+    f"""
+    WITH vocabulary AS (SELECT CAST(:common AS text[]) AS common)
+    INSERT INTO projects (
+        user_id, project_name, description, highlights, technologies_used,
+        is_featured, display_order, is_active, created_at
+    )
+    SELECT
+        u.id,
+        {random_words(2)},
+        {random_words(20)},
+        json_build_array({random_words(4)}),
+        '["Python", "PostgreSQL"]'::json,
+        p % 10 = 0,
+        p,
+        true,
+        now()
+    FROM users AS u
+    CROSS JOIN generate_series(1, :per_user) AS p
+    CROSS JOIN vocabulary
+    WHERE u.username LIKE 'bench_user_%'
+    """
+)
+
+
+QUERIES: Dict[str, Sequence[str]] = {
+    "rare_term": ["term19000"],
+    "prefix": ["optim"],
+    "two_terms": ["python", "latency"],
+    "common_term": ["python"],
+    "rare_prefix": ["term1900"],
+}
+
+
+async def timings_ms(ops: ProjectOperations, repeat: int, **kwargs: Any) -> List[float]:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await ops.search_projects(**kwargs)
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+async def main(users: int, per_user: int, limit: int, repeat: int, keep: bool) -> None:
+    sessionmanager.init_db()
+    assert sessionmanager.engine and sessionmanager.session_factory
+    engine = sessionmanager.engine
+
+    start = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.execute(SEED_USERS, {"users": users})
+        await conn.execute(
+            SEED_SEARCH_PROJECTS,
+            {
+                "common": COMMON_WORDS,
+                "vocabulary": VOCABULARY_SIZE,
+                "per_user": per_user,
+            },
+        )
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE projects"))
+    logger.info(
+        "Seeded search benchmark data",
+        extra={
+            "projects": users * per_user,
+            "seconds": round(time.perf_counter() - start, 1),
+        },
+    )
+
+    try:
+        async with sessionmanager.session_factory() as db:
+            ops = ProjectOperations(db)
+            user_id = (
+                await db.execute(select(User.id).where(User.username == "bench_user_1"))
+            ).scalar_one()
+            runs: Dict[str, Dict[str, Any]] = {
+                name: {"terms": terms, "limit": limit}
+                for name, terms in QUERIES.items()
+            }
+            runs["user_scoped"] = {
+                "terms": QUERIES["common_term"],
+                "limit": limit,
+                "user_id": user_id,
+            }
+
+            results = {}
+            for name, kwargs in runs.items():
+                await ops.search_projects(**kwargs)  # warm the cache
+                ordered = await timings_ms(ops, repeat, **kwargs)
+                results[f"{name}_p50_ms"] = round(statistics.median(ordered), 2)
+                results[f"{name}_p95_ms"] = round(
+                    ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))],
+                    2,
+                )
+
+        logger.info(
+            "Search benchmark",
+            extra={"projects": users * per_user, "limit": limit, **results},
+        )
+    finally:
+        if not keep:
+            await truncate(engine)
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--per-user", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="keep seeded rows")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.per_user, args.limit, args.repeat, args.keep))
@@ -0,0 +1,64 @@
+"""Bulk seeding helpers for benchmarks.
+
+Rows are generated server-side with ``generate_series`` so millions of
+projects can be loaded in seconds. Run against the test database only:
+``truncate`` wipes the users and projects tables.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+SEED_USERS = text(
+    """
+    INSERT INTO users (username, email, created_at)
+    SELECT 'bench_user_' || i, 'bench_user_' || i || '@example.com', now()
+    FROM generate_series(1, :users) AS i
+    """
+)
+
+SEED_PROJECTS = text(
+    """
+    INSERT INTO projects (
+        user_id, project_name, description, highlights, technologies_used,
+        is_featured, display_order, is_active, created_at
+    )
+    SELECT
+        u.id,
+        'Project ' || p,
+        repeat('Benchmark project description. ', 20),
+        '["Shipped on time", "Reduced latency"]'::json,
+        '["Python", "PostgreSQL"]'::json,
+        p % 10 = 0,
+        p,
+        p % 4 <> 0,
+        now()
+    FROM users AS u
+    CROSS JOIN generate_series(1, :per_user) AS p
+    WHERE u.username LIKE 'bench_user_%'
+    """
+)
+
+
+async def seed(engine: AsyncEngine, users: int, projects_per_user: int) -> None:
+    """Insert ``users`` users with ``projects_per_user`` projects each."""
+    async with engine.begin() as conn:
+        await conn.execute(SEED_USERS, {"users": users})
+        await conn.execute(SEED_PROJECTS, {"per_user": projects_per_user})
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE users"))
+        await conn.execute(text("ANALYZE projects"))
+    logger.info(
+        "Seeded benchmark data",
+        extra={"users": users, "projects": users * projects_per_user},
+    )
+
+
+async def truncate(engine: AsyncEngine) -> None:
+    """Remove all users and projects."""
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE projects, users RESTART IDENTITY CASCADE"))
@@ -0,0 +1,102 @@
+"""CPU cost of encoding project list responses.
+
+Compares the previous path (ORM objects through ``jsonable_encoder``), the
+validated path (``response_model`` validation from attributes, then JSON) and
+the fast path (selected rows encoded straight to bytes). No database is used.
+
+Usage: ``uv run python -m benchmarks.serialization_benchmark --repeat 200``
+"""
+
+import argparse
+import json
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import Row
+from sqlalchemy.engine.result import result_tuple
+
+from models import Project
+from schemas.project_schemas import ProjectResponseSchema
+from utils.logger import get_logger
+from utils.serialization import rows_to_json
+
+logger = get_logger()
+
+# Builds the same Row objects a select() of the response columns returns
+make_row = result_tuple(list(ProjectResponseSchema.model_fields))
+
+
+def make_values(index: int) -> Dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    return {
+        "id": index,
+        "user_id": 1,
+        "project_name": f"Project {index}",
+        "description": "A portfolio project description. " * 8,
+        "highlights": ["Designed the API", "Cut latency in half", "Wrote the tests"],
+        "description_enhanced": None,
+        "highlights_enhanced": None,
+        "enhancement_prompt_used": None,
+        "last_enhanced_at": None,
+        "project_url": "https://example.com/project",
+        "github_url": "https://github.com/example/project",
+        "start_date": date(2024, 1, 1),
+        "end_date": None,
+        "technologies_used": ["python", "fastapi", "postgres"],
+        "is_featured": index % 10 == 0,
+        "display_order": index,
+        "is_active": True,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def us_per_call(fn: Callable[[], bytes], repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1_000_000
+
+
+def main(sizes: List[int], repeat: int) -> None:
+    adapter = TypeAdapter(List[ProjectResponseSchema])
+    results: Dict[str, float] = {}
+
+    for size in sizes:
+        values = [make_values(i) for i in range(size)]
+        projects = [Project(**v) for v in values]
+        rows = [make_row(v.values()) for v in values]
+
+        def orm_jsonable(projects: List[Project] = projects) -> bytes:
+            content = jsonable_encoder(projects)
+            return json.dumps(content, separators=(",", ":")).encode()
+
+        def validated(projects: List[Project] = projects) -> bytes:
+            return adapter.dump_json(
+                adapter.validate_python(projects, from_attributes=True)
+            )
+
+        def fast(rows: List[Row] = rows) -> bytes:
+            return rows_to_json(rows)
+
+        encoders: Dict[str, Callable[[], bytes]] = {
+            "orm_jsonable": orm_jsonable,
+            "validated": validated,
+            "fast": fast,
+        }
+        for name, fn in encoders.items():
+            results[f"{name}_{size}_us"] = round(us_per_call(fn, repeat), 1)
+
+    logger.info("Serialization benchmark", extra={"repeat": repeat, **results})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
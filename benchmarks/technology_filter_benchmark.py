@@ -0,0 +1,197 @@
+"""Measure technology filters and facet counts as the projects table grows.
+
+Every user gets ``--per-user`` projects and one user ``--large`` more, each
+using up to three technologies drawn from a skewed list: "Python" is on most
+projects, "Rust" on a few percent and "Zig" on one in a thousand. Filters are
+timed for a typical and the large user, with the scans Postgres chose for the
+large one.
+
+Usage: ``uv run python -m benchmarks.technology_filter_benchmark --users 20000``
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy import Select, bindparam, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine.interfaces import BindTyping
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from benchmarks.query_plans import iter_plan_nodes
+from benchmarks.seed import SEED_USERS, truncate
+from db import sessionmanager
+from dependencies.project_operations import ProjectOperations
+from models import User
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Most common first
+TECHNOLOGIES = [
+    "Python", "PostgreSQL", "React", "Docker", "TypeScript", "Redis", "Go",
+    "Kubernetes", "Java", "GraphQL", "Kafka", "Swift", "Elixir", "Haskell", "Rust",
+]  # fmt: skip
+
+SEED_TECHNOLOGY_PROJECTS = text(
+    """
+    INSERT INTO projects (
+        user_id, project_name, description, technologies_used, display_order,
+        is_active, is_featured, created_at
+    )
+    SELECT
+        u.id,
+        'Project ' || p,
+        'Benchmark project description.',
+        (
+            SELECT jsonb_agg(DISTINCT technologies[pick])
+            FROM (
+                SELECT 1 + floor(cardinality(technologies) * random() ^ 3)::int
+                    AS pick
+                FROM generate_series(1, 3)
+                WHERE p > 0  -- re-evaluated for every row
+            ) AS picks
+        ) || CASE WHEN p % 1000 = 0 THEN '["Zig"]'::jsonb ELSE '[]' END,
+        p,
+        true,
+        false,
+        now()
+    FROM users AS u
+    CROSS JOIN generate_series(1, :per_user) AS p
+    CROSS JOIN (SELECT CAST(:technologies AS text[]) AS technologies) AS t
+    WHERE u.username LIKE 'bench_user_%'
+      AND (CAST(:large_user_id AS integer) IS NULL OR u.id = :large_user_id)
+    """
+)
+
+FILTERS: Dict[str, Dict[str, Any]] = {
+    "common": {"all_of": ["Python"]},
+    "uncommon": {"all_of": ["Rust"]},
+    "rare": {"all_of": ["Zig"]},
+    "any_of_rare": {"any_of": ["Rust", "Haskell"]},
+    "all_of_mixed": {"all_of": ["Python", "Rust"]},
+}
+
+
+async def explain(engine: AsyncEngine, query: Select) -> Dict[str, Any]:
+    """EXPLAIN ANALYZE with bound parameters; JSONB values have no literal form."""
+    dialect = postgresql.dialect(paramstyle="named")
+    dialect.bind_typing = BindTyping.NONE  # no ::TYPE casts after the names
+    compiled = query.compile(
+        dialect=dialect, compile_kwargs={"render_postcompile": True}
+    )
+    statement = text(f"EXPLAIN (ANALYZE, FORMAT JSON) {compiled}").bindparams(
+        *(
+            bindparam(name, value, type_=compiled.binds[name].type)
+            for name, value in compiled.construct_params().items()
+        )
+    )
+    async with engine.connect() as conn:
+        plan = (await conn.execute(statement)).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+async def median_ms(fn: Callable[[], Awaitable[object]], repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def main(users: int, per_user: int, large: int, repeat: int, keep: bool) -> None:
+    sessionmanager.init_db()
+    assert sessionmanager.engine and sessionmanager.session_factory
+    engine = sessionmanager.engine
+
+    start = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.execute(SEED_USERS, {"users": users})
+        large_user_id = (
+            await conn.execute(select(User.id).where(User.username == "bench_user_1"))
+        ).scalar_one()
+        for per_user_rows, only_user in ((per_user, None), (large, large_user_id)):
+            await conn.execute(
+                SEED_TECHNOLOGY_PROJECTS,
+                {
+                    "per_user": per_user_rows,
+                    "technologies": TECHNOLOGIES,
+                    "large_user_id": only_user,
+                },
+            )
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE projects"))
+    logger.info(
+        "Seeded technology benchmark data",
+        extra={
+            "projects": users * per_user + large,
+            "seconds": round(time.perf_counter() - start, 1),
+        },
+    )
+
+    try:
+        async with sessionmanager.session_factory() as db:
+            ops = ProjectOperations(db)
+            typical_user_id = large_user_id + 1
+            results: Dict[str, Any] = {}
+            for name, kwargs in FILTERS.items():
+                for label, user_id in (
+                    ("typical", typical_user_id),
+                    ("large", large_user_id),
+                ):
+                    ms = await median_ms(
+                        partial(ops.get_all_project_rows, user_id, limit=20, **kwargs),
+                        repeat,
+                    )
+                    results[f"{name}_{label}_user_ms"] = round(ms, 2)
+
+                plan = await explain(
+                    engine,
+                    ops._all_projects_query(large_user_id, 0, 20, None, **kwargs),
+                )
+                results[f"{name}_large_user_scans"] = [
+                    node.get("Index Name", node["Node Type"])
+                    for node in iter_plan_nodes(plan["Plan"])
+                    if node["Node Type"].endswith("Scan")
+                ]
+
+            for label, user_id in (
+                ("typical", typical_user_id),
+                ("large", large_user_id),
+            ):
+                ms = await median_ms(
+                    partial(ops.get_technology_counts, user_id), repeat
+                )
+                results[f"counts_{label}_user_ms"] = round(ms, 2)
+
+        logger.info(
+            "Technology filter benchmark",
+            extra={
+                "projects": users * per_user + large,
+                "large_user_projects": large + per_user,
+                **results,
+            },
+        )
+    finally:
+        if not keep:
+            await truncate(engine)
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--per-user", type=int, default=50)
+    parser.add_argument("--large", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="keep seeded rows")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.per_user, args.large, args.repeat, args.keep))
@@ -0,0 +1,119 @@
+"""Compare the commit-then-refresh ORM write path with UPDATE/DELETE ... RETURNING.
+
+Usage: ``uv run python -m benchmarks.write_path_benchmark --repeat 200``
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import sessionmanager
+from dependencies.project_operations import ProjectOperations
+from dependencies.user_operations import UserOperations
+from models import Project
+from schemas.project_schemas import ProjectCreateSchema, ProjectUpdateSchema
+from schemas.user_schemas import UserCreateSchema
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+async def legacy_update(db: AsyncSession, project_id: int, user_id: int) -> None:
+    """Previous path: SELECT, mutate, COMMIT, refresh SELECT."""
+    project = await ProjectOperations(db).get_project_by_id(project_id, user_id)
+    assert project
+    project.project_name = uuid4().hex
+    await db.commit()
+    await db.refresh(project)
+
+
+async def legacy_create_delete(db: AsyncSession, user_id: int) -> None:
+    """Previous path: INSERT, COMMIT, refresh SELECT, then SELECT and DELETE."""
+    project = Project(user_id=user_id, project_name="tmp", description="d")
+    db.add(project)
+    await db.commit()
+    await db.refresh(project)
+    found = await ProjectOperations(db).get_project_by_id(project.id, user_id)
+    await db.delete(found)
+    await db.commit()
+
+
+async def returning_update(db: AsyncSession, project_id: int, user_id: int) -> None:
+    payload = ProjectUpdateSchema(project_name=uuid4().hex)
+    await ProjectOperations(db).update_project(project_id, user_id, payload)
+
+
+async def returning_create_delete(db: AsyncSession, user_id: int) -> None:
+    ops = ProjectOperations(db)
+    payload = ProjectCreateSchema(user_id=user_id, project_name="tmp", description="d")
+    project = await ops.create_project(payload)
+    assert project
+    await ops.delete_project(project.id, user_id)
+
+
+async def measure(
+    fn: Callable[[AsyncSession], Awaitable[Any]], repeat: int
+) -> Dict[str, float]:
+    assert sessionmanager.session_factory
+    timings: List[float] = []
+    with sessionmanager.count_queries() as statements:
+        for _ in range(repeat):
+            async with sessionmanager.session_factory() as db:
+                start = time.perf_counter()
+                await fn(db)
+                timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "statements": len(statements) / repeat,
+        "median_ms": round(statistics.median(timings), 3),
+    }
+
+
+async def main(repeat: int) -> None:
+    sessionmanager.init_db()
+    assert sessionmanager.session_factory
+
+    async with sessionmanager.session_factory() as db:
+        suffix = uuid4().hex[:8]
+        user = await UserOperations(db).create_user(
+            UserCreateSchema(
+                username=f"bench_{suffix}", email=f"b_{suffix}@example.com"
+            )
+        )
+        assert user
+        project = await ProjectOperations(db).create_project(
+            ProjectCreateSchema(user_id=user.id, project_name="p", description="d")
+        )
+        assert project
+
+    results = {
+        "update_legacy": await measure(
+            lambda db: legacy_update(db, project.id, user.id), repeat
+        ),
+        "update_returning": await measure(
+            lambda db: returning_update(db, project.id, user.id), repeat
+        ),
+        "create_delete_legacy": await measure(
+            lambda db: legacy_create_delete(db, user.id), repeat
+        ),
+        "create_delete_returning": await measure(
+            lambda db: returning_create_delete(db, user.id), repeat
+        ),
+    }
+
+    async with sessionmanager.session_factory() as db:
+        await UserOperations(db).delete_user(user.id)
+    await sessionmanager.close()
+
+    logger.info("Write path benchmark", extra={"repeat": repeat, **results})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat))
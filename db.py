@@ -1,5 +1,11 @@
-from typing import AsyncGenerator, Optional
+import asyncio
+import itertools
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncGenerator, Iterator, List, Optional
 
+from fastapi import Request
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -8,49 +14,302 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from schemas.common import PoolStatsSchema
 from settings import settings
-from utils.logger import get_logger
+from utils.constants import PRIMARY_STICKY_COOKIE
+from utils.logger import get_logger, request_ctx_var
+from utils.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_WAIT,
+    DB_QUERIES,
+    DB_QUERY_DURATION,
+)
 
 logger = get_logger()
 
+# Long statements (multi-row inserts) are cut in the slow query log
+SLOW_QUERY_STATEMENT_CHARS = 2000
+
+# Seconds a replica is behind its primary; 0 on a primary or a caught-up replica
+REPLICA_LAG = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+            OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait to check out a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            DB_POOL_WAIT.observe(waited)
+        DB_POOL_CHECKED_OUT.inc()
+        return connection
+
+    def _do_return_conn(self, record: Any) -> None:
+        DB_POOL_CHECKED_OUT.dec()
+        super()._do_return_conn(record)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_started_at = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.query_started_at
+    DB_QUERIES.inc()
+    DB_QUERY_DURATION.observe(elapsed)
+
+    ctx = request_ctx_var.get()
+    if ctx:
+        ctx.db_queries += 1
+        ctx.db_seconds += elapsed
+
+    threshold = settings.DB_SLOW_QUERY_MS
+    if threshold > 0 and elapsed * 1000 >= threshold:
+        logger.warning(
+            "Slow query",
+            extra={
+                "duration_ms": round(elapsed * 1000, 3),
+                "statement": statement[:SLOW_QUERY_STATEMENT_CHARS],
+            },
+        )
+
+
+def create_engine(url: str) -> AsyncEngine:
+    """Create an instrumented engine with its own connection pool."""
+    engine = create_async_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        echo=False,
+    )
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    return engine
+
+
+def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        engine,
+        expire_on_commit=False,
+        autoflush=False,
+        class_=AsyncSession,
+    )
+
+
+class Replica:
+    """A read replica and the result of its last health check."""
+
+    def __init__(self, url: str) -> None:
+        self.engine = create_engine(url)
+        self.session_factory = create_session_factory(self.engine)
+        self.healthy = True
+        self.lag = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    def checked_out(self) -> int:
+        pool = self.engine.pool
+        return pool.checkedout() if isinstance(pool, TimedQueuePool) else 0
+
+    async def check(self) -> None:
+        """Mark the replica unhealthy when unreachable or lagging too far behind."""
+        try:
+            # The timeout covers connecting too, so an unreachable host cannot
+            # stall the monitor for the driver's own connect timeout
+            lag = await asyncio.wait_for(
+                self._read_lag(), settings.DB_REPLICA_CHECK_TIMEOUT
+            )
+        except Exception as e:
+            if self.healthy:
+                logger.warning("Replica %s is unreachable: %r", self.name, e)
+            self.healthy = False
+            return
+
+        self.lag = float(lag or 0)
+        healthy = self.lag <= settings.DB_REPLICA_MAX_LAG
+        if healthy != self.healthy:
+            logger.warning(
+                "Replica %s is %s",
+                self.name,
+                "healthy" if healthy else "lagging",
+                extra={"lag_seconds": self.lag},
+            )
+        self.healthy = healthy
+
+    async def _read_lag(self) -> Optional[float]:
+        async with self.engine.connect() as conn:
+            return await conn.scalar(REPLICA_LAG)
+
 
 class SessionManager:
-    """Manages asynchronous DB sessions with connection pooling."""
+    """Manages asynchronous DB sessions with connection pooling.
+
+    Writes go to the primary ``DB_URL``. Read-only routes use one of the
+    ``DB_REPLICA_URLS`` that passed its last health check, chosen by
+    ``DB_REPLICA_POLICY``, and fall back to the primary when none did.
+    """
 
     def __init__(self) -> None:
         self.engine: Optional[AsyncEngine] = None
         self.session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+        self.replicas: List[Replica] = []
+        self._round_robin: Iterator[int] = itertools.count()
+        self._replica_monitor: Optional[asyncio.Task] = None
 
     def init_db(self) -> None:
-        """Initialize the database engine and session factory."""
-
-        self.engine = create_async_engine(
-            settings.DB_URL,
-            poolclass=AsyncAdaptedQueuePool,
-            pool_size=settings.DB_POOL_SIZE,
-            max_overflow=settings.DB_MAX_OVERFLOW,
-            pool_pre_ping=True,
-            echo=False,
-        )
+        """Initialize the database engines and session factories."""
 
-        self.session_factory = async_sessionmaker(
-            self.engine,
-            expire_on_commit=False,
-            autoflush=False,
-            class_=AsyncSession,
-        )
+        self.engine = create_engine(settings.DB_URL)
+        self.session_factory = create_session_factory(self.engine)
+        self.replicas = [
+            Replica(url.strip())
+            for url in settings.DB_REPLICA_URLS.split(",")
+            if url.strip()
+        ]
 
     async def close(self) -> None:
-        """Dispose of the database engine."""
+        """Dispose of the database engines."""
+        if self._replica_monitor:
+            self._replica_monitor.cancel()
+            self._replica_monitor = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+        self.replicas = []
         if self.engine:
             await self.engine.dispose()
+        self.engine = None
+        self.session_factory = None
+
+    def choose_replica(self) -> Optional[Replica]:
+        """Pick a healthy replica, or None to read from the primary."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if settings.DB_REPLICA_POLICY == "least_connections":
+            return min(healthy, key=Replica.checked_out)
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    async def check_replicas(self) -> None:
+        """Run one health check against every replica."""
+        await asyncio.gather(*(replica.check() for replica in self.replicas))
+
+    async def _monitor_replicas(self) -> None:
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(settings.DB_REPLICA_CHECK_INTERVAL)
+
+    def start_replica_monitor(self) -> None:
+        """Health-check the replicas in the background until ``close``."""
+        if self.replicas and not self._replica_monitor:
+            self._replica_monitor = asyncio.create_task(self._monitor_replicas())
+
+    def pool_stats(self) -> PoolStatsSchema:
+        """Snapshot of the connection pool usage."""
+        if not self.engine:
+            raise RuntimeError("Database engine is not initialized.")
+
+        pool = self.engine.pool
+        if not isinstance(pool, TimedQueuePool):
+            raise RuntimeError("Database engine is not using a TimedQueuePool.")
+
+        return PoolStatsSchema(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            checkouts=pool.checkouts,
+            avg_wait_ms=(pool.total_wait / pool.checkouts * 1000)
+            if pool.checkouts
+            else 0.0,
+            max_wait_ms=pool.max_wait * 1000,
+        )
+
+    @contextmanager
+    def count_queries(self) -> Iterator[List[str]]:
+        """Collect every statement sent to the primary or a replica in the block."""
+        if not self.engine:
+            raise RuntimeError("Database engine is not initialized.")
+
+        engines = [self.engine] + [replica.engine for replica in self.replicas]
+        statements: List[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        for engine in engines:
+            event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            for engine in engines:
+                event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    @contextmanager
+    def query_budget(self, max_queries: int) -> Iterator[List[str]]:
+        """Fail when the block sends more than ``max_queries`` statements.
+
+        Meant for tests, to catch N+1 queries and extra round trips.
+        """
+        with self.count_queries() as statements:
+            yield statements
+        if len(statements) > max_queries:
+            listing = "\n".join(f"  {statement}" for statement in statements)
+            raise AssertionError(
+                f"Expected at most {max_queries} queries, "
+                f"got {len(statements)}:\n{listing}"
+            )
 
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
         """Yield a database session with the correct schema set."""
         if not self.session_factory:
             raise RuntimeError("Database session factory is not initialized.")
 
-        async with self.session_factory() as session:
+        async for session in self._session(self.session_factory):
+            yield session
+
+    async def get_read_session(
+        self, primary: bool = False
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """Yield a session on a replica, or on the primary when asked or none is up."""
+        if not self.session_factory:
+            raise RuntimeError("Database session factory is not initialized.")
+
+        replica = None if primary else self.choose_replica()
+        factory = replica.session_factory if replica else self.session_factory
+        async for session in self._session(factory):
+            session.info["replica"] = replica is not None
+            yield session
+
+    async def _session(
+        self, factory: async_sessionmaker[AsyncSession]
+    ) -> AsyncGenerator[AsyncSession, None]:
+        async with factory() as session:
             try:
                 yield session
             except Exception as e:
@@ -64,11 +323,45 @@ sessionmanager = SessionManager()
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get a database session."""
+    """Dependency to get a database session.
+
+    The engine and its pool live for the whole worker process; they are
+    created and disposed by the application lifespan, not per request.
+    """
     if not sessionmanager.session_factory:
         sessionmanager.init_db()
 
     async for session in sessionmanager.get_session():
         yield session
 
-    await sessionmanager.close()
+
+def on_replica(session: AsyncSession) -> bool:
+    """Whether the session reads from a replica, which may lag behind writes.
+
+    Rows read there are not cached: a lagging replica may return a row the
+    primary has already changed, and the cached copy would outlive the lag
+    and hide the write from its author.
+    """
+    return session.info.get("replica", False)
+
+
+def reads_from_primary(request: Request) -> bool:
+    """Whether the client wrote recently enough that replicas may not have it."""
+    sticky_until = request.cookies.get(PRIMARY_STICKY_COOKIE)
+    try:
+        return sticky_until is not None and float(sticky_until) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get a session for read-only routes.
+
+    Served by a replica when one is configured and healthy, except right
+    after the same client wrote: see ``ReadYourWritesMiddleware``.
+    """
+    if not sessionmanager.session_factory:
+        sessionmanager.init_db()
+
+    async for session in sessionmanager.get_read_session(reads_from_primary(request)):
+        yield session
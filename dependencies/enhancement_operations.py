@@ -0,0 +1,224 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Sequence
+
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    and_,
+    case,
+    delete,
+    func,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import EnhancementCacheEntry, EnhancementJob, Project
+from schemas.common import EnhancementQueueStatsSchema
+from utils.cache import get_cache, project_cache_key
+from utils.enhancement import EnhancementOutput
+
+
+def claimed_by(claimed: Sequence[Row], project_ids: Iterable[int]) -> ColumnElement:
+    """Jobs of ``project_ids`` still running under the claim in ``claimed``"""
+    ids = set(project_ids)
+    return and_(
+        EnhancementJob.status == "running",
+        tuple_(EnhancementJob.project_id, EnhancementJob.locked_at).in_(
+            [(row.id, row.locked_at) for row in claimed if row.id in ids]
+        ),
+    )
+
+
+class EnhancementOperations:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def claim_jobs(self, limit: int, lease_seconds: float) -> Sequence[Row]:
+        """Mark up to ``limit`` runnable jobs as running and return their projects
+
+        Runnable jobs are pending ones past ``run_after`` and running ones whose
+        worker held them longer than ``lease_seconds`` (it most likely died).
+        Jobs locked by another worker are skipped, so workers never share one.
+        Returns ``(id, user_id, description, highlights, locked_at)`` project
+        rows; ``locked_at`` identifies this claim of the job.
+        """
+        expired = datetime.now(timezone.utc) - timedelta(seconds=lease_seconds)
+        runnable = (
+            select(EnhancementJob.id)
+            .where(
+                or_(
+                    and_(
+                        EnhancementJob.status == "pending",
+                        EnhancementJob.run_after <= func.now(),
+                    ),
+                    and_(
+                        EnhancementJob.status == "running",
+                        EnhancementJob.locked_at < expired,
+                    ),
+                )
+            )
+            .order_by(EnhancementJob.run_after, EnhancementJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        claimed = (
+            update(EnhancementJob)
+            .where(EnhancementJob.id.in_(runnable.scalar_subquery()))
+            .values(
+                status="running",
+                locked_at=func.now(),
+                attempts=EnhancementJob.attempts + 1,
+            )
+            .returning(EnhancementJob.project_id, EnhancementJob.locked_at)
+            .cte("claimed")
+        )
+        result = await self.db.execute(
+            select(
+                Project.id,
+                Project.user_id,
+                Project.description,
+                Project.highlights,
+                claimed.c.locked_at,
+            ).join(claimed, claimed.c.project_id == Project.id)
+        )
+        rows = result.all()
+        await self.db.commit()
+        return rows
+
+    async def get_cached_enhancements(
+        self, hashes: Iterable[str]
+    ) -> Dict[str, EnhancementOutput]:
+        """Earlier model output for the given content hashes"""
+        result = await self.db.execute(
+            select(
+                EnhancementCacheEntry.content_hash,
+                EnhancementCacheEntry.description_enhanced,
+                EnhancementCacheEntry.highlights_enhanced,
+            ).where(EnhancementCacheEntry.content_hash.in_(set(hashes)))
+        )
+        return {
+            content_hash: EnhancementOutput(description, highlights)
+            for content_hash, description, highlights in result
+        }
+
+    async def save_enhancements(
+        self,
+        claimed: Sequence[Row],
+        enhancements: Dict[int, EnhancementOutput],
+        new_cache_entries: Dict[str, EnhancementOutput],
+        prompt: str,
+    ) -> List[int]:
+        """Write enhancements back and finish their jobs
+
+        Only jobs still held under the claim in ``claimed`` are finished.
+        Projects edited since they were claimed are skipped: the edit reset
+        their job to pending, so the new text gets enhanced on a later pass.
+        So are jobs whose lease expired and that another worker claimed again.
+        Returns the IDs of the projects that were updated.
+
+        The cache invalidation only reaches the API processes with the redis
+        cache backend; with the memory backend their cached projects expire
+        after ``CACHE_TTL``.
+        """
+        if new_cache_entries:
+            await self.db.execute(
+                insert(EnhancementCacheEntry)
+                .values(
+                    [
+                        {
+                            "content_hash": content_hash,
+                            "description_enhanced": output.description,
+                            "highlights_enhanced": output.highlights,
+                        }
+                        for content_hash, output in new_cache_entries.items()
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+
+        # Jobs reset to pending by an edit or claimed again since are left
+        # alone, as are their projects
+        result = await self.db.execute(
+            delete(EnhancementJob)
+            .where(claimed_by(claimed, enhancements))
+            .returning(EnhancementJob.project_id)
+        )
+        finished = set(result.scalars().all())
+        if finished:
+            enhanced_at = datetime.now(timezone.utc)
+            await self.db.execute(
+                update(Project).execution_options(synchronize_session=None),
+                [
+                    {
+                        "id": project_id,
+                        "description_enhanced": output.description,
+                        "highlights_enhanced": output.highlights,
+                        "enhancement_prompt_used": prompt,
+                        "last_enhanced_at": enhanced_at,
+                    }
+                    for project_id, output in enhancements.items()
+                    if project_id in finished
+                ],
+            )
+        await self.db.commit()
+
+        await get_cache().delete(
+            *(
+                project_cache_key(row.id, row.user_id)
+                for row in claimed
+                if row.id in finished
+            )
+        )
+        return sorted(finished)
+
+    async def fail_jobs(
+        self, claimed: Sequence[Row], error: str, max_attempts: int
+    ) -> None:
+        """Retry the jobs later with exponential backoff, or fail them for good
+
+        Like ``save_enhancements``, only jobs still held under the claim in
+        ``claimed`` are changed.
+        """
+        await self.db.execute(
+            update(EnhancementJob)
+            .where(claimed_by(claimed, [row.id for row in claimed]))
+            .values(
+                status=case(
+                    (EnhancementJob.attempts >= max_attempts, "failed"),
+                    else_="pending",
+                ),
+                run_after=func.now()
+                + func.make_interval(
+                    0, 0, 0, 0, 0, 0, func.power(2, EnhancementJob.attempts)
+                ),
+                locked_at=None,
+                last_error=error[:2000],
+            )
+        )
+        await self.db.commit()
+
+    async def get_queue_stats(self) -> EnhancementQueueStatsSchema:
+        """Job counts by status and how long the oldest pending job has waited"""
+        pending = EnhancementJob.status == "pending"
+        result = await self.db.execute(
+            select(
+                func.count().filter(pending),
+                func.count().filter(EnhancementJob.status == "running"),
+                func.count().filter(EnhancementJob.status == "failed"),
+                func.extract(
+                    "epoch",
+                    func.now() - func.min(EnhancementJob.created_at).filter(pending),
+                ),
+            )
+        )
+        pending_count, running, failed, oldest = result.one()
+        return EnhancementQueueStatsSchema(
+            pending=pending_count,
+            running=running,
+            failed=failed,
+            oldest_pending_age_s=float(oldest or 0),
+        )
@@ -0,0 +1,154 @@
+import json
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple, Type, cast
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import CursorResult, column, exists, func, select, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Base, Project, User
+from schemas.common import BulkItemErrorSchema, ImportResultSchema
+from schemas.project_schemas import ProjectCreateSchema
+from schemas.user_schemas import UserCreateSchema
+from utils.constants import IMPORT_CHUNK_SIZE, MAX_IMPORT_ERRORS
+from utils.import_reader import ImportFormat, read_records
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Called after each staged chunk with the records received and staged so far
+ProgressCallback = Callable[[int, int], None]
+
+# CSV cells holding JSON arrays
+PROJECT_JSON_FIELDS = ("highlights", "technologies_used")
+
+
+def copy_value(value: Any) -> Any:
+    """Convert a validated value to what asyncpg's COPY codecs expect."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+class ImportOperations:
+    """Bulk imports through COPY into a temporary staging table
+
+    Records are validated in chunks, copied into a staging table that only
+    lives for the transaction, then merged into the real table with one
+    INSERT ... SELECT, so an import either lands completely or not at all.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def import_users(
+        self,
+        chunks: AsyncIterator[bytes],
+        import_format: ImportFormat,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> ImportResultSchema:
+        """Import users; usernames or emails that already exist are skipped"""
+        return await self._import(
+            chunks,
+            import_format,
+            UserCreateSchema,
+            User,
+            chunk_size,
+            on_progress,
+        )
+
+    async def import_projects(
+        self,
+        chunks: AsyncIterator[bytes],
+        import_format: ImportFormat,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> ImportResultSchema:
+        """Import projects; projects of unknown users are skipped"""
+        return await self._import(
+            chunks,
+            import_format,
+            ProjectCreateSchema,
+            Project,
+            chunk_size,
+            on_progress,
+        )
+
+    async def _import(
+        self,
+        chunks: AsyncIterator[bytes],
+        import_format: ImportFormat,
+        schema: Type[BaseModel],
+        model: Type[Base],
+        chunk_size: int,
+        on_progress: Optional[ProgressCallback],
+    ) -> ImportResultSchema:
+        columns = list(schema.model_fields)
+        staging = table(
+            f"import_{model.__tablename__}", *(column(name) for name in columns)
+        )
+        await self.db.execute(
+            text(
+                f"CREATE TEMP TABLE {staging.name} ON COMMIT DROP AS "
+                f"SELECT {', '.join(columns)} FROM {model.__tablename__} WITH NO DATA"
+            )
+        )
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver = raw_connection.driver_connection
+        assert driver is not None
+
+        received = staged = 0
+        errors: List[BulkItemErrorSchema] = []
+        batch: List[Tuple[Any, ...]] = []
+
+        async def flush() -> None:
+            nonlocal staged, batch
+            await driver.copy_records_to_table(
+                staging.name, records=batch, columns=columns
+            )
+            staged += len(batch)
+            batch = []
+            if on_progress:
+                on_progress(received, staged)
+
+        async for number, record in read_records(chunks, import_format):
+            received += 1
+            try:
+                if record is None:
+                    raise ValueError("Malformed record")
+                if import_format == "csv" and model is Project:
+                    for name in PROJECT_JSON_FIELDS:
+                        if record.get(name):
+                            record[name] = json.loads(record[name])
+                item = schema.model_validate(record)
+            except (ValidationError, ValueError) as e:
+                if len(errors) < MAX_IMPORT_ERRORS:
+                    errors.append(BulkItemErrorSchema(index=number, detail=str(e)))
+                continue
+
+            batch.append(tuple(copy_value(getattr(item, name)) for name in columns))
+            if len(batch) >= chunk_size:
+                await flush()
+        if batch:
+            await flush()
+
+        source = select(*staging.c, func.now())
+        if model is Project:
+            source = source.where(exists().where(User.id == staging.c.user_id))
+        result = await self.db.execute(
+            insert(model)
+            .from_select([*columns, "created_at"], source)
+            .on_conflict_do_nothing()
+        )
+        inserted = cast(CursorResult, result).rowcount
+        await self.db.commit()
+
+        return ImportResultSchema(
+            received=received,
+            staged=staged,
+            inserted=inserted,
+            skipped=received - inserted,
+            errors=errors,
+        )
@@ -1,108 +1,538 @@
-from typing import List, Optional
+import json
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import (
+    REAL,
+    ColumnElement,
+    Integer,
+    Row,
+    Select,
+    String,
+    and_,
+    case,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    true,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
 
-from models import Project
-from schemas.project_schemas import ProjectCreateSchema, ProjectUpdateSchema
+from db import on_replica
+from models import PROJECT_CONTENT_GROUP, PROJECT_SEARCH_CONFIG, Project, User
+from schemas.project_schemas import (
+    ProjectBulkUpdateItemSchema,
+    ProjectCreateSchema,
+    ProjectResponseSchema,
+    ProjectSummarySchema,
+    ProjectUpdateSchema,
+)
+from utils.cache import get_cache, project_cache_key, user_projects_cache_group
+from utils.constants import EXPORT_BATCH_SIZE, SEARCH_MAX_CANDIDATES
+from utils.serialization import named_columns, response_columns
+
+
+def technologies_literal(technologies: Iterable[str]) -> ColumnElement:
+    """JSONB array for containment filters, inlined into the statement
+
+    With a bound parameter Postgres soon switches to a generic plan, which
+    picks the GIN index on ``technologies_used`` even for technologies on
+    most projects; with the value inline it only does so for rare ones.
+    """
+    return cast(
+        literal(json.dumps(list(technologies)), String, literal_execute=True), JSONB
+    )
+
+
+MODIFIED_AT_COLUMN = "modified_at"
+
+
+def modified_at_column() -> ColumnElement[Optional[datetime]]:
+    """When a project last changed, for ETag and Last-Modified"""
+    return func.coalesce(Project.updated_at, Project.created_at).label(
+        MODIFIED_AT_COLUMN
+    )
 
 
 class ProjectOperations:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_project(self, payload: ProjectCreateSchema) -> Project:
-        """Create project in the database"""
-        project = Project(
-            user_id=payload.user_id,
-            project_name=payload.project_name,
-            description=payload.description,
-            highlights=payload.highlights,
-            description_enhanced=None,  # Placeholder for AI
-            highlights_enhanced=None,  # Placeholder for AI
-            project_url=payload.project_url,
-            github_url=payload.github_url,
-            start_date=payload.start_date,
-            end_date=payload.end_date,
-            technologies_used=payload.technologies_used,
-            is_featured=payload.is_featured,
-            display_order=payload.display_order,
-            is_active=payload.is_active,
-        )
-        self.db.add(project)
+    async def create_project(
+        self, payload: ProjectCreateSchema
+    ) -> Optional[ProjectResponseSchema]:
+        """Create project in the database
+
+        The owner check and the insert are one INSERT ... SELECT, so a user
+        deleted meanwhile yields None rather than a foreign key violation.
+        A database trigger queues the new project for AI enhancement.
+        """
+        values = {
+            **payload.model_dump(),
+            "description_enhanced": None,  # Filled by the enhancement worker
+            "highlights_enhanced": None,  # Filled by the enhancement worker
+        }
+        columns = Project.__table__.c
+        result = await self.db.execute(
+            insert(Project)
+            .from_select(
+                list(values),
+                select(
+                    *(
+                        literal(value, columns[name].type).label(name)
+                        for name, value in values.items()
+                    )
+                ).where(exists().where(User.id == payload.user_id)),
+            )
+            .returning(*response_columns(Project.__table__, ProjectResponseSchema))
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        project = ProjectResponseSchema.model_validate(row)
         await self.db.commit()
-        await self.db.refresh(project)
         return project
 
-    async def get_all_projects(
-        self, user_id: int, skip: int = 0, limit: int = 100
-    ) -> List[Project]:
-        """Retrieve all projects for a user"""
+    def _all_projects_query(
+        self,
+        user_id: int,
+        skip: int,
+        limit: int,
+        after: Optional[Tuple[int, int]],
+        any_of: Optional[Sequence[str]] = None,
+        all_of: Optional[Sequence[str]] = None,
+        active_only: bool = False,
+        featured_only: bool = False,
+    ) -> Select:
         query = (
             select(Project)
             .where(Project.user_id == user_id)
-            .order_by(Project.display_order)
-            .offset(skip)
+            .order_by(Project.display_order, Project.id)
             .limit(limit)
         )
+        # Served by the partial indexes on (user_id, display_order, id)
+        if active_only:
+            query = query.where(Project.is_active)
+        if featured_only:
+            query = query.where(Project.is_featured)
+        if any_of:
+            query = query.where(
+                or_(
+                    *(
+                        Project.technologies_used.contains(
+                            technologies_literal([technology])
+                        )
+                        for technology in dict.fromkeys(any_of)
+                    )
+                )
+            )
+        if all_of:
+            query = query.where(
+                Project.technologies_used.contains(
+                    technologies_literal(dict.fromkeys(all_of))
+                )
+            )
+        if after is not None:
+            return query.where(
+                tuple_(Project.display_order, Project.id)
+                > tuple_(literal(after[0]), literal(after[1]))
+            )
+        return query.offset(skip)
+
+    async def get_all_projects(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[int, int]] = None,
+        any_of: Optional[Sequence[str]] = None,
+        all_of: Optional[Sequence[str]] = None,
+        active_only: bool = False,
+        featured_only: bool = False,
+    ) -> List[Project]:
+        """Retrieve all projects for a user
+
+        ``after`` is a ``(display_order, id)`` keyset; when given, ``skip`` is
+        ignored and the page starts right after that project. ``any_of`` and
+        ``all_of`` keep projects using at least one, or every one, of those
+        technologies (exact, case-sensitive names); ``active_only`` and
+        ``featured_only`` keep active or featured projects.
+        """
+        query = self._all_projects_query(
+            user_id, skip, limit, after, any_of, all_of, active_only, featured_only
+        ).options(undefer_group(PROJECT_CONTENT_GROUP))
         result = await self.db.execute(query)
         projects = result.scalars().all()
         return list(projects)
 
+    async def get_all_project_rows(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[int, int]] = None,
+        fields: Optional[Sequence[str]] = None,
+        any_of: Optional[Sequence[str]] = None,
+        all_of: Optional[Sequence[str]] = None,
+        active_only: bool = False,
+        featured_only: bool = False,
+        with_modified_at: bool = False,
+    ) -> Sequence[Row]:
+        """Same page as ``get_all_projects`` as plain rows
+
+        Only the ``fields`` columns are selected, by default the ones backing
+        ``ProjectResponseSchema``. ``with_modified_at`` adds the
+        ``modified_at`` column of ``get_all_project_versions``, so the page
+        validators come from the same query.
+        """
+        columns = (
+            named_columns(Project.__table__, fields)
+            if fields is not None
+            else response_columns(Project.__table__, ProjectResponseSchema)
+        )
+        if with_modified_at:
+            columns.append(modified_at_column())
+        query = self._all_projects_query(
+            user_id, skip, limit, after, any_of, all_of, active_only, featured_only
+        )
+        query = query.with_only_columns(*columns)
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def get_all_project_versions(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[int, int]] = None,
+        any_of: Optional[Sequence[str]] = None,
+        all_of: Optional[Sequence[str]] = None,
+        active_only: bool = False,
+        featured_only: bool = False,
+    ) -> Sequence[Tuple[int, datetime]]:
+        """``(id, modified_at)`` for the same page as ``get_all_projects``"""
+        query = self._all_projects_query(
+            user_id, skip, limit, after, any_of, all_of, active_only, featured_only
+        )
+        query = query.with_only_columns(Project.id, modified_at_column())
+        result = await self.db.execute(query)
+        return result.tuples().all()
+
+    async def stream_project_rows(
+        self, user_id: Optional[int] = None, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Yield batches of response rows from a server-side cursor
+
+        Covers one user's projects, or every project when ``user_id`` is
+        None, so memory use depends on ``batch_size`` only.
+        """
+        query = select(
+            *response_columns(Project.__table__, ProjectResponseSchema)
+        ).order_by(Project.user_id, Project.display_order, Project.id)
+        if user_id is not None:
+            query = query.where(Project.user_id == user_id)
+
+        result = await self.db.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield rows
+
+    async def search_projects(
+        self,
+        terms: Sequence[str],
+        user_id: Optional[int] = None,
+        limit: int = 20,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> Sequence[Row]:
+        """Summary rows of projects matching every term as a prefix, best first
+
+        Searching every project ranks only the newest ``SEARCH_MAX_CANDIDATES``
+        matches, so a term found in most projects costs no more than a rare
+        one: rare terms are served by the GIN index on ``search_vector``,
+        common ones by walking the primary key backwards. Older matches are
+        left out, however well they rank. A portfolio search ranks all of its
+        matches. ``after`` is the ``(rank, id)`` of the last row of the
+        previous page.
+        """
+        query = func.to_tsquery(
+            PROJECT_SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms)
+        )
+        matches: ColumnElement[bool]
+        max_candidates: Optional[int] = None
+        if user_id is None:
+            matches = Project.search_vector.op("@@")(query)
+            max_candidates = SEARCH_MAX_CANDIDATES
+        else:
+            # A portfolio is small: checking each of its projects beats
+            # intersecting with the GIN posting lists, which grow with the table
+            matches = and_(
+                Project.user_id == user_id,
+                func.ts_match_vq(Project.search_vector, query),
+            )
+        candidates = (
+            select(
+                Project.id,
+                func.ts_rank_cd(Project.search_vector, query, type_=REAL).label("rank"),
+            )
+            .where(matches)
+            .order_by(Project.id.desc())
+            .limit(max_candidates)
+        )
+        ranked = candidates.subquery("candidates")
+
+        page = (
+            select(ranked.c.id, ranked.c.rank)
+            .order_by(ranked.c.rank.desc(), ranked.c.id.desc())
+            .limit(limit)
+        )
+        if after is not None:
+            # Ranks are real; compare at the same precision they were read
+            page = page.where(
+                tuple_(ranked.c.rank, ranked.c.id)
+                < tuple_(cast(literal(after[0]), REAL), literal(after[1]))
+            )
+        page_subquery = page.subquery("page")
+
+        # Only the rows of the page are read in full
+        statement = (
+            select(
+                *response_columns(Project.__table__, ProjectSummarySchema),
+                page_subquery.c.rank,
+            )
+            .join(page_subquery, page_subquery.c.id == Project.id)
+            .order_by(page_subquery.c.rank.desc(), Project.id.desc())
+        )
+        result = await self.db.execute(statement)
+        return result.all()
+
+    async def get_technology_counts(self, user_id: int) -> Sequence[Row]:
+        """``(technology, projects)`` over a user's projects, most used first"""
+        elements = func.jsonb_array_elements_text(
+            case(
+                (
+                    func.jsonb_typeof(Project.technologies_used) == "array",
+                    Project.technologies_used,
+                )
+            )
+        ).table_valued("value")
+        # Deduplicating per project is much cheaper than count(DISTINCT id)
+        technologies = select(elements.c.value).distinct().lateral("technologies")
+        projects = func.count()
+        result = await self.db.execute(
+            select(technologies.c.value.label("technology"), projects.label("projects"))
+            .select_from(Project)
+            .join(technologies, true())
+            .where(Project.user_id == user_id)
+            .group_by(technologies.c.value)
+            .order_by(projects.desc(), technologies.c.value)
+        )
+        return result.all()
+
     async def get_project_by_id(
         self, project_id: int, user_id: int
     ) -> Optional[Project]:
         """Retrieve single project by ID"""
-        query = select(Project).where(
-            Project.id == project_id, Project.user_id == user_id
+        query = (
+            select(Project)
+            .where(Project.id == project_id, Project.user_id == user_id)
+            .options(undefer_group(PROJECT_CONTENT_GROUP))
         )
         result = await self.db.execute(query)
         project = result.scalar_one_or_none()
         return project
 
-    async def update_project(
-        self, project_id: int, user_id: int, payload: ProjectUpdateSchema
-    ) -> Optional[Project]:
-        """Update existing project"""
-        project = await self.get_project_by_id(project_id, user_id)
+    async def get_project_modified_at(
+        self, project_id: int, user_id: int
+    ) -> Optional[datetime]:
+        """Last modification time of a project, without loading the row"""
+        result = await self.db.execute(
+            select(func.coalesce(Project.updated_at, Project.created_at)).where(
+                Project.id == project_id, Project.user_id == user_id
+            )
+        )
+        return result.scalar_one_or_none()
 
+    async def get_cached_project(
+        self, project_id: int, user_id: int
+    ) -> Optional[ProjectResponseSchema]:
+        """Retrieve single project by ID through the read-through cache"""
+        cache = get_cache()
+        key = project_cache_key(project_id, user_id)
+
+        cached = await cache.get(key)
+        if cached is not None:
+            return ProjectResponseSchema.model_validate(cached)
+
+        project = await self.get_project_by_id(project_id, user_id)
         if not project:
             return None
 
-        if payload.project_name is not None:
-            project.project_name = payload.project_name
-        if payload.description is not None:
-            project.description = payload.description
-        if payload.highlights is not None:
-            project.highlights = payload.highlights
-        if payload.project_url is not None:
-            project.project_url = payload.project_url
-        if payload.github_url is not None:
-            project.github_url = payload.github_url
-        if payload.start_date is not None:
-            project.start_date = payload.start_date
-        if payload.end_date is not None:
-            project.end_date = payload.end_date
-        if payload.technologies_used is not None:
-            project.technologies_used = payload.technologies_used
-        if payload.is_featured is not None:
-            project.is_featured = payload.is_featured
-        if payload.display_order is not None:
-            project.display_order = payload.display_order
-        if payload.is_active is not None:
-            project.is_active = payload.is_active
+        response = ProjectResponseSchema.model_validate(project)
+        if not on_replica(self.db):
+            await cache.set(
+                key,
+                response.model_dump(mode="json"),
+                group=user_projects_cache_group(user_id),
+            )
+        return response
+
+    async def update_project(
+        self, project_id: int, user_id: int, payload: ProjectUpdateSchema
+    ) -> Optional[ProjectResponseSchema]:
+        """Update existing project with a single UPDATE ... RETURNING"""
+        changes = payload.model_dump(exclude_none=True)
+        if not changes:
+            project = await self.get_project_by_id(project_id, user_id)
+            return ProjectResponseSchema.model_validate(project) if project else None
+
+        result = await self.db.execute(
+            update(Project)
+            .where(Project.id == project_id, Project.user_id == user_id)
+            .values(**changes)
+            .returning(*response_columns(Project.__table__, ProjectResponseSchema))
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
 
         await self.db.commit()
-        await self.db.refresh(project)
-        return project
+        await get_cache().delete(project_cache_key(project_id, user_id))
+        return ProjectResponseSchema.model_validate(row)
 
     async def delete_project(self, project_id: int, user_id: int) -> bool:
-        """Delete project by ID"""
-        project = await self.get_project_by_id(project_id, user_id)
-
-        if not project:
+        """Delete project by ID with a single DELETE ... RETURNING"""
+        result = await self.db.execute(
+            delete(Project)
+            .where(Project.id == project_id, Project.user_id == user_id)
+            .returning(Project.id)
+        )
+        if result.scalar_one_or_none() is None:
             return False
 
-        await self.db.delete(project)
         await self.db.commit()
+        await get_cache().delete(project_cache_key(project_id, user_id))
         return True
+
+    async def create_projects(
+        self, payloads: List[ProjectCreateSchema]
+    ) -> Tuple[List[Project], Dict[int, str]]:
+        """Create many projects with a single INSERT ... SELECT ... RETURNING
+
+        The payloads are joined to their owners inside the INSERT, so a user
+        deleted meanwhile rejects its items instead of failing the batch on
+        the foreign key. Returns the created projects in input order and
+        errors keyed by the index of each rejected payload.
+        """
+        if not payloads:
+            return [], {}
+
+        rows = [payload.model_dump() for payload in payloads]
+        names = list(rows[0])
+        columns = Project.__table__.c
+        items = values(
+            column("ordinal", Integer),
+            *(column(name, columns[name].type) for name in names),
+            name="items",
+        ).data([(index, *row.values()) for index, row in enumerate(rows)])
+
+        result = await self.db.scalars(
+            insert(Project)
+            .from_select(
+                names,
+                # VALUES leaves columns that are NULL in every row untyped
+                select(*(cast(items.c[name], columns[name].type) for name in names))
+                .join(User, User.id == items.c.user_id)
+                .order_by(items.c.ordinal),
+            )
+            .returning(Project)
+            .options(undefer_group(PROJECT_CONTENT_GROUP))
+        )
+        # Rows are inserted in ordinal order, so their serial ids ascend with it
+        created = sorted(result.all(), key=lambda project: project.id)
+        await self.db.commit()
+
+        owners = {project.user_id for project in created}
+        errors: Dict[int, str] = {
+            index: f"User with id {payload.user_id} not found"
+            for index, payload in enumerate(payloads)
+            if payload.user_id not in owners
+        }
+        return created, errors
+
+    async def update_projects(
+        self, user_id: int, payloads: List[ProjectBulkUpdateItemSchema]
+    ) -> Tuple[List[Project], Dict[int, str]]:
+        """Update many projects with a batched UPDATE by primary key
+
+        Items for the same project are merged in input order, so the last
+        value given for a field wins. Returns the updated projects in input
+        order and errors keyed by the index of each payload whose project was
+        not found.
+        """
+        merged: Dict[int, dict] = {}
+        for payload in payloads:
+            merged.setdefault(payload.id, {"id": payload.id}).update(
+                payload.model_dump(exclude={"id"}, exclude_none=True)
+            )
+        # One batched UPDATE is issued per consecutive run of items setting
+        # the same fields, so group them; each project now appears only once
+        changes = sorted(
+            (change for change in merged.values() if len(change) > 1), key=sorted
+        )
+        if changes:
+            await self.db.execute(
+                update(Project)
+                .where(Project.user_id == user_id)
+                .execution_options(synchronize_session=None),
+                changes,
+            )
+
+        project_ids = [payload.id for payload in payloads]
+        result = await self.db.scalars(
+            select(Project)
+            .where(Project.user_id == user_id, Project.id.in_(project_ids))
+            .options(undefer_group(PROJECT_CONTENT_GROUP))
+            .execution_options(populate_existing=True)
+        )
+        found = {project.id: project for project in result.all()}
+        await self.db.commit()
+        await get_cache().delete(
+            *(project_cache_key(project_id, user_id) for project_id in found)
+        )
+
+        errors: Dict[int, str] = {}
+        projects = []
+        for index, payload in enumerate(payloads):
+            if payload.id in found:
+                projects.append(found[payload.id])
+            else:
+                errors[index] = f"Project with id {payload.id} not found"
+        return projects, errors
+
+    async def delete_projects(self, project_ids: List[int], user_id: int) -> List[int]:
+        """Delete many projects with a single DELETE ... RETURNING
+
+        Returns the IDs that were deleted.
+        """
+        result = await self.db.execute(
+            delete(Project)
+            .where(Project.user_id == user_id, Project.id.in_(project_ids))
+            .returning(Project.id)
+        )
+        deleted_ids = list(result.scalars().all())
+        await self.db.commit()
+        await get_cache().delete(
+            *(project_cache_key(project_id, user_id) for project_id in deleted_ids)
+        )
+        return deleted_ids
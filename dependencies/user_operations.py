@@ -1,31 +1,78 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, Text, cast, delete, func, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import User
-from schemas.user_schemas import UserCreateSchema, UserUpdateSchema
+from db import on_replica
+from models import Project, User
+from schemas.project_schemas import ProjectResponseSchema
+from schemas.user_schemas import (
+    UserCreateSchema,
+    UserResponseSchema,
+    UserUpdateSchema,
+)
+from utils.cache import get_cache, user_cache_key, user_projects_cache_group
+from utils.serialization import json_columns, response_columns
 
 
 class UserOperations:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_user(self, payload: UserCreateSchema) -> User:
-        """Create a new user in the database"""
-        user = User(username=payload.username, email=payload.email)
-        self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
-        return user
+    async def create_user(
+        self, payload: UserCreateSchema
+    ) -> Optional[UserResponseSchema]:
+        """Create a new user in the database
+
+        Relies on the unique username/email indexes: returns None when a user
+        with the same username or email already exists.
+        """
+        result = await self.db.execute(
+            insert(User)
+            .values(username=payload.username, email=payload.email)
+            .on_conflict_do_nothing()
+            .returning(*User.__table__.c)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
 
-    async def get_all_users(self, skip: int = 0, limit: int = 100) -> List[User]:
-        """Retrieve all users with pagination"""
-        query = select(User).offset(skip).limit(limit)
+        await self.db.commit()
+        return UserResponseSchema.model_validate(row)
+
+    def _all_users_query(
+        self, skip: int, limit: int, after_id: Optional[int]
+    ) -> Select:
+        query = select(User).order_by(User.id).limit(limit)
+        if after_id is not None:
+            return query.where(User.id > after_id)
+        return query.offset(skip)
+
+    async def get_all_users(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[User]:
+        """Retrieve all users with pagination
+
+        When ``after_id`` is given, keyset pagination is used and ``skip`` is
+        ignored, so deep pages cost the same as the first one.
+        """
+        query = self._all_users_query(skip, limit, after_id)
         result = await self.db.execute(query)
         users = result.scalars().all()
         return list(users)
 
+    async def get_all_user_rows(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> Sequence[Row]:
+        """Same page as ``get_all_users`` as plain rows of response columns"""
+        query = self._all_users_query(skip, limit, after_id).with_only_columns(
+            *response_columns(User.__table__, UserResponseSchema)
+        )
+        result = await self.db.execute(query)
+        return result.all()
+
     async def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Retrieve a single user by ID"""
         query = select(User).where(User.id == user_id)
@@ -33,63 +80,113 @@ class UserOperations:
         user = result.scalar_one_or_none()
         return user
 
-    async def get_user_by_username(self, username: str) -> Optional[User]:
-        """Retrieve a user by username"""
-        query = select(User).where(User.username == username)
-        result = await self.db.execute(query)
-        user = result.scalar_one_or_none()
-        return user
-
-    async def get_user_by_email(self, email: str) -> Optional[User]:
-        """Retrieve a user by email"""
-        query = select(User).where(User.email == email)
-        result = await self.db.execute(query)
-        user = result.scalar_one_or_none()
-        return user
+    async def get_portfolio_json(self, user_id: int) -> Optional[str]:
+        """A user and their active projects as ``UserPortfolioSchema`` JSON
+
+        Postgres builds the whole document, so it takes one query and the
+        rows are never turned into Python objects. ``row_to_json`` and
+        ``array_to_json`` write compact JSON and timestamps are formatted in
+        SQL, so the body is encoded as the schema itself would encode it.
+        """
+        projects = (
+            select(*json_columns(Project.__table__, ProjectResponseSchema))
+            .where(Project.user_id == User.id, Project.is_active)
+            .correlate(User)
+            .subquery("project")
+        )
+        project_list = (
+            select(
+                func.coalesce(
+                    func.array_to_json(
+                        func.array_agg(
+                            aggregate_order_by(
+                                projects.table_valued(),
+                                projects.c.display_order,
+                                projects.c.id,
+                            )
+                        )
+                    ),
+                    func.json_build_array(),
+                )
+            )
+            .select_from(projects)
+            .scalar_subquery()
+        )
+        portfolio = (
+            select(
+                *json_columns(User.__table__, UserResponseSchema),
+                project_list.label("projects"),
+            )
+            .where(User.id == user_id)
+            .subquery("portfolio")
+        )
+        result = await self.db.execute(
+            select(cast(func.row_to_json(portfolio.table_valued()), Text))
+        )
+        return result.scalar_one_or_none()
+
+    async def get_user_modified_at(self, user_id: int) -> Optional[datetime]:
+        """Last modification time of a user, without loading the row"""
+        result = await self.db.execute(
+            select(func.coalesce(User.updated_at, User.created_at)).where(
+                User.id == user_id
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_cached_user(self, user_id: int) -> Optional[UserResponseSchema]:
+        """Retrieve a single user by ID through the read-through cache"""
+        cache = get_cache()
+        key = user_cache_key(user_id)
+
+        cached = await cache.get(key)
+        if cached is not None:
+            return UserResponseSchema.model_validate(cached)
 
-    async def update_user(
-        self, user_id: int, payload: UserUpdateSchema
-    ) -> Optional[User]:
-        """Update an existing user"""
         user = await self.get_user_by_id(user_id)
-
         if not user:
             return None
 
-        # Update only the fields that are provided
-        if payload.username is not None:
-            user.username = payload.username
+        response = UserResponseSchema.model_validate(user)
+        if not on_replica(self.db):
+            await cache.set(key, response.model_dump(mode="json"))
+        return response
 
-        if payload.email is not None:
-            user.email = payload.email
+    async def update_user(
+        self, user_id: int, payload: UserUpdateSchema
+    ) -> Optional[UserResponseSchema]:
+        """Update an existing user with a single UPDATE ... RETURNING"""
+        # Update only the fields that are provided
+        changes = payload.model_dump(exclude_none=True)
+        if not changes:
+            user = await self.get_user_by_id(user_id)
+            return UserResponseSchema.model_validate(user) if user else None
+
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(**changes)
+            .returning(*User.__table__.c)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
 
         await self.db.commit()
-        await self.db.refresh(user)
-        return user
+        await get_cache().delete(user_cache_key(user_id))
+        return UserResponseSchema.model_validate(row)
 
     async def delete_user(self, user_id: int) -> bool:
-        """Delete a user by ID (cascades to all related data)"""
-        user = await self.get_user_by_id(user_id)
-
-        if not user:
+        """Delete a user by ID (the database cascades to all related data)"""
+        result = await self.db.execute(
+            delete(User).where(User.id == user_id).returning(User.id)
+        )
+        if result.scalar_one_or_none() is None:
             return False
 
-        await self.db.delete(user)
         await self.db.commit()
-        return True
 
-    async def user_exists(
-        self, username: Optional[str] = None, email: Optional[str] = None
-    ) -> bool:
-        """Check if a user exists by username or email"""
-        if username:
-            user = await self.get_user_by_username(username)
-            if user:
-                return True
-
-        if email:
-            user = await self.get_user_by_email(email)
-            if user:
-                return True
-
-        return False
+        cache = get_cache()
+        await cache.delete(user_cache_key(user_id))
+        await cache.delete_group(user_projects_cache_group(user_id))
+        return True
@@ -0,0 +1,204 @@
+"""Run the AI enhancement worker.
+
+Projects are queued by database triggers whenever their description or
+highlights change. The worker claims them ``ENHANCEMENT_BATCH_SIZE`` at a
+time, serves unchanged text from the content-hash cache and sends the rest to
+the model provider in one call per batch, with up to
+``ENHANCEMENT_CONCURRENCY`` batches in flight.
+
+Usage: ``uv run python enhance_worker.py`` (``--once`` drains the queue and exits)
+"""
+
+import argparse
+import asyncio
+import signal
+import time
+from typing import Dict, Optional
+
+from db import sessionmanager
+from dependencies.enhancement_operations import EnhancementOperations
+from settings import settings
+from utils.enhancement import (
+    ENHANCEMENT_PROMPT,
+    EnhancementInput,
+    EnhancementOutput,
+    EnhancementProvider,
+    content_hash,
+    get_enhancement_provider,
+)
+from utils.logger import get_logger
+from utils.metrics import (
+    ENHANCEMENT_MODEL_CALLS,
+    ENHANCEMENT_MODEL_DURATION,
+    ENHANCEMENT_PROJECTS,
+)
+
+logger = get_logger()
+
+
+def lease_seconds() -> float:
+    """How long a claimed job may run before another worker takes it over."""
+    return settings.ENHANCEMENT_TIMEOUT * 2
+
+
+async def process_batch(provider: EnhancementProvider, batch_size: int) -> int:
+    """Claim and enhance one batch; returns the number of projects claimed.
+
+    No database connection is held during the model call.
+    """
+    assert sessionmanager.session_factory
+    async with sessionmanager.session_factory() as db:
+        ops = EnhancementOperations(db)
+        claimed = await ops.claim_jobs(batch_size, lease_seconds())
+        if not claimed:
+            return 0
+        items = {
+            row.id: EnhancementInput(row.description, row.highlights) for row in claimed
+        }
+        hashes = {
+            project_id: content_hash(item, ENHANCEMENT_PROMPT)
+            for project_id, item in items.items()
+        }
+        cached = await ops.get_cached_enhancements(hashes.values())
+
+    enhancements: Dict[int, EnhancementOutput] = {
+        project_id: cached[hashes[project_id]]
+        for project_id in items
+        if hashes[project_id] in cached
+    }
+    misses = [project_id for project_id in items if project_id not in enhancements]
+    # Projects with identical text share one input in the model call
+    to_enhance = {hashes[project_id]: items[project_id] for project_id in misses}
+    new_cache_entries: Dict[str, EnhancementOutput] = {}
+    error: Optional[str] = None
+    if to_enhance:
+        start = time.perf_counter()
+        try:
+            outputs = await provider.enhance(
+                list(to_enhance.values()), ENHANCEMENT_PROMPT
+            )
+        except Exception as e:
+            ENHANCEMENT_MODEL_CALLS.labels(provider.name, "error").inc()
+            error = repr(e)
+            logger.warning("Enhancement of %d projects failed: %s", len(misses), error)
+        else:
+            ENHANCEMENT_MODEL_CALLS.labels(provider.name, "ok").inc()
+            new_cache_entries = dict(zip(to_enhance, outputs))
+            for project_id in misses:
+                enhancements[project_id] = new_cache_entries[hashes[project_id]]
+        ENHANCEMENT_MODEL_DURATION.labels(provider.name).observe(
+            time.perf_counter() - start
+        )
+
+    async with sessionmanager.session_factory() as db:
+        ops = EnhancementOperations(db)
+        if error is not None:
+            await ops.fail_jobs(
+                [row for row in claimed if row.id in misses],
+                error,
+                settings.ENHANCEMENT_MAX_ATTEMPTS,
+            )
+            ENHANCEMENT_PROJECTS.labels("failed").inc(len(misses))
+        if enhancements:
+            await ops.save_enhancements(
+                claimed, enhancements, new_cache_entries, ENHANCEMENT_PROMPT
+            )
+            ENHANCEMENT_PROJECTS.labels("cached").inc(len(items) - len(misses))
+            if error is None:
+                ENHANCEMENT_PROJECTS.labels("enhanced").inc(len(misses))
+    return len(claimed)
+
+
+async def drain(
+    provider: EnhancementProvider, batch_size: int, concurrency: int
+) -> int:
+    """Process batches until the queue has nothing runnable; returns projects claimed."""
+
+    async def drain_one() -> int:
+        total = 0
+        while claimed := await process_batch(provider, batch_size):
+            total += claimed
+        return total
+
+    return sum(await asyncio.gather(*(drain_one() for _ in range(concurrency))))
+
+
+async def run_worker(
+    provider: EnhancementProvider,
+    batch_size: int,
+    concurrency: int,
+    poll_interval: float,
+    stop: asyncio.Event,
+) -> None:
+    """Keep ``concurrency`` batches in flight, polling while the queue is empty."""
+
+    async def worker_loop() -> None:
+        while not stop.is_set():
+            try:
+                claimed = await process_batch(provider, batch_size)
+            except Exception as e:
+                logger.exception("Enhancement batch failed: %s", e)
+                claimed = 0
+            if not claimed:
+                try:
+                    await asyncio.wait_for(stop.wait(), poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    await asyncio.gather(*(worker_loop() for _ in range(concurrency)))
+
+
+async def main(once: bool, batch_size: int, concurrency: int) -> None:
+    if not settings.METRICS_DIR:
+        logger.warning("METRICS_DIR is not set; worker metrics are not exported")
+    if settings.CACHE_BACKEND == "memory":
+        logger.warning(
+            "CACHE_BACKEND is memory; enhanced projects stay stale in the API "
+            "cache for up to CACHE_TTL seconds"
+        )
+    sessionmanager.init_db()
+    provider = get_enhancement_provider()
+    start = time.perf_counter()
+    try:
+        if once:
+            claimed = await drain(provider, batch_size, concurrency)
+            logger.info(
+                "Enhancement queue drained",
+                extra={
+                    "projects": claimed,
+                    "seconds": round(time.perf_counter() - start, 2),
+                },
+            )
+            return
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        logger.info(
+            "Enhancement worker started",
+            extra={
+                "provider": provider.name,
+                "batch_size": batch_size,
+                "concurrency": concurrency,
+            },
+        )
+        await run_worker(
+            provider, batch_size, concurrency, settings.ENHANCEMENT_POLL_INTERVAL, stop
+        )
+    finally:
+        await provider.close()
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--once", action="store_true", help="drain the queue and exit")
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.ENHANCEMENT_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.ENHANCEMENT_CONCURRENCY
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.once, args.batch_size, args.concurrency))
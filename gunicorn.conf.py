@@ -1,5 +1,26 @@
+import os
+import tempfile
+
 from settings import settings
 
+# Directory where every worker, and the enhancement worker, writes its metric
+# samples. It must be set before prometheus_client is first imported, which
+# picks its storage then, so before the imports below.
+DEFAULT_METRICS_DIR = os.path.join(
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+    "mypy_test-metrics",
+)
+metrics_dir_defaulted = not settings.METRICS_DIR
+if metrics_dir_defaulted:
+    settings.METRICS_DIR = DEFAULT_METRICS_DIR
+    os.environ["METRICS_DIR"] = settings.METRICS_DIR
+
+from utils.metrics import mark_process_dead, remove_dead_process_files  # noqa: E402
+from utils.rate_limit import (  # noqa: E402
+    SharedMemoryRateLimitBackend,
+    shared_memory_path,
+)
+
 worker_class = "uvicorn.workers.UvicornWorker"
 wsgi_app = "main:app"
 bind = "127.0.0.1:8080"
@@ -10,3 +31,36 @@ workers = settings.GUNICORN_WORKERS
 threads = settings.GUNICORN_THREADS
 capture_output = True
 loglevel = "info"
+
+
+def on_starting(server):
+    # Rate limit table shared by all workers, created before they fork
+    if settings.RATE_LIMIT_BACKEND == "shared":
+        if not settings.RATE_LIMIT_SHM_PATH:
+            settings.RATE_LIMIT_SHM_PATH = shared_memory_path()
+            os.environ["RATE_LIMIT_SHM_PATH"] = settings.RATE_LIMIT_SHM_PATH
+        SharedMemoryRateLimitBackend.create(
+            settings.RATE_LIMIT_SHM_PATH, settings.RATE_LIMIT_MAX_KEYS
+        )
+
+    if metrics_dir_defaulted:
+        server.log.warning(
+            "METRICS_DIR is not set; using %s. Set it for the enhancement "
+            "worker too to include its metrics in /metrics",
+            settings.METRICS_DIR,
+        )
+    # Samples of processes from a previous run are dropped so counters start
+    # from zero; a running enhancement worker keeps its own
+    remove_dead_process_files()
+
+
+def child_exit(server, worker):
+    mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    if settings.RATE_LIMIT_BACKEND == "shared" and settings.RATE_LIMIT_SHM_PATH:
+        try:
+            os.remove(settings.RATE_LIMIT_SHM_PATH)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,96 @@
+"""Import users or projects from an NDJSON or CSV file.
+
+Usage: ``uv run python import_data.py projects projects.csv``
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import AsyncIterator, Optional
+
+from db import sessionmanager
+from dependencies.import_operations import ImportOperations
+from utils.constants import IMPORT_CHUNK_SIZE
+from utils.import_reader import ImportFormat
+from utils.logger import get_logger
+
+logger = get_logger()
+
+READ_SIZE = 1 << 20
+
+
+async def file_chunks(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_SIZE):
+            yield chunk
+
+
+async def import_file(
+    kind: str, path: str, import_format: ImportFormat, chunk_size: int
+) -> None:
+    sessionmanager.init_db()
+    assert sessionmanager.session_factory
+    start = time.perf_counter()
+
+    def log_progress(received: int, staged: int) -> None:
+        logger.info(
+            "Import progress",
+            extra={
+                "received": received,
+                "staged": staged,
+                "rows_per_s": round(received / (time.perf_counter() - start)),
+            },
+        )
+
+    try:
+        async with sessionmanager.session_factory() as db:
+            ops = ImportOperations(db)
+            run = ops.import_users if kind == "users" else ops.import_projects
+            result = await run(
+                file_chunks(path), import_format, chunk_size, on_progress=log_progress
+            )
+    finally:
+        await sessionmanager.close()
+
+    logger.info(
+        "Import finished",
+        extra={
+            **result.model_dump(exclude={"errors"}),
+            "seconds": round(time.perf_counter() - start, 2),
+        },
+    )
+    for error in result.errors:
+        logger.warning(
+            "Rejected record %d: %s", error.index, error.detail.splitlines()[0]
+        )
+
+
+def detect_format(path: str, import_format: Optional[str]) -> ImportFormat:
+    if import_format == "csv" or (
+        import_format is None and os.path.splitext(path)[1].lower() == ".csv"
+    ):
+        return "csv"
+    return "ndjson"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("kind", choices=["users", "projects"])
+    parser.add_argument("path")
+    parser.add_argument(
+        "--format",
+        choices=["ndjson", "csv"],
+        default=None,
+        help="defaults to csv for .csv files and ndjson otherwise",
+    )
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+    asyncio.run(
+        import_file(
+            args.kind,
+            args.path,
+            detect_format(args.path, args.format),
+            args.chunk_size,
+        )
+    )
@@ -1,21 +1,33 @@
+import math
 from contextlib import asynccontextmanager
-from typing import Awaitable, Callable
-from uuid import uuid4
 
-from fastapi import FastAPI, Request, Response, status
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from slowapi import Limiter
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import sessionmanager
+from db import get_db, sessionmanager
+from dependencies.enhancement_operations import EnhancementOperations
 from routes.project_routes import router as project_routes
 from routes.user_routes import router as user_routes
-from schemas.common import ErrorResponseSchema
-from settings import settings
+from schemas.common import (
+    CacheStatsSchema,
+    EnhancementQueueStatsSchema,
+    ErrorResponseSchema,
+    PoolStatsSchema,
+)
+from utils.cache import get_cache
 from utils.constants import API_RATE_LIMIT
-from utils.logger import RequestContextVar, get_logger, request_ctx_var
+from utils.logger import get_logger
+from utils.metrics import render_metrics
+from utils.middleware import (
+    MetricsMiddleware,
+    ReadYourWritesMiddleware,
+    RequestContextMiddleware,
+)
+from utils.pagination import NEXT_CURSOR_HEADER
+from utils.rate_limit import RateLimitExceededError, get_rate_limiter
 
 logger = get_logger()
 
@@ -25,9 +37,12 @@ async def lifespan(app: FastAPI):
     # Initialize db pool
     if not sessionmanager.session_factory:
         sessionmanager.init_db()
+    sessionmanager.start_replica_monitor()
 
     yield
     await sessionmanager.close()
+    await get_cache().close()
+    await limiter.backend.close()
 
 
 app = FastAPI(
@@ -47,50 +62,60 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", NEXT_CURSOR_HEADER, "ETag", "Last-Modified"],
 )
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(MetricsMiddleware)
+# Added last so it runs outermost: RequestContextMiddleware wraps
+# MetricsMiddleware, which then sees the request context
+app.add_middleware(RequestContextMiddleware)
 
 
-limiter = Limiter(
-    key_func=get_remote_address,
-)
+limiter = get_rate_limiter()
 app.state.limiter = limiter
 
 
-@app.exception_handler(RateLimitExceeded)
-async def rate_limit_exceed_handler(request: Request, exc: RateLimitExceeded):
-    response = JSONResponse(
+@app.exception_handler(RateLimitExceededError)
+async def rate_limit_exceed_handler(request: Request, exc: RateLimitExceededError):
+    result = exc.result
+    return JSONResponse(
         {"detail": "Rate limit exceeded"},
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={
+            "Retry-After": str(math.ceil(result.retry_after)),
+            "X-RateLimit-Limit": str(result.limit),
+            "X-RateLimit-Remaining": str(result.remaining),
+            "X-RateLimit-Reset": str(math.ceil(result.reset_at)),
+        },
     )
-    response = request.app.state.limiter._inject_headers(
-        response, getattr(request.state, "view_rate_limit", None)
-    )
-    return response
-
-
-@app.middleware("http")
-async def logging_middleware(
-    request: Request, call_next: Callable[[Request], Awaitable[Response]]
-) -> Response:
-    request_id = str(uuid4())
-    request_path = f"{request.method} {request.url.path}"
-    request_ctx_var.set(
-        RequestContextVar(request_id=request_id, request_path=request_path)
-    )
-    extra = {}
-    if settings.ENV == "local":
-        extra["query"] = request.query_params  # type: ignore
-    logger.info("REquest log", extra=extra)
-    response = await call_next(request)
-    response.headers["X-Request-ID"] = request_id
-    return response
 
 
 app.include_router(user_routes, prefix="/api/users", tags=["User Management"])
 app.include_router(project_routes, prefix="/api/projects", tags=["Projects"])
 
 
-@app.get("/", tags=["Health"])
-@limiter.limit(API_RATE_LIMIT)
-async def healthz(request: Request) -> str:
+@app.get("/", tags=["Health"], dependencies=[Depends(limiter.limit(API_RATE_LIMIT))])
+async def healthz() -> str:
     return "ok!"
+
+
+@app.get("/health/pool", tags=["Health"])
+async def pool_stats() -> PoolStatsSchema:
+    return sessionmanager.pool_stats()
+
+
+@app.get("/health/cache", tags=["Health"])
+async def cache_stats() -> CacheStatsSchema:
+    return get_cache().stats()
+
+
+@app.get("/health/enhancement", tags=["Health"])
+async def enhancement_queue_stats(
+    db: AsyncSession = Depends(get_db),
+) -> EnhancementQueueStatsSchema:
+    return await EnhancementOperations(db).get_queue_stats()
+
+
+@app.get("/metrics", tags=["Health"], response_class=Response)
+async def metrics() -> Response:
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
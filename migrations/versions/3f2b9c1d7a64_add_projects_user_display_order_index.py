@@ -0,0 +1,54 @@
+"""add projects user_id display_order index
+
+Revision ID: 3f2b9c1d7a64
+Revises: e766ea3944e3
+Create Date: 2026-10-17 09:12:41.207113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f2b9c1d7a64"
+down_revision: Union[str, Sequence[str], None] = "e766ea3944e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY does not block writes to projects while the index builds,
+    # but cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_projects_user_id_display_order_id",
+            "projects",
+            ["user_id", "display_order", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        # Redundant with the primary key index
+        op.drop_index(
+            op.f("ix_projects_id"),
+            table_name="projects",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_projects_id"),
+            "projects",
+            ["id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_projects_user_id_display_order_id",
+            table_name="projects",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,38 @@
+"""cascade project deletes from users
+
+Revision ID: 8c4e1a6f2d93
+Revises: 3f2b9c1d7a64
+Create Date: 2026-10-17 11:02:17.448520
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4e1a6f2d93"
+down_revision: Union[str, Sequence[str], None] = "3f2b9c1d7a64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint("projects_user_id_fkey", "projects", type_="foreignkey")
+    op.create_foreign_key(
+        "projects_user_id_fkey",
+        "projects",
+        "users",
+        ["user_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("projects_user_id_fkey", "projects", type_="foreignkey")
+    op.create_foreign_key(
+        "projects_user_id_fkey", "projects", "users", ["user_id"], ["id"]
+    )
@@ -0,0 +1,57 @@
+"""add projects active and featured partial indexes
+
+Revision ID: a5d83e6f0b12
+Revises: f3a9c2d81b47
+Create Date: 2026-10-17 16:58:17.529034
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a5d83e6f0b12"
+down_revision: Union[str, Sequence[str], None] = "f3a9c2d81b47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built CONCURRENTLY so writes to projects are not blocked meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_projects_active_user_id_display_order_id",
+            "projects",
+            ["user_id", "display_order", "id"],
+            unique=False,
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_projects_featured_user_id_display_order_id",
+            "projects",
+            ["user_id", "display_order", "id"],
+            unique=False,
+            postgresql_where=sa.text("is_featured"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_projects_featured_user_id_display_order_id",
+            table_name="projects",
+            postgresql_where=sa.text("is_featured"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_projects_active_user_id_display_order_id",
+            table_name="projects",
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+        )
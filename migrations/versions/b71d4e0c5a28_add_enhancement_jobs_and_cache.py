@@ -0,0 +1,130 @@
+"""add enhancement jobs and cache
+
+Revision ID: b71d4e0c5a28
+Revises: 8c4e1a6f2d93
+Create Date: 2026-10-17 15:04:52.318406
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b71d4e0c5a28"
+down_revision: Union[str, Sequence[str], None] = "8c4e1a6f2d93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Statement-level on insert so bulk creates and imports enqueue in one
+# INSERT ... SELECT; row-level on update to skip rows whose text is unchanged.
+# asyncpg runs one statement per execute
+ENQUEUE_STATEMENTS = [
+    """
+CREATE FUNCTION enqueue_inserted_project_enhancements() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO enhancement_jobs (project_id)
+    SELECT id FROM new_projects
+    ON CONFLICT (project_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+    """
+CREATE FUNCTION enqueue_updated_project_enhancement() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO enhancement_jobs (project_id)
+    VALUES (NEW.id)
+    ON CONFLICT (project_id) DO UPDATE
+    SET status = 'pending', attempts = 0, run_after = now(),
+        locked_at = NULL, last_error = NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+    """
+CREATE TRIGGER projects_enqueue_enhancement_on_insert
+AFTER INSERT ON projects
+REFERENCING NEW TABLE AS new_projects
+FOR EACH STATEMENT EXECUTE FUNCTION enqueue_inserted_project_enhancements()
+""",
+    """
+CREATE TRIGGER projects_enqueue_enhancement_on_update
+AFTER UPDATE OF description, highlights ON projects
+FOR EACH ROW
+WHEN (
+    OLD.description IS DISTINCT FROM NEW.description
+    OR OLD.highlights::text IS DISTINCT FROM NEW.highlights::text
+)
+EXECUTE FUNCTION enqueue_updated_project_enhancement()
+""",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "enhancement_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status", sa.String(length=20), server_default="pending", nullable=False
+        ),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "run_after",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("project_id"),
+    )
+    op.create_index(
+        "ix_enhancement_jobs_pending",
+        "enhancement_jobs",
+        ["run_after", "id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.create_table(
+        "enhancement_cache",
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("description_enhanced", sa.Text(), nullable=False),
+        sa.Column("highlights_enhanced", sa.JSON(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("content_hash"),
+    )
+    for statement in ENQUEUE_STATEMENTS:
+        op.execute(statement)
+    # Projects created before the pipeline existed were never enhanced
+    op.execute(
+        "INSERT INTO enhancement_jobs (project_id) "
+        "SELECT id FROM projects WHERE last_enhanced_at IS NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER projects_enqueue_enhancement_on_update ON projects")
+    op.execute("DROP TRIGGER projects_enqueue_enhancement_on_insert ON projects")
+    op.execute("DROP FUNCTION enqueue_updated_project_enhancement()")
+    op.execute("DROP FUNCTION enqueue_inserted_project_enhancements()")
+    op.drop_table("enhancement_cache")
+    op.drop_index("ix_enhancement_jobs_pending", table_name="enhancement_jobs")
+    op.drop_table("enhancement_jobs")
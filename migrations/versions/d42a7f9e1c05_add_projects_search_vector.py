@@ -0,0 +1,55 @@
+"""add projects search vector
+
+Revision ID: d42a7f9e1c05
+Revises: b71d4e0c5a28
+Create Date: 2026-10-17 15:31:08.642190
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d42a7f9e1c05"
+down_revision: Union[str, Sequence[str], None] = "b71d4e0c5a28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(project_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description_enhanced, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(highlights::text, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rewrites the table to fill the stored column
+    op.add_column(
+        "projects",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_DOCUMENT, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_projects_search_vector",
+        "projects",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_projects_search_vector", table_name="projects", postgresql_using="gin"
+    )
+    op.drop_column("projects", "search_vector")
@@ -0,0 +1,111 @@
+"""projects json columns to jsonb
+
+Revision ID: f3a9c2d81b47
+Revises: d42a7f9e1c05
+Create Date: 2026-10-17 16:12:40.905317
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a9c2d81b47"
+down_revision: Union[str, Sequence[str], None] = "d42a7f9e1c05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(project_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description_enhanced, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(highlights::text, '')), 'C')"
+)
+
+# json has no equality operator, jsonb does
+UPDATE_TRIGGER = """
+CREATE TRIGGER projects_enqueue_enhancement_on_update
+AFTER UPDATE OF description, highlights ON projects
+FOR EACH ROW
+WHEN (
+    OLD.description IS DISTINCT FROM NEW.description
+    OR OLD.highlights{cast} IS DISTINCT FROM NEW.highlights{cast}
+)
+EXECUTE FUNCTION enqueue_updated_project_enhancement()
+"""
+
+
+def drop_highlights_dependents() -> None:
+    """Postgres refuses to change the type of a column these depend on."""
+    op.execute("DROP TRIGGER projects_enqueue_enhancement_on_update ON projects")
+    op.drop_index(
+        "ix_projects_search_vector", table_name="projects", postgresql_using="gin"
+    )
+    op.drop_column("projects", "search_vector")
+
+
+def create_highlights_dependents(update_trigger: str) -> None:
+    op.add_column(
+        "projects",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_DOCUMENT, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_projects_search_vector",
+        "projects",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.execute(update_trigger)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    drop_highlights_dependents()
+    for column in ("highlights", "technologies_used"):
+        op.alter_column(
+            "projects",
+            column,
+            existing_type=sa.JSON(),
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_nullable=True,
+            postgresql_using=f"{column}::jsonb",
+        )
+    create_highlights_dependents(UPDATE_TRIGGER.format(cast=""))
+    op.create_index(
+        "ix_projects_technologies_used",
+        "projects",
+        ["technologies_used"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"technologies_used": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_projects_technologies_used",
+        table_name="projects",
+        postgresql_using="gin",
+        postgresql_ops={"technologies_used": "jsonb_path_ops"},
+    )
+    drop_highlights_dependents()
+    for column in ("highlights", "technologies_used"):
+        op.alter_column(
+            "projects",
+            column,
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            type_=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using=f"{column}::json",
+        )
+    create_highlights_dependents(UPDATE_TRIGGER.format(cast="::text"))
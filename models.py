@@ -4,17 +4,34 @@ from typing import List, Optional
 from sqlalchemy import (
     JSON,
     Boolean,
+    Computed,
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     func,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+# Large text/JSON project columns, deferred unless a query undefers the group
+PROJECT_CONTENT_GROUP = "content"
+
+# Text search configuration of the project search vector and its queries
+PROJECT_SEARCH_CONFIG = "english"
+# Name matches rank above the description, then the AI text and highlights
+PROJECT_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(project_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description_enhanced, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(highlights::text, '')), 'C')"
+)
+
 
 class Base(AsyncAttrs, DeclarativeBase):
     """Base class for all models."""
@@ -44,7 +61,10 @@ class User(Base):
     # Relationships
 
     projects: Mapped[List["Project"]] = relationship(
-        "Project", back_populates="user", cascade="all, delete-orphan"
+        "Project",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __repr__(self):
@@ -55,25 +75,65 @@ class Project(Base):
     """Project Model - Stores portfolio projects with AI enhancement"""
 
     __tablename__ = "projects"
+    __table_args__ = (
+        # Serves per-user listing ordered by display_order; id breaks ties.
+        Index(
+            "ix_projects_user_id_display_order_id",
+            "user_id",
+            "display_order",
+            "id",
+        ),
+        # Same order over the rows portfolio pages and hero sections show
+        Index(
+            "ix_projects_active_user_id_display_order_id",
+            "user_id",
+            "display_order",
+            "id",
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_projects_featured_user_id_display_order_id",
+            "user_id",
+            "display_order",
+            "id",
+            postgresql_where=text("is_featured"),
+        ),
+        Index("ix_projects_search_vector", "search_vector", postgresql_using="gin"),
+        # Serves containment (@>) filters on technologies
+        Index(
+            "ix_projects_technologies_used",
+            "technologies_used",
+            postgresql_using="gin",
+            postgresql_ops={"technologies_used": "jsonb_path_ops"},
+        ),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     user_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=False
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     project_name: Mapped[str] = mapped_column(String(255), nullable=False)
 
     # User's original input
-    description: Mapped[str] = mapped_column(Text, nullable=False)
-    highlights: Mapped[Optional[List[str]]] = mapped_column(JSON)  # Array of strings
+    description: Mapped[str] = mapped_column(
+        Text, nullable=False, deferred_group=PROJECT_CONTENT_GROUP
+    )
+    highlights: Mapped[Optional[List[str]]] = mapped_column(
+        JSONB, deferred_group=PROJECT_CONTENT_GROUP
+    )  # Array of strings
 
     # AI-enhanced versions
-    description_enhanced: Mapped[Optional[str]] = mapped_column(Text)
+    description_enhanced: Mapped[Optional[str]] = mapped_column(
+        Text, deferred_group=PROJECT_CONTENT_GROUP
+    )
     highlights_enhanced: Mapped[Optional[List[str]]] = mapped_column(
-        JSON
+        JSON, deferred_group=PROJECT_CONTENT_GROUP
     )  # Array of strings
 
     # Enhancement tracking
-    enhancement_prompt_used: Mapped[Optional[str]] = mapped_column(Text)
+    enhancement_prompt_used: Mapped[Optional[str]] = mapped_column(
+        Text, deferred_group=PROJECT_CONTENT_GROUP
+    )
     last_enhanced_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True)
     )
@@ -82,7 +142,9 @@ class Project(Base):
     github_url: Mapped[Optional[str]] = mapped_column(String(500))
     start_date: Mapped[Optional[date]] = mapped_column(Date)
     end_date: Mapped[Optional[date]] = mapped_column(Date)
-    technologies_used: Mapped[Optional[List[str]]] = mapped_column(JSON)
+    technologies_used: Mapped[Optional[List[str]]] = mapped_column(
+        JSONB, deferred_group=PROJECT_CONTENT_GROUP
+    )
     is_featured: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     display_order: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
@@ -93,8 +155,68 @@ class Project(Base):
         DateTime(timezone=True), onupdate=func.now()
     )
 
+    # Maintained by the database; only read by search queries
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, Computed(PROJECT_SEARCH_DOCUMENT, persisted=True), deferred=True
+    )
+
     # Relationship
     user: Mapped["User"] = relationship("User", back_populates="projects")
 
     def __repr__(self):
         return f"<Project: {self.project_name}>"
+
+
+class EnhancementJob(Base):
+    """Pending AI enhancement of a project, filled in by database triggers
+
+    A project has at most one job; editing its text again resets the job to
+    pending. Jobs are deleted once the enhancement is written back.
+    """
+
+    __tablename__ = "enhancement_jobs"
+    __table_args__ = (
+        # Serves the worker claim: oldest runnable pending jobs first.
+        Index(
+            "ix_enhancement_jobs_pending",
+            "run_after",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    project_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+    )
+    # pending, running or failed (gave up after ENHANCEMENT_MAX_ATTEMPTS)
+    status: Mapped[str] = mapped_column(
+        String(20), default="pending", server_default="pending", nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class EnhancementCacheEntry(Base):
+    """Model output keyed by a hash of the description, highlights and prompt"""
+
+    __tablename__ = "enhancement_cache"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    description_enhanced: Mapped[str] = mapped_column(Text, nullable=False)
+    highlights_enhanced: Mapped[Optional[List[str]]] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -1,22 +1,65 @@
-from typing import List
+import re
+from datetime import datetime
+from typing import AsyncIterator, List, Literal, Optional, Sequence, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import get_db
-from dependencies.project_operations import ProjectOperations
-from dependencies.user_operations import UserOperations
+from db import get_db, get_read_db
+from dependencies.import_operations import ImportOperations
+from dependencies.project_operations import MODIFIED_AT_COLUMN, ProjectOperations
+from schemas.common import BulkItemErrorSchema, ImportResultSchema
 from schemas.project_schemas import (
+    ProjectBulkCreateSchema,
+    ProjectBulkDeleteResponseSchema,
+    ProjectBulkResponseSchema,
+    ProjectBulkUpdateSchema,
     ProjectCreateSchema,
     ProjectResponseSchema,
+    ProjectSearchResultSchema,
+    ProjectSummarySchema,
     ProjectUpdateSchema,
+    TechnologyCountSchema,
+)
+from settings import settings
+from utils.conditional import (
+    is_conditional,
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+    weak_etag,
+)
+from utils.constants import MAX_BULK_ITEMS, MAX_SEARCH_TERMS, SEARCH_MAX_CANDIDATES
+from utils.pagination import (
+    NEXT_CURSOR_HEADER,
+    cursor_value_to_float,
+    decode_cursor,
+    encode_cursor,
+    float_to_cursor_value,
+)
+from utils.serialization import (
+    RawJSONResponse,
+    rows_to_csv,
+    rows_to_json,
+    rows_to_ndjson,
 )
 
 router = APIRouter()
 
 
+def page_validators(
+    versions: Sequence[Tuple[int, datetime]], projection: Optional[List[str]]
+) -> Tuple[str, Optional[datetime]]:
+    """ETag and Last-Modified of a list page from its ``(id, modified_at)`` pairs"""
+    etag = weak_etag(projection, *(part for version in versions for part in version))
+    last_modified = max((modified_at for _, modified_at in versions), default=None)
+    return etag, last_modified
+
+
 @router.post(
     "/create",
+    response_model=ProjectResponseSchema,
     status_code=status.HTTP_201_CREATED,
     responses={
         status.HTTP_201_CREATED: {
@@ -33,44 +76,405 @@ async def create_project(
 ):
     """Create project entry"""
     ops = ProjectOperations(db)
-    user_ops = UserOperations(db)
 
-    # Validate user exists
-    user = await user_ops.get_user_by_id(payload.user_id)
-    if not user:
+    project = await ops.create_project(payload)
+    if project is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"User with id {payload.user_id} not found",
         )
-
-    project = await ops.create_project(payload)
     return project
 
 
 @router.get(
     "/list",
+    response_model=List[ProjectResponseSchema],
     status_code=status.HTTP_200_OK,
     responses={
         status.HTTP_200_OK: {
-            "model": List[ProjectResponseSchema],
-            "description": "List of projects retrieved successfully",
+            "model": Union[List[ProjectResponseSchema], List[ProjectSummarySchema]],
+            "description": "List of projects retrieved successfully; "
+            "view=summary and fields= return only the selected columns",
+            "headers": {
+                NEXT_CURSOR_HEADER: {
+                    "description": "Cursor for the next page, absent on the last page",
+                    "schema": {"type": "string"},
+                }
+            },
         },
     },
 )
 async def get_all_projects(
+    request: Request,
+    response: Response,
     user_id: int = Query(..., description="User ID"),
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from the X-Next-Cursor header"
+    ),
+    view: Literal["full", "summary"] = Query(
+        "full", description="summary leaves out the large text/JSON fields"
+    ),
+    fields: Optional[List[str]] = Query(
+        None,
+        description="Fields to return, overriding view; "
+        "id and display_order are always included",
+    ),
+    technology: Optional[str] = Query(
+        None, description="Only projects using this technology"
+    ),
+    any_of: Optional[List[str]] = Query(
+        None, description="Only projects using at least one of these technologies"
+    ),
+    all_of: Optional[List[str]] = Query(
+        None, description="Only projects using all of these technologies"
+    ),
+    active_only: bool = Query(False, description="Only active projects"),
+    featured_only: bool = Query(False, description="Only featured projects"),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all projects for a user"""
+    if technology is not None:
+        all_of = [technology, *(all_of or [])]
+    projection = None
+    if fields:
+        unknown = set(fields) - set(ProjectResponseSchema.model_fields)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+        projection = list(dict.fromkeys(["id", "display_order", *fields]))
+    elif view == "summary":
+        projection = list(ProjectSummarySchema.model_fields)
+
+    after = None
+    if cursor:
+        try:
+            display_order, project_id = decode_cursor(cursor, 2)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        after = (display_order, project_id)
+
     ops = ProjectOperations(db)
-    projects = await ops.get_all_projects(user_id, skip=skip, limit=limit)
+    versions: Optional[Sequence[Tuple[int, datetime]]] = None
+    if is_conditional(request):
+        versions = await ops.get_all_project_versions(
+            user_id,
+            skip=skip,
+            limit=limit,
+            after=after,
+            any_of=any_of,
+            all_of=all_of,
+            active_only=active_only,
+            featured_only=featured_only,
+        )
+        etag, last_modified = page_validators(versions, projection)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+    # Projected rows come straight from table columns, so they are encoded as-is
+    if projection is not None or settings.RESPONSE_MODE == "fast":
+        # The validators come from the page query unless already read above
+        extra = {MODIFIED_AT_COLUMN} if versions is None else set()
+        rows = await ops.get_all_project_rows(
+            user_id,
+            skip=skip,
+            limit=limit,
+            after=after,
+            fields=projection,
+            any_of=any_of,
+            all_of=all_of,
+            active_only=active_only,
+            featured_only=featured_only,
+            with_modified_at=bool(extra),
+        )
+        fast_response = RawJSONResponse(rows_to_json(rows, exclude=extra))
+        if rows and len(rows) == limit:
+            last_row = rows[-1]
+            fast_response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+                [last_row.display_order, last_row.id]
+            )
+
+        if versions is None:
+            versions = [(row.id, row.modified_at) for row in rows]
+        fast_response.headers.update(
+            validator_headers(*page_validators(versions, projection))
+        )
+        return fast_response
+
+    projects = await ops.get_all_projects(
+        user_id,
+        skip=skip,
+        limit=limit,
+        after=after,
+        any_of=any_of,
+        all_of=all_of,
+        active_only=active_only,
+        featured_only=featured_only,
+    )
+
+    if projects and len(projects) == limit:
+        last = projects[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [last.display_order, last.id]
+        )
+    if versions is None:
+        versions = [
+            (project.id, project.updated_at or project.created_at)
+            for project in projects
+        ]
+    response.headers.update(validator_headers(*page_validators(versions, projection)))
     return projects
 
 
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_201_CREATED: {
+            "model": ProjectBulkResponseSchema,
+            "description": "Projects created; rejected items are listed in errors",
+        },
+    },
+)
+async def create_projects(
+    payload: ProjectBulkCreateSchema, db: AsyncSession = Depends(get_db)
+) -> ProjectBulkResponseSchema:
+    """Create many project entries in one transaction"""
+    ops = ProjectOperations(db)
+    projects, errors = await ops.create_projects(payload.items)
+    return ProjectBulkResponseSchema(
+        projects=[ProjectResponseSchema.model_validate(p) for p in projects],
+        errors=[BulkItemErrorSchema(index=i, detail=d) for i, d in errors.items()],
+    )
+
+
+@router.put(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "model": ProjectBulkResponseSchema,
+            "description": "Projects updated; missing items are listed in errors",
+        },
+    },
+)
+async def update_projects(
+    payload: ProjectBulkUpdateSchema,
+    user_id: int = Query(..., description="User ID"),
+    db: AsyncSession = Depends(get_db),
+) -> ProjectBulkResponseSchema:
+    """Update many project entries in one transaction"""
+    ops = ProjectOperations(db)
+    projects, errors = await ops.update_projects(user_id, payload.items)
+    return ProjectBulkResponseSchema(
+        projects=[ProjectResponseSchema.model_validate(p) for p in projects],
+        errors=[BulkItemErrorSchema(index=i, detail=d) for i, d in errors.items()],
+    )
+
+
+@router.delete(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "model": ProjectBulkDeleteResponseSchema,
+            "description": "Projects deleted; missing items are listed in errors",
+        },
+    },
+)
+async def delete_projects(
+    ids: List[int] = Query(..., max_length=MAX_BULK_ITEMS, description="Project IDs"),
+    user_id: int = Query(..., description="User ID"),
+    db: AsyncSession = Depends(get_db),
+) -> ProjectBulkDeleteResponseSchema:
+    """Delete many project entries in one statement"""
+    ops = ProjectOperations(db)
+    deleted_ids = await ops.delete_projects(ids, user_id)
+
+    deleted = set(deleted_ids)
+    return ProjectBulkDeleteResponseSchema(
+        deleted_ids=deleted_ids,
+        errors=[
+            BulkItemErrorSchema(
+                index=i, detail=f"Project with id {project_id} not found"
+            )
+            for i, project_id in enumerate(ids)
+            if project_id not in deleted
+        ],
+    )
+
+
+@router.post(
+    "/import",
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+        }
+    },
+    responses={
+        status.HTTP_201_CREATED: {
+            "model": ImportResultSchema,
+            "description": "Projects imported; rejected records are listed in errors",
+        },
+    },
+)
+async def import_projects(
+    request: Request,
+    import_format: Literal["ndjson", "csv"] = Query(
+        "ndjson", alias="format", description="Format of the request body"
+    ),
+    db: AsyncSession = Depends(get_db),
+) -> ImportResultSchema:
+    """Import projects streamed as NDJSON or CSV in the request body"""
+    ops = ImportOperations(db)
+    return await ops.import_projects(request.stream(), import_format)
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "Projects streamed as NDJSON or CSV",
+        },
+    },
+)
+async def export_projects(
+    user_id: Optional[int] = Query(
+        None, description="User ID; every project is exported when omitted"
+    ),
+    export_format: Literal["ndjson", "csv"] = Query(
+        "ndjson", alias="format", description="Export format"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+) -> StreamingResponse:
+    """Stream projects from a server-side cursor in fixed-size batches"""
+    ops = ProjectOperations(db)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        header = True
+        async for rows in ops.stream_project_rows(user_id):
+            if export_format == "csv":
+                yield rows_to_csv(rows, header=header)
+                header = False
+            else:
+                yield rows_to_ndjson(rows)
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        chunks(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="projects.{export_format}"'
+        },
+    )
+
+
+@router.get(
+    "/technologies",
+    response_model=List[TechnologyCountSchema],
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "model": List[TechnologyCountSchema],
+            "description": "Technologies of the user's projects, most used first",
+        },
+    },
+)
+async def get_technology_counts(
+    user_id: int = Query(..., description="User ID"),
+    db: AsyncSession = Depends(get_read_db),
+) -> RawJSONResponse:
+    """Number of a user's projects using each technology"""
+    rows = await ProjectOperations(db).get_technology_counts(user_id)
+    return RawJSONResponse(rows_to_json(rows))
+
+
+@router.get(
+    "/search",
+    response_model=List[ProjectSearchResultSchema],
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "model": List[ProjectSearchResultSchema],
+            "description": "Matching projects, best match first. Without "
+            f"user_id only the newest {SEARCH_MAX_CANDIDATES} matches are ranked, "
+            "so older matches are left out",
+            "headers": {
+                NEXT_CURSOR_HEADER: {
+                    "description": "Cursor for the next page, absent on the last page",
+                    "schema": {"type": "string"},
+                }
+            },
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "No searchable terms or invalid cursor",
+        },
+    },
+)
+async def search_projects(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Words to match in the name, descriptions and highlights; "
+        "each word also matches as a prefix",
+    ),
+    user_id: Optional[int] = Query(
+        None,
+        description="User ID; every project is searched when omitted, ranking "
+        f"only the newest {SEARCH_MAX_CANDIDATES} matches",
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from the X-Next-Cursor header"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+) -> RawJSONResponse:
+    """Full-text search over projects, ranked by relevance"""
+    terms = re.findall(r"\w+", q)[:MAX_SEARCH_TERMS]
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Query has no searchable terms",
+        )
+
+    after = None
+    if cursor:
+        try:
+            rank_value, project_id = decode_cursor(cursor, 2)
+            after = (cursor_value_to_float(rank_value), project_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+    rows = await ProjectOperations(db).search_projects(
+        terms, user_id=user_id, limit=limit, after=after
+    )
+    response = RawJSONResponse(rows_to_json(rows))
+    if rows and len(rows) == limit:
+        last_row = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [float_to_cursor_value(last_row.rank), last_row.id]
+        )
+    return response
+
+
 @router.get(
     "/{project_id}",
+    response_model=ProjectResponseSchema,
     status_code=status.HTTP_200_OK,
     responses={
         status.HTTP_200_OK: {
@@ -83,13 +487,22 @@ async def get_all_projects(
     },
 )
 async def get_project_by_id(
+    request: Request,
+    response: Response,
     project_id: int,
     user_id: int = Query(..., description="User ID"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get single project by ID"""
     ops = ProjectOperations(db)
-    project = await ops.get_project_by_id(project_id, user_id)
+    if is_conditional(request):
+        modified_at = await ops.get_project_modified_at(project_id, user_id)
+        if modified_at is not None:
+            etag = weak_etag(project_id, modified_at)
+            if is_not_modified(request, etag, modified_at):
+                return not_modified_response(etag, modified_at)
+
+    project = await ops.get_cached_project(project_id, user_id)
 
     if not project:
         raise HTTPException(
@@ -97,11 +510,16 @@ async def get_project_by_id(
             detail=f"Project with id {project_id} not found",
         )
 
+    modified_at = project.updated_at or project.created_at
+    response.headers.update(
+        validator_headers(weak_etag(project.id, modified_at), modified_at)
+    )
     return project
 
 
 @router.put(
     "/{project_id}",
+    response_model=ProjectResponseSchema,
     status_code=status.HTTP_200_OK,
     responses={
         status.HTTP_200_OK: {
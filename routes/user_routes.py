@@ -1,21 +1,35 @@
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import get_db
+from db import get_db, get_read_db
+from dependencies.import_operations import ImportOperations
 from dependencies.user_operations import UserOperations
+from schemas.common import ImportResultSchema
 from schemas.user_schemas import (
     UserCreateSchema,
+    UserPortfolioSchema,
     UserResponseSchema,
     UserUpdateSchema,
 )
+from settings import settings
+from utils.conditional import (
+    is_conditional,
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+    weak_etag,
+)
+from utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from utils.serialization import RawJSONResponse, rows_to_json
 
 router = APIRouter()
 
 
 @router.post(
     "/create",
+    response_model=UserResponseSchema,
     status_code=status.HTTP_201_CREATED,
     responses={
         status.HTTP_201_CREATED: {
@@ -32,41 +46,102 @@ async def create_user(
 ):
     """Create a new user"""
     user_ops = UserOperations(db)
+    user = await user_ops.create_user(user_payload)
 
-    # Check if user already exists
-    if await user_ops.user_exists(
-        username=user_payload.username, email=user_payload.email
-    ):
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this username or email already exists",
         )
 
-    user = await user_ops.create_user(user_payload)
     return user
 
 
 @router.get(
     "/list",
+    response_model=List[UserResponseSchema],
     status_code=status.HTTP_200_OK,
     responses={
         status.HTTP_200_OK: {
             "model": List[UserResponseSchema],
             "description": "List of all users retrieved successfully",
+            "headers": {
+                NEXT_CURSOR_HEADER: {
+                    "description": "Cursor for the next page, absent on the last page",
+                    "schema": {"type": "string"},
+                }
+            },
         },
     },
 )
 async def get_all_users(
-    skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from the X-Next-Cursor header"
+    ),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all users with optional pagination"""
+    after_id = None
+    if cursor:
+        try:
+            (after_id,) = decode_cursor(cursor, 1)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
     user_ops = UserOperations(db)
-    users = await user_ops.get_all_users(skip=skip, limit=limit)
+    if settings.RESPONSE_MODE == "fast":
+        rows = await user_ops.get_all_user_rows(
+            skip=skip, limit=limit, after_id=after_id
+        )
+        fast_response = RawJSONResponse(rows_to_json(rows))
+        if rows and len(rows) == limit:
+            fast_response.headers[NEXT_CURSOR_HEADER] = encode_cursor([rows[-1].id])
+        return fast_response
+
+    users = await user_ops.get_all_users(skip=skip, limit=limit, after_id=after_id)
+
+    if users and len(users) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([users[-1].id])
     return users
 
 
+@router.post(
+    "/import",
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+        }
+    },
+    responses={
+        status.HTTP_201_CREATED: {
+            "model": ImportResultSchema,
+            "description": "Users imported; rejected records are listed in errors",
+        },
+    },
+)
+async def import_users(
+    request: Request,
+    import_format: Literal["ndjson", "csv"] = Query(
+        "ndjson", alias="format", description="Format of the request body"
+    ),
+    db: AsyncSession = Depends(get_db),
+) -> ImportResultSchema:
+    """Import users streamed as NDJSON or CSV in the request body"""
+    ops = ImportOperations(db)
+    return await ops.import_users(request.stream(), import_format)
+
+
 @router.get(
     "/{user_id}",
+    response_model=UserResponseSchema,
     status_code=status.HTTP_200_OK,
     responses={
         status.HTTP_200_OK: {
@@ -78,10 +153,22 @@ async def get_all_users(
         },
     },
 )
-async def get_user_by_id(user_id: int, db: AsyncSession = Depends(get_db)):
+async def get_user_by_id(
+    request: Request,
+    response: Response,
+    user_id: int,
+    db: AsyncSession = Depends(get_read_db),
+):
     """Get a single user by ID"""
     user_ops = UserOperations(db)
-    user = await user_ops.get_user_by_id(user_id)
+    if is_conditional(request):
+        modified_at = await user_ops.get_user_modified_at(user_id)
+        if modified_at is not None:
+            etag = weak_etag(user_id, modified_at)
+            if is_not_modified(request, etag, modified_at):
+                return not_modified_response(etag, modified_at)
+
+    user = await user_ops.get_cached_user(user_id)
 
     if not user:
         raise HTTPException(
@@ -89,11 +176,43 @@ async def get_user_by_id(user_id: int, db: AsyncSession = Depends(get_db)):
             detail=f"User with id {user_id} not found",
         )
 
+    modified_at = user.updated_at or user.created_at
+    response.headers.update(
+        validator_headers(weak_etag(user.id, modified_at), modified_at)
+    )
     return user
 
 
+@router.get(
+    "/{user_id}/portfolio",
+    response_model=UserPortfolioSchema,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "model": UserPortfolioSchema,
+            "description": "User with their active projects in display order",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "User not found",
+        },
+    },
+)
+async def get_user_portfolio(
+    user_id: int, db: AsyncSession = Depends(get_read_db)
+) -> RawJSONResponse:
+    """Get a user and their active projects in one query"""
+    portfolio = await UserOperations(db).get_portfolio_json(user_id)
+    if portfolio is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with id {user_id} not found",
+        )
+    return RawJSONResponse(portfolio.encode())
+
+
 @router.put(
     "/{user_id}",
+    response_model=UserResponseSchema,
     status_code=status.HTTP_200_OK,
     responses={
         status.HTTP_200_OK: {
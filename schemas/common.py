@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -8,6 +8,13 @@ class ErrorResponseSchema(BaseModel):
     detail: str
 
 
+class BulkItemErrorSchema(BaseModel):
+    """Error for a single item of a bulk request"""
+
+    index: int
+    detail: str
+
+
 # Base schemas for reusability
 class TimestampSchema(BaseModel):
     """Timestamp fields for responses"""
@@ -28,3 +35,45 @@ class EnhancementMetadataSchema(BaseModel):
 
     enhancement_prompt_used: Optional[str] = None
     last_enhanced_at: Optional[datetime] = None
+
+
+class PoolStatsSchema(BaseModel):
+    """Database connection pool usage"""
+
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class CacheStatsSchema(BaseModel):
+    """Read-through cache counters"""
+
+    backend: str
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    hit_rate: float
+
+
+class ImportResultSchema(BaseModel):
+    """Outcome of a bulk import"""
+
+    received: int
+    staged: int
+    inserted: int
+    skipped: int
+    errors: List[BulkItemErrorSchema]
+
+
+class EnhancementQueueStatsSchema(BaseModel):
+    """AI enhancement job queue depth"""
+
+    pending: int
+    running: int
+    failed: int
+    oldest_pending_age_s: float
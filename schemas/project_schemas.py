@@ -1,9 +1,15 @@
 from datetime import date
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
-from schemas.common import ContentBaseSchema, EnhancementMetadataSchema, TimestampSchema
+from schemas.common import (
+    BulkItemErrorSchema,
+    ContentBaseSchema,
+    EnhancementMetadataSchema,
+    TimestampSchema,
+)
+from utils.constants import MAX_BULK_ITEMS
 
 
 class ProjectBaseSchema(BaseModel):
@@ -53,3 +59,67 @@ class ProjectResponseSchema(
     highlights_enhanced: Optional[List[str]] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProjectSummarySchema(ContentBaseSchema, TimestampSchema):
+    """Schema for project list entries without the large text/JSON fields"""
+
+    id: int
+    user_id: int
+    project_name: str
+    project_url: Optional[str] = None
+    github_url: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    is_featured: bool = False
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProjectSearchResultSchema(ProjectSummarySchema):
+    """Schema for search hits, best match first"""
+
+    rank: float
+
+
+class TechnologyCountSchema(BaseModel):
+    """Number of a user's projects using a technology"""
+
+    technology: str
+    projects: int
+
+
+class ProjectBulkCreateSchema(BaseModel):
+    """Schema for creating many projects at once"""
+
+    items: List[ProjectCreateSchema] = Field(
+        ..., min_length=1, max_length=MAX_BULK_ITEMS
+    )
+
+
+class ProjectBulkUpdateItemSchema(ProjectUpdateSchema):
+    """Schema for a single project in a bulk update"""
+
+    id: int
+
+
+class ProjectBulkUpdateSchema(BaseModel):
+    """Schema for updating many projects at once"""
+
+    items: List[ProjectBulkUpdateItemSchema] = Field(
+        ..., min_length=1, max_length=MAX_BULK_ITEMS
+    )
+
+
+class ProjectBulkResponseSchema(BaseModel):
+    """Schema for bulk create/update responses"""
+
+    projects: List[ProjectResponseSchema]
+    errors: List[BulkItemErrorSchema]
+
+
+class ProjectBulkDeleteResponseSchema(BaseModel):
+    """Schema for bulk delete responses"""
+
+    deleted_ids: List[int]
+    errors: List[BulkItemErrorSchema]
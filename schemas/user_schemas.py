@@ -1,8 +1,10 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, EmailStr
 
+from schemas.project_schemas import ProjectResponseSchema
+
 
 class UserBaseSchema(BaseModel):
     """Base schema with common user fields"""
@@ -32,3 +34,9 @@ class UserResponseSchema(UserBaseSchema):
     updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class UserPortfolioSchema(UserResponseSchema):
+    """Schema for a user with their active projects, in display order"""
+
+    projects: List[ProjectResponseSchema]
@@ -25,7 +25,12 @@ $UV sync --frozen
 
 $UV run alembic upgrade head
 
+# Both processes read the same .env, so they share METRICS_DIR and the
+# enhancement worker's metrics are served by gunicorn's /metrics
 $APP_DIR/.venv/bin/gunicorn &
 PIDS+=($!)
 
+$APP_DIR/.venv/bin/python enhance_worker.py &
+PIDS+=($!)
+
 wait || true
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""In-process stand-in for a Redis server, for tests of the Redis backends.
+
+Speaks RESP2 over TCP and keeps its data in memory. Supports the commands
+the cache and the rate limiter use, with scripts run by Lua 5.1 like Redis.
+"""
+
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from lupa.lua51 import LuaRuntime  # type: ignore[import-untyped]
+
+Value = Union[bytes, Set[bytes]]
+
+
+class CommandError(Exception):
+    """Sent to the client as an error reply."""
+
+
+class RespServer:
+    def __init__(self) -> None:
+        self.data: Dict[bytes, Tuple[Value, Optional[float]]] = {}
+        self.scripts: Dict[str, str] = {}
+        self.commands: List[str] = []
+        self.lua = LuaRuntime(encoding=None)
+        self.lua.globals()[b"redis"] = self.lua.table_from({b"call": self._lua_call})
+        self._server: Optional[asyncio.Server] = None
+        self._connections: Set[asyncio.StreamWriter] = set()
+
+    @property
+    def url(self) -> str:
+        assert self._server
+        return f"redis://127.0.0.1:{self._server.sockets[0].getsockname()[1]}/0"
+
+    async def start(self) -> "RespServer":
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def stop(self) -> None:
+        assert self._server
+        self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await self._server.wait_closed()
+
+    def pttl(self, key: str) -> int:
+        if self._get(key.encode()) is None:
+            return -2
+        expires_at = self.data[key.encode()][1]
+        return -1 if expires_at is None else int((expires_at - time.time()) * 1000)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(writer)
+        try:
+            while True:
+                args = await self._read_command(reader)
+                self.commands.append(args[0].decode().upper())
+                try:
+                    reply = self._execute(args)
+                except CommandError as e:
+                    writer.write(b"-%s\r\n" % str(e).encode())
+                else:
+                    writer.write(encode_reply(reply))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> List[bytes]:
+        count = int((await reader.readuntil(b"\r\n"))[1:-2])
+        args = []
+        for _ in range(count):
+            length = int((await reader.readuntil(b"\r\n"))[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    def _get(self, key: bytes) -> Optional[Value]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    def _execute(self, args: List[bytes]) -> Any:
+        name, rest = args[0].upper(), args[1:]
+        if name == b"PING":
+            return "PONG"
+        if name == b"GET":
+            value = self._get(rest[0])
+            if isinstance(value, set):
+                raise CommandError("WRONGTYPE Operation against a key")
+            return value
+        if name == b"SET":
+            expires_at = None
+            if len(rest) == 4 and rest[2].upper() == b"PX":
+                expires_at = time.time() + int(rest[3]) / 1000
+            self.data[rest[0]] = (rest[1], expires_at)
+            return "OK"
+        if name == b"DEL":
+            deleted = [key for key in rest if self._get(key) is not None]
+            for key in deleted:
+                del self.data[key]
+            return len(deleted)
+        if name == b"SADD":
+            members = self._get(rest[0])
+            if not isinstance(members, set):
+                members = set()
+                self.data[rest[0]] = (members, None)
+            added = set(rest[1:]) - members
+            members.update(added)
+            return len(added)
+        if name == b"SMEMBERS":
+            members = self._get(rest[0])
+            return sorted(members) if isinstance(members, set) else []
+        if name == b"PEXPIRE":
+            value = self._get(rest[0])
+            if value is None:
+                return 0
+            self.data[rest[0]] = (value, time.time() + int(rest[1]) / 1000)
+            return 1
+        if name in (b"EVAL", b"EVALSHA"):
+            if name == b"EVAL":
+                script = rest[0].decode()
+                self.scripts[hashlib.sha1(rest[0]).hexdigest()] = script
+            elif rest[0].decode() in self.scripts:
+                script = self.scripts[rest[0].decode()]
+            else:
+                raise CommandError("NOSCRIPT No matching script")
+            numkeys = int(rest[1])
+            return self._run_script(script, rest[2 : 2 + numkeys], rest[2 + numkeys :])
+        raise CommandError(f"ERR unknown command '{name.decode()}'")
+
+    def _run_script(self, script: str, keys: List[bytes], argv: List[bytes]) -> Any:
+        lua_globals = self.lua.globals()
+        lua_globals[b"KEYS"] = self.lua.table_from(keys)
+        lua_globals[b"ARGV"] = self.lua.table_from(argv)
+        return from_lua(self.lua.execute(script))
+
+    def _lua_call(self, *args: Any) -> Any:
+        # Redis hands nil bulk replies to scripts as false
+        reply = self._execute([to_bytes(arg) for arg in args])
+        if reply is None:
+            return False
+        if isinstance(reply, list):
+            return self.lua.table_from(reply)
+        return reply.encode() if isinstance(reply, str) else reply
+
+
+def to_bytes(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).encode()
+
+
+def from_lua(value: Any) -> Any:
+    """Convert a script's result the way Redis does."""
+    if value is None or value is False:
+        return None
+    if value is True:
+        return 1
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, bytes):
+        return value
+    return [from_lua(value[i]) for i in range(1, len(value) + 1)]
+
+
+def encode_reply(reply: Any) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(encode_reply(item) for item in reply)
@@ -0,0 +1,99 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from db import sessionmanager
+from main import app
+
+
+def test_bulk_project_lifecycle():
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={"username": f"bulk_{suffix}", "email": f"bulk_{suffix}@example.com"},
+        ).json()
+
+        items = [
+            {
+                "user_id": user["id"],
+                "project_name": f"p{i}",
+                "description": "d",
+                "display_order": i,
+            }
+            for i in range(30)
+        ]
+        items.insert(5, {"user_id": -1, "project_name": "x", "description": "d"})
+        # The owner check is part of the INSERT ... SELECT ... RETURNING
+        with sessionmanager.query_budget(1):
+            response = client.post("/api/projects/bulk", json={"items": items})
+
+        assert response.status_code == 201
+        body = response.json()
+        assert [p["project_name"] for p in body["projects"]] == [
+            f"p{i}" for i in range(30)
+        ]
+        assert body["errors"] == [{"index": 5, "detail": "User with id -1 not found"}]
+
+        ids = [p["id"] for p in body["projects"]]
+        # An UPDATE per distinct set of fields, however the items interleave,
+        # then one SELECT
+        with sessionmanager.query_budget(3):
+            response = client.put(
+                "/api/projects/bulk",
+                params={"user_id": user["id"]},
+                json={
+                    "items": [
+                        {"id": ids[0], "project_name": "renamed"},
+                        {"id": ids[1], "is_featured": True},
+                        {"id": -1, "project_name": "missing"},
+                        {"id": ids[2], "project_name": "renamed2"},
+                        {"id": ids[3], "is_featured": True},
+                    ]
+                },
+            )
+        body = response.json()
+        assert [p["project_name"] for p in body["projects"]] == [
+            "renamed",
+            "p1",
+            "renamed2",
+            "p3",
+        ]
+        assert [p["is_featured"] for p in body["projects"]] == [
+            False,
+            True,
+            False,
+            True,
+        ]
+        assert body["projects"][0]["updated_at"] is not None
+        assert [e["index"] for e in body["errors"]] == [2]
+
+        # Items for the same project apply in order: the last value wins
+        response = client.put(
+            "/api/projects/bulk",
+            params={"user_id": user["id"]},
+            json={
+                "items": [
+                    {"id": ids[4], "project_name": "first", "is_featured": True},
+                    {"id": ids[4], "project_name": "second", "description": "x"},
+                ]
+            },
+        )
+        body = response.json()
+        assert [p["project_name"] for p in body["projects"]] == ["second", "second"]
+        assert body["projects"][0]["description"] == "x"
+        assert body["projects"][0]["is_featured"] is True
+
+        with sessionmanager.query_budget(1):
+            response = client.delete(
+                "/api/projects/bulk",
+                params={"user_id": user["id"], "ids": [ids[0], ids[1], -1]},
+            )
+        body = response.json()
+        assert sorted(body["deleted_ids"]) == sorted(ids[:2])
+        assert [e["index"] for e in body["errors"]] == [2]
+
+        remaining = client.get(
+            "/api/projects/list", params={"user_id": user["id"]}
+        ).json()
+        assert len(remaining) == 28
@@ -0,0 +1,124 @@
+import asyncio
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from main import app
+from tests.resp_server import RespServer
+from utils.cache import MemoryCache, RedisCache, get_cache, set_cache
+from utils.redis_client import RedisClient
+
+
+def test_memory_cache_lru_eviction():
+    async def scenario():
+        cache = MemoryCache(max_entries=2, ttl=60)
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        assert await cache.get("a") == 1
+        await cache.set("c", 3)  # evicts "b", the least recently used
+        assert await cache.get("b") is None
+        assert await cache.get("c") == 3
+        return cache.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (2, 1, 1, 2)
+
+
+def test_memory_cache_ttl_and_group_delete():
+    async def scenario():
+        cache = MemoryCache(max_entries=10, ttl=0.01)
+        await cache.set("project:1:1", 1)
+        await asyncio.sleep(0.02)
+        assert await cache.get("project:1:1") is None
+
+        cache.ttl = 60
+        await cache.set("project:1:1", 1, group="project:1:")
+        await cache.set("project:2:5", 5, group="project:2:")
+        await cache.delete_group("project:1:")
+        assert await cache.get("project:1:1") is None
+        assert await cache.get("project:2:5") == 5
+
+    asyncio.run(scenario())
+
+
+def test_redis_cache_ttl_and_group_delete():
+    async def scenario():
+        server = await RespServer().start()
+        cache = RedisCache(RedisClient(server.url), ttl=0.05)
+        await cache.set("user:1", {"id": 1})
+        assert await cache.get("user:1") == {"id": 1}
+        assert 0 < server.pttl("cache:user:1") <= 50
+        await asyncio.sleep(0.06)
+        assert await cache.get("user:1") is None
+
+        cache.ttl_ms = 60000
+        await cache.set("project:1:1", [1], group="project:1:")
+        await cache.set("project:1:2", [2], group="project:1:")
+        await cache.set("project:2:5", [5], group="project:2:")
+        await cache.set("user:1", {"id": 1})
+        # The group set lives as long as its newest member
+        assert 59000 < server.pttl("cache:group:project:1:") <= 60000
+
+        server.commands.clear()
+        await cache.delete_group("project:1:")
+        # The script is sent once it is found missing; no scan of the keyspace
+        assert server.commands == ["EVALSHA", "EVAL"]
+        assert await cache.get("project:1:1") is None
+        assert await cache.get("project:1:2") is None
+        assert server.pttl("cache:group:project:1:") == -2
+        assert await cache.get("project:2:5") == [5]
+        assert await cache.get("user:1") == {"id": 1}
+
+        await cache.delete("project:2:5", "user:1")
+        assert await cache.get("user:1") is None
+
+        await cache.close()
+        await server.stop()
+        return cache.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats.hits, stats.misses) == (3, 4)
+
+
+def test_redis_cache_errors_are_misses():
+    async def scenario():
+        server = await RespServer().start()
+        cache = RedisCache(RedisClient(server.url, timeout=0.1), ttl=60)
+        await cache.set("user:1", {"id": 1})
+        await cache.close()
+        await server.stop()
+
+        assert await cache.get("user:1") is None
+        await cache.set("user:1", {"id": 1})
+        await cache.set("project:1:1", [1], group="project:1:")
+        await cache.delete("user:1")
+        await cache.delete_group("project:1:")
+        return cache.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats.hits, stats.misses) == (0, 1)
+
+
+def test_user_update_invalidates_cache():
+    previous = get_cache()
+    set_cache(MemoryCache(max_entries=100, ttl=60))
+    try:
+        with TestClient(app) as client:
+            suffix = uuid4().hex[:8]
+            user = client.post(
+                "/api/users/create",
+                json={
+                    "username": f"cache_{suffix}",
+                    "email": f"c_{suffix}@example.com",
+                },
+            ).json()
+
+            client.get(f"/api/users/{user['id']}")
+            client.get(f"/api/users/{user['id']}")
+            assert get_cache().stats().hits == 1
+
+            client.put(f"/api/users/{user['id']}", json={"username": f"new_{suffix}"})
+            response = client.get(f"/api/users/{user['id']}")
+            assert response.json()["username"] == f"new_{suffix}"
+    finally:
+        set_cache(previous)
@@ -0,0 +1,99 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from db import sessionmanager
+from main import app
+
+
+def test_user_conditional_get():
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={"username": f"etag_{suffix}", "email": f"etag_{suffix}@example.com"},
+        ).json()
+        url = f"/api/users/{user['id']}"
+
+        first = client.get(url)
+        etag = first.headers["ETag"]
+        assert etag.startswith('W/"')
+
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+        response = client.get(
+            url, headers={"If-Modified-Since": first.headers["Last-Modified"]}
+        )
+        assert response.status_code == 304
+
+        client.put(url, json={"username": f"etag2_{suffix}"})
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+        client.delete(url)
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 404
+
+
+def test_project_list_conditional_get():
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={
+                "username": f"etagp_{suffix}",
+                "email": f"etagp_{suffix}@example.com",
+            },
+        ).json()
+        project = client.post(
+            "/api/projects/create",
+            json={"user_id": user["id"], "project_name": "p", "description": "d"},
+        ).json()
+        params = {"user_id": user["id"]}
+
+        etag = client.get("/api/projects/list", params=params).headers["ETag"]
+        response = client.get(
+            "/api/projects/list", params=params, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+        summary = client.get(
+            "/api/projects/list", params={**params, "view": "summary"}
+        ).headers["ETag"]
+        assert summary != etag
+
+        # A projected page reads its validators in the same query
+        projected = {**params, "fields": ["project_name"]}
+        with sessionmanager.query_budget(1):
+            response = client.get("/api/projects/list", params=projected)
+        assert response.json() == [
+            {"id": project["id"], "display_order": 0, "project_name": "p"}
+        ]
+        response = client.get(
+            "/api/projects/list",
+            params=projected,
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+        assert response.status_code == 304
+
+        single = client.get(f"/api/projects/{project['id']}", params=params)
+        response = client.get(
+            f"/api/projects/{project['id']}",
+            params=params,
+            headers={"If-None-Match": single.headers["ETag"]},
+        )
+        assert response.status_code == 304
+
+        client.put(
+            f"/api/projects/{project['id']}", params=params, json={"project_name": "q"}
+        )
+        response = client.get(
+            "/api/projects/list", params=params, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+        client.delete(f"/api/users/{user['id']}")
@@ -0,0 +1,17 @@
+from fastapi.testclient import TestClient
+
+from db import sessionmanager
+from main import app
+
+
+def test_engine_persists_across_requests():
+    with TestClient(app) as client:
+        engine = sessionmanager.engine
+        for i in range(3):
+            response = client.get("/api/users/list")
+            assert response.status_code == 200, f"Failed at {i + 1}"
+        assert sessionmanager.engine is engine
+
+        stats = client.get("/health/pool").json()
+        assert stats["checkouts"] >= 1
+        assert stats["checked_out"] == 0
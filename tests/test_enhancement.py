@@ -0,0 +1,220 @@
+from typing import List, Sequence
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from db import sessionmanager
+from dependencies.enhancement_operations import EnhancementOperations
+from enhance_worker import drain
+from main import app
+from models import EnhancementJob
+from settings import settings
+from utils.enhancement import (
+    ENHANCEMENT_PROMPT,
+    EnhancementError,
+    EnhancementInput,
+    EnhancementOutput,
+    EnhancementProvider,
+    StubEnhancementProvider,
+)
+
+
+class FailingProvider(EnhancementProvider):
+    name = "failing"
+
+    async def enhance(
+        self, items: Sequence[EnhancementInput], prompt: str
+    ) -> List[EnhancementOutput]:
+        raise EnhancementError("model unavailable")
+
+
+def create_user(client: TestClient) -> dict:
+    suffix = uuid4().hex[:8]
+    return client.post(
+        "/api/users/create",
+        json={"username": f"enh_{suffix}", "email": f"enh_{suffix}@example.com"},
+    ).json()
+
+
+def job_for(client: TestClient, project_id: int):
+    async def load():
+        assert sessionmanager.session_factory
+        async with sessionmanager.session_factory() as db:
+            return await db.scalar(
+                select(EnhancementJob).where(EnhancementJob.project_id == project_id)
+            )
+
+    assert client.portal
+    return client.portal.call(load)
+
+
+def test_created_projects_are_enhanced_in_batches():
+    provider = StubEnhancementProvider()
+    with TestClient(app) as client:
+        client.portal.call(drain, provider, 50, 1)
+        user = create_user(client)
+        # The content-hash cache outlives test runs; keep this text unseen
+        run = uuid4().hex[:8]
+        items = [
+            {
+                "user_id": user["id"],
+                "project_name": f"p{i}",
+                "description": f"  built   thing {i} in {run}",
+                "highlights": ["cut latency", "shipped"],
+            }
+            for i in range(10)
+        ]
+        projects = client.post("/api/projects/bulk", json={"items": items}).json()
+        assert client.get("/health/enhancement").json()["pending"] >= 10
+
+        provider.calls = 0
+        assert client.portal.call(drain, provider, 4, 2) == 10
+        assert provider.calls == 3
+
+        project = client.get(
+            f"/api/projects/{projects['projects'][3]['id']}",
+            params={"user_id": user["id"]},
+        ).json()
+        assert project["description_enhanced"] == f"Built thing 3 in {run}."
+        assert project["highlights_enhanced"] == ["Cut latency.", "Shipped."]
+        assert project["enhancement_prompt_used"] == ENHANCEMENT_PROMPT
+        assert project["last_enhanced_at"] is not None
+        assert job_for(client, project["id"]) is None
+
+        # Same text again is served from the content-hash cache
+        copy = client.post(
+            "/api/projects/create",
+            json={**items[3], "project_name": "copy"},
+        ).json()
+        assert client.portal.call(drain, provider, 4, 1) == 1
+        assert provider.calls == 3
+        copy = client.get(
+            f"/api/projects/{copy['id']}", params={"user_id": user["id"]}
+        ).json()
+        assert copy["description_enhanced"] == f"Built thing 3 in {run}."
+
+        client.delete(f"/api/users/{user['id']}")
+
+
+def test_only_text_edits_requeue_enhancement():
+    provider = StubEnhancementProvider()
+    with TestClient(app) as client:
+        user = create_user(client)
+        project = client.post(
+            "/api/projects/create",
+            json={"user_id": user["id"], "project_name": "p", "description": "d"},
+        ).json()
+        client.portal.call(drain, provider, 50, 1)
+        new_text = f"new text {uuid4().hex[:8]}"
+
+        client.put(
+            f"/api/projects/{project['id']}",
+            params={"user_id": user["id"]},
+            json={"project_name": "renamed", "is_featured": True},
+        )
+        assert job_for(client, project["id"]) is None
+
+        client.put(
+            f"/api/projects/{project['id']}",
+            params={"user_id": user["id"]},
+            json={"description": new_text},
+        )
+        assert job_for(client, project["id"]).status == "pending"
+
+        client.portal.call(drain, provider, 50, 1)
+        project = client.get(
+            f"/api/projects/{project['id']}", params={"user_id": user["id"]}
+        ).json()
+        assert project["description_enhanced"] == f"N{new_text[1:]}."
+
+        client.delete(f"/api/users/{user['id']}")
+
+
+def test_stale_claims_do_not_overwrite_newer_text():
+    provider = StubEnhancementProvider()
+
+    async def claim():
+        assert sessionmanager.session_factory
+        async with sessionmanager.session_factory() as db:
+            return await EnhancementOperations(db).claim_jobs(50, 60)
+
+    async def save(claimed):
+        assert sessionmanager.session_factory
+        enhancements = {
+            row.id: EnhancementOutput(f"from {row.description}", []) for row in claimed
+        }
+        async with sessionmanager.session_factory() as db:
+            return await EnhancementOperations(db).save_enhancements(
+                claimed, enhancements, {}, ENHANCEMENT_PROMPT
+            )
+
+    with TestClient(app) as client:
+        client.portal.call(drain, provider, 50, 1)
+        user = create_user(client)
+        project = client.post(
+            "/api/projects/create",
+            json={"user_id": user["id"], "project_name": "p", "description": "old"},
+        ).json()
+        stale = [row for row in client.portal.call(claim) if row.id == project["id"]]
+        assert stale
+
+        # Edited, then claimed again by another worker before the first saves
+        client.put(
+            f"/api/projects/{project['id']}",
+            params={"user_id": user["id"]},
+            json={"description": "new"},
+        )
+        fresh = [row for row in client.portal.call(claim) if row.id == project["id"]]
+        assert fresh[0].locked_at != stale[0].locked_at
+
+        assert client.portal.call(save, stale) == []
+        assert job_for(client, project["id"]).status == "running"
+        assert client.portal.call(save, fresh) == [project["id"]]
+        project = client.get(
+            f"/api/projects/{project['id']}", params={"user_id": user["id"]}
+        ).json()
+        assert project["description_enhanced"] == "from new"
+        assert job_for(client, project["id"]) is None
+
+        client.delete(f"/api/users/{user['id']}")
+
+
+def test_failed_enhancements_back_off_then_give_up(monkeypatch):
+    monkeypatch.setattr(settings, "ENHANCEMENT_MAX_ATTEMPTS", 2)
+    with TestClient(app) as client:
+        client.portal.call(drain, StubEnhancementProvider(), 50, 1)
+        user = create_user(client)
+        project = client.post(
+            "/api/projects/create",
+            json={
+                "user_id": user["id"],
+                "project_name": "p",
+                "description": uuid4().hex,
+            },
+        ).json()
+
+        assert client.portal.call(drain, FailingProvider(), 50, 1) == 1
+        job = job_for(client, project["id"])
+        assert job.status == "pending"
+        assert job.attempts == 1
+        assert "model unavailable" in job.last_error
+        # Backing off: not runnable again right away
+        assert client.portal.call(drain, FailingProvider(), 50, 1) == 0
+
+        async def make_runnable():
+            assert sessionmanager.engine
+            async with sessionmanager.engine.begin() as conn:
+                await conn.execute(
+                    EnhancementJob.__table__.update()
+                    .where(EnhancementJob.project_id == project["id"])
+                    .values(run_after=EnhancementJob.created_at)
+                )
+
+        client.portal.call(make_runnable)
+        client.portal.call(drain, FailingProvider(), 50, 1)
+        job = job_for(client, project["id"])
+        assert job.status == "failed"
+        assert client.get("/health/enhancement").json()["failed"] >= 1
+
+        client.delete(f"/api/users/{user['id']}")
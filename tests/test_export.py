@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from dependencies.project_operations import ProjectOperations
+from main import app
+
+
+def test_export_streams_ndjson_and_csv(monkeypatch):
+    original = ProjectOperations.stream_project_rows
+
+    def small_batches(self, user_id=None, batch_size=2):
+        return original(self, user_id, batch_size=2)
+
+    monkeypatch.setattr(ProjectOperations, "stream_project_rows", small_batches)
+
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={
+                "username": f"export_{suffix}",
+                "email": f"export_{suffix}@example.com",
+            },
+        ).json()
+        for order in range(5):
+            client.post(
+                "/api/projects/create",
+                json={
+                    "user_id": user["id"],
+                    "project_name": f"p{order}",
+                    "description": "line one\nline, two",
+                    "highlights": ["a", "b"],
+                    "display_order": order,
+                },
+            )
+        listed = client.get("/api/projects/list", params={"user_id": user["id"]}).json()
+
+        response = client.get("/api/projects/export", params={"user_id": user["id"]})
+        assert response.headers["content-type"] == "application/x-ndjson"
+        exported = [json.loads(line) for line in response.text.splitlines()]
+        assert exported == listed
+
+        response = client.get(
+            "/api/projects/export", params={"user_id": user["id"], "format": "csv"}
+        )
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["project_name"] for row in rows] == [
+            p["project_name"] for p in listed
+        ]
+        assert rows[0]["description"] == "line one\nline, two"
+        assert json.loads(rows[0]["highlights"]) == ["a", "b"]
+
+        client.delete(f"/api/users/{user['id']}")
@@ -0,0 +1,103 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from db import sessionmanager
+from main import app
+from models import User
+from utils.import_reader import read_csv
+
+
+async def ids_by_username(usernames):
+    assert sessionmanager.session_factory
+    async with sessionmanager.session_factory() as db:
+        rows = await db.execute(
+            select(User.username, User.id).where(User.username.in_(usernames))
+        )
+        return {username: user_id for username, user_id in rows}
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.mark.parametrize("size", [1, 7, 1024])
+def test_read_csv_handles_quoted_newlines_across_chunks(size):
+    data = (
+        b'name,note\nfirst,"line one\nline ""two"""\nsecond,\n'
+        b'bad,"\xff\n"\nbroken,"unclosed\n'
+    )
+
+    async def scenario():
+        return [record async for record in read_csv(chunked(data, size))]
+
+    records = asyncio.run(scenario())
+    assert records == [
+        (1, {"name": "first", "note": 'line one\nline "two"'}),
+        (2, {"name": "second", "note": None}),
+        (3, None),
+        (4, None),
+    ]
+
+
+def test_import_users_and_projects():
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        users = [
+            {"username": f"imp{i}_{suffix}", "email": f"imp{i}_{suffix}@example.com"}
+            for i in range(3)
+        ]
+        body = "\n".join(json.dumps(u) for u in [*users, users[0], {"username": "x"}])
+        response = client.post(
+            "/api/users/import",
+            content=body.encode() + b'\n{not json\n{"username": "\xff"}',
+        )
+        assert response.status_code == 201
+        result = response.json()
+        assert result["received"] == 7
+        assert result["staged"] == 4
+        assert result["inserted"] == 3
+        assert [e["index"] for e in result["errors"]] == [5, 6, 7]
+
+        user_ids = client.portal.call(ids_by_username, [u["username"] for u in users])
+        user_id = user_ids[users[1]["username"]]
+
+        client.post(
+            "/api/projects/create",
+            json={
+                "user_id": user_id,
+                "project_name": "exported",
+                "description": 'quoted "text", with\nnewline',
+                "highlights": ["a", "b"],
+                "start_date": "2024-01-31",
+                "is_featured": True,
+            },
+        )
+        exported = client.get(
+            "/api/projects/export", params={"user_id": user_id, "format": "csv"}
+        ).content
+        result = client.post(
+            "/api/projects/import", params={"format": "csv"}, content=exported
+        ).json()
+        assert result == {
+            "received": 1,
+            "staged": 1,
+            "inserted": 1,
+            "skipped": 0,
+            "errors": [],
+        }
+
+        projects = client.get("/api/projects/list", params={"user_id": user_id}).json()
+        assert len(projects) == 2
+        original, imported = projects
+        assert original["id"] != imported["id"]
+        for field in ["description", "highlights", "start_date", "is_featured"]:
+            assert imported[field] == original[field]
+
+        for user_id in user_ids.values():
+            client.delete(f"/api/users/{user_id}")
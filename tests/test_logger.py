@@ -0,0 +1,96 @@
+import json
+import logging
+import threading
+
+from prometheus_client import REGISTRY
+
+from utils.logger import (
+    AsyncLogHandler,
+    CustomJsonFormatter,
+    RequestContextVar,
+    request_ctx_var,
+)
+
+
+class BlockingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.unblock = threading.Event()
+        self.lines: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.unblock.wait(timeout=5)
+        self.lines.append(self.format(record))
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def make_logger(handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"test-{id(handler)}")
+    logger.propagate = False
+    logger.addHandler(handler)
+    return logger
+
+
+def test_async_handler_drops_when_queue_is_full():
+    target = BlockingHandler()
+    handler = AsyncLogHandler(target, maxsize=2, block=False)
+    logger = make_logger(handler)
+    dropped_before = REGISTRY.get_sample_value("log_records_dropped_total")
+
+    for i in range(20):
+        logger.warning("record %d", i)
+
+    target.unblock.set()
+    handler.stop()
+    # The listener holds one record while blocked, two wait in the queue
+    assert handler.dropped >= 17
+    assert len(target.lines) == 20 - handler.dropped
+    assert REGISTRY.get_sample_value("log_records_dropped_total") == (
+        dropped_before + handler.dropped
+    )
+
+
+def test_async_handler_leaves_the_original_record_unchanged():
+    target = BlockingHandler()
+    target.unblock.set()
+    handler = AsyncLogHandler(target, maxsize=10, block=True)
+    other = RecordingHandler()
+    logger = make_logger(handler)
+    logger.addHandler(other)
+
+    logger.warning("hello %s", "world")
+    handler.stop()
+
+    assert other.records[0].msg == "hello %s"
+    assert other.records[0].args == ("world",)
+    assert not hasattr(other.records[0], "request_id")
+
+
+def test_async_handler_keeps_request_context():
+    target = BlockingHandler()
+    target.unblock.set()
+    target.setFormatter(CustomJsonFormatter())
+    handler = AsyncLogHandler(target, maxsize=10, block=True)
+    logger = make_logger(handler)
+
+    token = request_ctx_var.set(
+        RequestContextVar(request_id="abc", request_path="GET /")
+    )
+    try:
+        logger.warning("hello %s", "world")
+    finally:
+        request_ctx_var.reset(token)
+    handler.stop()
+
+    record = json.loads(target.lines[0])
+    assert record["message"] == "hello world"
+    assert record["request_id"] == "abc"
+    assert record["request_path"] == "GET /"
@@ -0,0 +1,116 @@
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from main import app
+from settings import settings
+from utils.metrics import (
+    mark_process_dead,
+    remove_dead_process_files,
+    render_metrics,
+)
+
+RECORD_IN_WORKER = """
+import os
+from utils.metrics import DB_QUERIES, DB_QUERY_DURATION, HTTP_REQUESTS, HTTP_REQUESTS_IN_FLIGHT
+HTTP_REQUESTS_IN_FLIGHT.inc()
+for i in range(1000):
+    HTTP_REQUESTS.labels("GET", f"/r{i}", "200").inc()
+    DB_QUERIES.inc()
+    DB_QUERY_DURATION.observe(0.003)
+print(os.getpid())
+"""
+
+
+def test_metrics_dir_sums_samples_across_processes(tmp_path, monkeypatch):
+    directory = str(tmp_path)
+    env = {**os.environ, "METRICS_DIR": directory}
+    pids = [
+        int(
+            subprocess.run(
+                [sys.executable, "-c", RECORD_IN_WORKER],
+                env=env,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(3)
+    ]
+
+    monkeypatch.setattr(settings, "METRICS_DIR", directory)
+    text = render_metrics().decode()
+    assert 'http_requests_total{method="GET",route="/r0",status="200"} 3.0' in text
+    assert 'http_requests_total{method="GET",route="/r999",status="200"} 3.0' in text
+    assert "db_queries_total 3000.0" in text
+    assert 'db_query_duration_seconds_bucket{le="0.0025"} 0.0' in text
+    assert 'db_query_duration_seconds_bucket{le="0.005"} 3000.0' in text
+    assert "http_requests_in_flight 3.0" in text
+
+    for pid in pids:
+        mark_process_dead(pid)
+    text = render_metrics().decode()
+    assert "http_requests_in_flight 3.0" not in text
+    assert "db_queries_total 3000.0" in text
+
+
+def test_only_files_of_dead_processes_are_removed(tmp_path, monkeypatch):
+    dead_pid = subprocess.Popen([sys.executable, "-c", ""]).pid
+    os.waitpid(dead_pid, 0)
+    for pid in (dead_pid, os.getpid()):
+        (tmp_path / f"counter_{pid}.db").touch()
+        (tmp_path / f"gauge_livesum_{pid}.db").touch()
+
+    monkeypatch.setattr(settings, "METRICS_DIR", str(tmp_path))
+    remove_dead_process_files()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        f"counter_{os.getpid()}.db",
+        f"gauge_livesum_{os.getpid()}.db",
+    ]
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint_labels_routes_by_template():
+    user_route = {"method": "GET", "route": "/api/users/{user_id}"}
+    before = {
+        "user_404": sample("http_requests_total", **user_route, status="404"),
+        "user_422": sample("http_requests_total", **user_route, status="422"),
+        "unmatched": sample(
+            "http_requests_total", method="GET", route="unmatched", status="404"
+        ),
+        "db_queries": sample("http_request_db_queries_sum", **user_route),
+        "db_requests": sample("http_request_db_seconds_count", **user_route),
+        "db_seconds": sample("http_request_db_seconds_sum", **user_route),
+    }
+    with TestClient(app) as client:
+        client.get("/api/users/999999999")
+        # A parameter value equal to a static segment keeps the template
+        client.get("/api/users/api")
+        client.get("/does-not-exist")
+        response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/api/users/{user_id}"' in response.text
+    assert sample("http_requests_total", **user_route, status="404") == (
+        before["user_404"] + 1
+    )
+    assert sample("http_requests_total", **user_route, status="422") == (
+        before["user_422"] + 1
+    )
+    assert sample(
+        "http_requests_total", method="GET", route="unmatched", status="404"
+    ) == (before["unmatched"] + 1)
+    assert sample("http_request_db_queries_sum", **user_route) == (
+        before["db_queries"] + 1
+    )
+    # Both requests are observed; only the valid id queries the database
+    assert sample("http_request_db_seconds_count", **user_route) == (
+        before["db_requests"] + 2
+    )
+    assert sample("http_request_db_seconds_sum", **user_route) > before["db_seconds"]
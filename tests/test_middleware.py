@@ -0,0 +1,38 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from utils.logger import request_ctx_var
+from utils.middleware import RequestContextMiddleware
+
+app = FastAPI()
+app.add_middleware(RequestContextMiddleware)
+
+
+@app.get("/context")
+async def context() -> dict:
+    ctx = request_ctx_var.get()
+    assert ctx
+    return {"request_id": ctx.request_id, "request_path": ctx.request_path}
+
+
+def test_request_id_is_generated_and_returned():
+    client = TestClient(app)
+
+    first = client.get("/context")
+    second = client.get("/context")
+
+    assert first.json()["request_path"] == "GET /context"
+    assert first.headers["X-Request-ID"] == first.json()["request_id"]
+    assert len(first.headers["X-Request-ID"]) == 32
+    assert first.headers["X-Request-ID"] != second.headers["X-Request-ID"]
+
+
+def test_incoming_request_id_is_reused():
+    client = TestClient(app)
+
+    response = client.get("/context", headers={"X-Request-ID": "upstream-123"})
+    assert response.headers["X-Request-ID"] == "upstream-123"
+    assert response.json()["request_id"] == "upstream-123"
+
+    response = client.get("/context", headers={"X-Request-ID": "x" * 200})
+    assert response.headers["X-Request-ID"] != "x" * 200
@@ -0,0 +1,66 @@
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor([3, 42]), 2) == [3, 42]
+
+
+@pytest.mark.parametrize(
+    "cursor", ["not-a-cursor", encode_cursor([1, 2]), encode_cursor([2**31])]
+)
+def test_invalid_cursor_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 1)
+
+
+def test_project_cursor_pagination_matches_offset():
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={
+                "username": f"pager_{suffix}",
+                "email": f"pager_{suffix}@example.com",
+            },
+        ).json()
+        for order in [2, 1, 1, 0, 2]:
+            client.post(
+                "/api/projects/create",
+                json={
+                    "user_id": user["id"],
+                    "project_name": f"p{order}",
+                    "description": "d",
+                    "display_order": order,
+                },
+            )
+
+        offset_ids = [
+            p["id"]
+            for p in client.get(
+                "/api/projects/list", params={"user_id": user["id"]}
+            ).json()
+        ]
+
+        cursor_ids = []
+        params = {"user_id": user["id"], "limit": 2}
+        while True:
+            response = client.get("/api/projects/list", params=params)
+            cursor_ids.extend(p["id"] for p in response.json())
+            if NEXT_CURSOR_HEADER not in response.headers:
+                break
+            params["cursor"] = response.headers[NEXT_CURSOR_HEADER]
+
+        assert cursor_ids == offset_ids
+        assert len(cursor_ids) == 5
+
+        for bad in ["bad", encode_cursor([0, -(2**63)])]:
+            response = client.get(
+                "/api/projects/list", params={"user_id": user["id"], "cursor": bad}
+            )
+            assert response.status_code == 400
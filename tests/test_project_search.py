@@ -0,0 +1,119 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+import dependencies.project_operations
+from main import app
+from utils.pagination import NEXT_CURSOR_HEADER
+
+
+def test_search_ranks_prefix_matches_and_pages_by_cursor():
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={"username": f"search_{suffix}", "email": f"s_{suffix}@example.com"},
+        ).json()
+        # A word unique to this run keeps other tests' projects out of the results
+        word = f"zq{suffix}"
+        items = [
+            {
+                "user_id": user["id"],
+                "project_name": f"{word} compiler",
+                "description": "A toy compiler",
+            },
+            {
+                "user_id": user["id"],
+                "project_name": "Dashboard",
+                "description": f"Charts for {word} metrics",
+            },
+            {
+                "user_id": user["id"],
+                "project_name": "Scraper",
+                "description": "Collects prices",
+                "highlights": [f"Indexed by {word}"],
+            },
+            {
+                "user_id": user["id"],
+                "project_name": "Unrelated",
+                "description": "Nothing to see",
+            },
+        ]
+        ids = [
+            p["id"]
+            for p in client.post("/api/projects/bulk", json={"items": items}).json()[
+                "projects"
+            ]
+        ]
+
+        response = client.get("/api/projects/search", params={"q": word[:6]})
+        assert response.status_code == 200
+        hits = response.json()
+        assert [hit["id"] for hit in hits] == ids[:3]
+        assert hits[0]["rank"] > hits[1]["rank"] > hits[2]["rank"]
+        assert "description" not in hits[0]
+
+        # Every term must match
+        hits = client.get("/api/projects/search", params={"q": f"{word} compil"}).json()
+        assert [hit["id"] for hit in hits] == ids[:1]
+
+        pages = []
+        cursor = None
+        while True:
+            params = {"q": word, "user_id": user["id"], "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/projects/search", params=params)
+            pages.append([hit["id"] for hit in response.json()])
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if not cursor:
+                break
+        assert pages == [ids[:2], ids[2:3]]
+
+        assert client.get("/api/projects/search", params={"q": "&!"}).status_code == 400
+        assert (
+            client.get(
+                "/api/projects/search", params={"q": word, "cursor": "bad"}
+            ).status_code
+            == 400
+        )
+
+        client.delete(f"/api/users/{user['id']}")
+
+
+def test_only_searches_of_every_project_are_capped(monkeypatch):
+    monkeypatch.setattr(dependencies.project_operations, "SEARCH_MAX_CANDIDATES", 2)
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={"username": f"cap_{suffix}", "email": f"c_{suffix}@example.com"},
+        ).json()
+        word = f"zq{suffix}"
+        items = [
+            {
+                "user_id": user["id"],
+                "project_name": f"{word} {word}",
+                "description": word,
+            },
+            {"user_id": user["id"], "project_name": "Parser", "description": word},
+            {"user_id": user["id"], "project_name": "Linter", "description": word},
+        ]
+        ids = [
+            p["id"]
+            for p in client.post("/api/projects/bulk", json={"items": items}).json()[
+                "projects"
+            ]
+        ]
+
+        # The oldest project ranks best but falls outside the newest two
+        hits = client.get("/api/projects/search", params={"q": word}).json()
+        assert sorted(hit["id"] for hit in hits) == ids[1:]
+
+        hits = client.get(
+            "/api/projects/search", params={"q": word, "user_id": user["id"]}
+        ).json()
+        assert [hit["id"] for hit in hits][0] == ids[0]
+        assert len(hits) == 3
+
+        client.delete(f"/api/users/{user['id']}")
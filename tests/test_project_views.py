@@ -0,0 +1,105 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from main import app
+from schemas.project_schemas import ProjectSummarySchema
+from utils.pagination import NEXT_CURSOR_HEADER
+
+
+def test_project_list_views():
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={"username": f"view_{suffix}", "email": f"view_{suffix}@example.com"},
+        ).json()
+        for order in range(3):
+            client.post(
+                "/api/projects/create",
+                json={
+                    "user_id": user["id"],
+                    "project_name": f"p{order}",
+                    "description": "long text " * 100,
+                    "technologies_used": ["python"],
+                    "display_order": order,
+                },
+            )
+
+        full = client.get("/api/projects/list", params={"user_id": user["id"]}).json()
+        assert full[0]["description"].startswith("long text")
+
+        summary = client.get(
+            "/api/projects/list", params={"user_id": user["id"], "view": "summary"}
+        ).json()
+        assert set(summary[0]) == set(ProjectSummarySchema.model_fields)
+        assert [p["id"] for p in summary] == [p["id"] for p in full]
+
+        response = client.get(
+            "/api/projects/list",
+            params={"user_id": user["id"], "fields": ["project_name"], "limit": 2},
+        )
+        assert response.json() == [
+            {
+                "id": p["id"],
+                "display_order": p["display_order"],
+                "project_name": p["project_name"],
+            }
+            for p in full[:2]
+        ]
+        next_page = client.get(
+            "/api/projects/list",
+            params={
+                "user_id": user["id"],
+                "fields": ["project_name"],
+                "cursor": response.headers[NEXT_CURSOR_HEADER],
+            },
+        ).json()
+        assert [p["id"] for p in next_page] == [full[2]["id"]]
+
+        response = client.get(
+            "/api/projects/list",
+            params={"user_id": user["id"], "fields": ["project_name", "password"]},
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown fields: password"
+
+        client.delete(f"/api/users/{user['id']}")
+
+
+def test_project_list_active_and_featured_modes():
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={"username": f"mode_{suffix}", "email": f"mode_{suffix}@example.com"},
+        ).json()
+        flags = [(True, True), (True, False), (False, True), (False, False)]
+        ids = [
+            client.post(
+                "/api/projects/create",
+                json={
+                    "user_id": user["id"],
+                    "project_name": f"p{order}",
+                    "description": "Project",
+                    "is_active": is_active,
+                    "is_featured": is_featured,
+                    "display_order": order,
+                },
+            ).json()["id"]
+            for order, (is_active, is_featured) in enumerate(flags)
+        ]
+
+        def listed(**params):
+            response = client.get(
+                "/api/projects/list", params={"user_id": user["id"], **params}
+            )
+            return [p["id"] for p in response.json()]
+
+        assert listed() == ids
+        assert listed(active_only=True) == ids[:2]
+        assert listed(featured_only=True) == [ids[0], ids[2]]
+        assert listed(active_only=True, featured_only=True) == ids[:1]
+        assert listed(active_only=True, view="summary", limit=1) == ids[:1]
+
+        client.delete(f"/api/users/{user['id']}")
@@ -0,0 +1,62 @@
+import json
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from db import sessionmanager
+from main import app
+from settings import settings
+from utils.logger import CustomJsonFormatter
+
+
+def test_query_budget_fails_when_exceeded():
+    with TestClient(app) as client:
+        with sessionmanager.query_budget(1):
+            assert client.get("/api/users/list").status_code == 200
+
+        with pytest.raises(AssertionError, match="at most 1 queries, got 2"):
+            with sessionmanager.query_budget(1):
+                client.get("/api/users/list")
+                client.get("/api/users/list")
+
+
+class JsonLinesHandler(logging.Handler):
+    """Formats records as they are emitted, inside the request context."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.setFormatter(CustomJsonFormatter())
+        self.lines: list[dict] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(json.loads(self.format(record)))
+
+
+def test_slow_queries_are_logged_with_request_id(monkeypatch):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0.000001)
+    handler = JsonLinesHandler()
+    logging.getLogger().addHandler(handler)
+    try:
+        with TestClient(app) as client:
+            response = client.get(
+                "/api/users/list", headers={"X-Request-ID": "slow-query-test"}
+            )
+    finally:
+        logging.getLogger().removeHandler(handler)
+
+    assert response.status_code == 200
+    slow = [line for line in handler.lines if line["message"] == "Slow query"]
+    assert slow
+    assert slow[0]["request_id"] == "slow-query-test"
+    assert "FROM users" in slow[0]["statement"]
+    assert slow[0]["duration_ms"] >= 0
+
+
+def test_slow_query_log_can_be_disabled(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0.0)
+    with TestClient(app) as client:
+        with caplog.at_level(logging.WARNING):
+            client.get("/api/users/list")
+
+    assert not [r for r in caplog.records if r.getMessage() == "Slow query"]
@@ -1,6 +1,19 @@
+import asyncio
+import fcntl
+import multiprocessing
+
 from fastapi.testclient import TestClient
 
 from main import app
+from tests.resp_server import RespServer
+from utils.rate_limit import (
+    MemoryRateLimitBackend,
+    RedisRateLimitBackend,
+    SharedMemoryRateLimitBackend,
+    gcra,
+    parse_rate,
+)
+from utils.redis_client import RedisClient
 
 client = TestClient(app)
 
@@ -11,3 +24,113 @@ def test_rate_limit():
         assert response.status_code == 200, f"Failed at {i + 1}"
     response = client.get("/")
     assert response.status_code == 429
+
+
+def test_gcra_allows_burst_then_rejects():
+    rate = parse_rate("5/minute")
+    tat, now = 0.0, 1000.0
+    remaining = []
+    for _ in range(5):
+        tat, result = gcra(tat, now, rate)
+        assert result.allowed
+        remaining.append(result.remaining)
+    assert remaining == [4, 3, 2, 1, 0]
+
+    _, result = gcra(tat, now, rate)
+    assert not result.allowed
+    assert result.retry_after == 12
+
+    _, result = gcra(tat, now + 12, rate)
+    assert result.allowed
+
+
+def test_memory_backend_is_bounded():
+    backend = MemoryRateLimitBackend(max_keys=10)
+    rate = parse_rate("5/minute")
+
+    def hit(key: str):
+        return asyncio.run(backend.hit(key, rate))
+
+    for _ in range(5):
+        hit("client")
+    for i in range(9):
+        hit(f"other-{i}")
+    assert not hit("client").allowed
+
+    # Ten newer keys push it out as the least recently seen; it starts afresh
+    for i in range(10):
+        hit(f"newer-{i}")
+    result = hit("client")
+    assert result.allowed
+    assert result.remaining == 4
+
+
+def hit_shared_table(path: str) -> int:
+    backend = SharedMemoryRateLimitBackend(path)
+    rate = parse_rate("5/minute")
+    return sum(asyncio.run(backend.hit("client", rate)).allowed for _ in range(5))
+
+
+def test_shared_memory_backend_enforces_limit_across_processes(tmp_path):
+    path = str(tmp_path / "ratelimit")
+    SharedMemoryRateLimitBackend.create(path, slots=64)
+
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        allowed = pool.map(hit_shared_table, [path] * 4)
+
+    assert sum(allowed) == 5
+
+
+def test_shared_memory_backend_waits_without_blocking_the_loop(tmp_path):
+    path = str(tmp_path / "ratelimit")
+    SharedMemoryRateLimitBackend.create(path, slots=64)
+    backend = SharedMemoryRateLimitBackend(path)
+    rate = parse_rate("5/minute")
+
+    async def hit_while_locked() -> bool:
+        with open(path, "r+b") as other_worker:
+            fcntl.flock(other_worker, fcntl.LOCK_EX)
+            hit = asyncio.create_task(backend.hit("client", rate))
+            await asyncio.sleep(0.05)
+            assert not hit.done()
+            fcntl.flock(other_worker, fcntl.LOCK_UN)
+        return (await hit).allowed
+
+    assert asyncio.run(hit_while_locked())
+
+
+def test_redis_backend_enforces_limit():
+    async def scenario():
+        server = await RespServer().start()
+        backend = RedisRateLimitBackend(RedisClient(server.url))
+        rate = parse_rate("5/minute")
+        results = [await backend.hit("client", rate) for _ in range(6)]
+        # The script is sent once, on the first NOSCRIPT, and cached after
+        assert server.commands == ["EVALSHA", "EVAL"] + ["EVALSHA"] * 5
+        assert 59000 < server.pttl("ratelimit:client") <= 60000
+        assert (await backend.hit("other", rate)).allowed
+        await backend.close()
+        await server.stop()
+        return results
+
+    results = asyncio.run(scenario())
+    assert [result.allowed for result in results] == [True] * 5 + [False]
+    assert [result.remaining for result in results] == [4, 3, 2, 1, 0, 0]
+    assert all(result.retry_after == 0 for result in results[:5])
+    assert 11 < results[5].retry_after <= 12
+
+
+def test_redis_backend_fails_open():
+    async def scenario():
+        server = await RespServer().start()
+        backend = RedisRateLimitBackend(RedisClient(server.url, timeout=0.1))
+        rate = parse_rate("1/minute")
+        assert (await backend.hit("client", rate)).allowed
+        assert not (await backend.hit("client", rate)).allowed
+        await backend.close()
+        await server.stop()
+        return await backend.hit("client", rate)
+
+    result = asyncio.run(scenario())
+    assert result.allowed
+    assert (result.remaining, result.retry_after) == (1, 0)
@@ -0,0 +1,175 @@
+import socket
+import time
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from db import TimedQueuePool, create_session_factory, sessionmanager
+from main import app
+from settings import settings
+from utils.constants import PRIMARY_STICKY_COOKIE
+
+
+@pytest.fixture(autouse=True)
+def no_replica_monitor(monkeypatch):
+    # Tests run health checks themselves; the background one would race them
+    # for replica connections
+    monkeypatch.setattr(sessionmanager, "start_replica_monitor", lambda: None)
+
+
+def checkouts(pool) -> int:
+    assert isinstance(pool, TimedQueuePool)
+    return pool.checkouts
+
+
+def test_reads_use_replica_until_the_client_writes(monkeypatch):
+    # The primary stands in for its own replica
+    monkeypatch.setattr(settings, "DB_REPLICA_URLS", settings.DB_URL)
+    with TestClient(app) as client:
+        assert sessionmanager.engine and len(sessionmanager.replicas) == 1
+        replica = sessionmanager.replicas[0]
+        client.portal.call(sessionmanager.check_replicas)
+        assert replica.healthy and replica.lag == 0
+
+        primary_before = checkouts(sessionmanager.engine.pool)
+        replica_before = checkouts(replica.engine.pool)
+        assert client.get("/api/users/list").status_code == 200
+        assert checkouts(replica.engine.pool) == replica_before + 1
+        assert checkouts(sessionmanager.engine.pool) == primary_before
+
+        suffix = uuid4().hex[:8]
+        response = client.post(
+            "/api/users/create",
+            json={"username": f"replica_{suffix}", "email": f"r_{suffix}@example.com"},
+        )
+        assert response.status_code == 201
+        assert PRIMARY_STICKY_COOKIE in response.cookies
+
+        # The client's next read must see its write, so it skips the replica
+        replica_before = checkouts(replica.engine.pool)
+        user = client.get(f"/api/users/{response.json()['id']}")
+        assert user.status_code == 200
+        assert checkouts(replica.engine.pool) == replica_before
+
+        client.cookies.clear()
+        client.get("/api/users/list")
+        assert checkouts(replica.engine.pool) == replica_before + 1
+
+        client.delete(f"/api/users/{response.json()['id']}")
+
+
+def test_lagging_replica_reads_are_not_cached(monkeypatch):
+    monkeypatch.setattr(settings, "DB_REPLICA_URLS", settings.DB_URL)
+    suffix = uuid4().hex[:8]
+    # The replica sees a copy of users taken before the update below
+    schema = f"lagging_{suffix}"
+    lagging = create_async_engine(
+        settings.DB_URL,
+        connect_args={"server_settings": {"search_path": f"{schema}, public"}},
+    )
+
+    async def execute(statement: str) -> None:
+        assert sessionmanager.engine
+        async with sessionmanager.engine.begin() as conn:
+            await conn.execute(text(statement))
+
+    with TestClient(app) as client:
+        user = client.post(
+            "/api/users/create",
+            json={"username": f"lag_{suffix}", "email": f"lag_{suffix}@example.com"},
+        ).json()
+        client.portal.call(execute, f"CREATE SCHEMA {schema}")
+        client.portal.call(
+            execute, f"CREATE TABLE {schema}.users AS SELECT * FROM public.users"
+        )
+        monkeypatch.setattr(
+            sessionmanager.replicas[0],
+            "session_factory",
+            create_session_factory(lagging),
+        )
+        try:
+            updated = client.put(
+                f"/api/users/{user['id']}", json={"username": f"new_{suffix}"}
+            )
+            assert updated.status_code == 200
+            sticky = client.cookies[PRIMARY_STICKY_COOKIE]
+
+            # Another client reads the old row from the replica...
+            client.cookies.clear()
+            stale = client.get(f"/api/users/{user['id']}").json()
+            assert stale["username"] == f"lag_{suffix}"
+
+            # ...which must not reach the writer through the cache
+            client.cookies.set(PRIMARY_STICKY_COOKIE, sticky)
+            fresh = client.get(f"/api/users/{user['id']}").json()
+            assert fresh["username"] == f"new_{suffix}"
+        finally:
+            client.portal.call(execute, f"DROP SCHEMA {schema} CASCADE")
+            client.portal.call(lagging.dispose)
+            client.delete(f"/api/users/{user['id']}")
+
+
+def test_unreachable_replica_falls_back_to_primary(monkeypatch):
+    down = make_url(settings.DB_URL).set(port=1)
+    monkeypatch.setattr(
+        settings, "DB_REPLICA_URLS", down.render_as_string(hide_password=False)
+    )
+    with TestClient(app) as client:
+        client.portal.call(sessionmanager.check_replicas)
+        assert not sessionmanager.replicas[0].healthy
+        assert sessionmanager.choose_replica() is None
+        assert client.get("/api/users/list").status_code == 200
+
+
+def test_silent_replica_check_times_out_while_connecting(monkeypatch):
+    # Accepts TCP connections but never answers the Postgres handshake
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        port = listener.getsockname()[1]
+        silent = make_url(settings.DB_URL).set(host="127.0.0.1", port=port)
+        monkeypatch.setattr(
+            settings, "DB_REPLICA_URLS", silent.render_as_string(hide_password=False)
+        )
+        monkeypatch.setattr(settings, "DB_REPLICA_CHECK_TIMEOUT", 0.2)
+        with TestClient(app) as client:
+            start = time.monotonic()
+            client.portal.call(sessionmanager.check_replicas)
+            assert time.monotonic() - start < 2
+            assert not sessionmanager.replicas[0].healthy
+
+
+def test_least_connections_prefers_idle_replica(monkeypatch):
+    monkeypatch.setattr(
+        settings, "DB_REPLICA_URLS", f"{settings.DB_URL},{settings.DB_URL}"
+    )
+    monkeypatch.setattr(settings, "DB_REPLICA_POLICY", "least_connections")
+    with TestClient(app) as client:
+        busy, idle = sessionmanager.replicas
+
+        async def hold_busy_connection():
+            async with busy.engine.connect():
+                return sessionmanager.choose_replica()
+
+        assert client.portal.call(hold_busy_connection) is idle
+
+
+def test_query_budget_counts_replica_queries(monkeypatch):
+    monkeypatch.setattr(settings, "DB_REPLICA_URLS", settings.DB_URL)
+    with TestClient(app) as client:
+        replica = sessionmanager.replicas[0]
+        client.portal.call(sessionmanager.check_replicas)
+        replica_before = checkouts(replica.engine.pool)
+
+        with pytest.raises(AssertionError, match="at most 0 queries, got 1"):
+            with sessionmanager.query_budget(0):
+                assert client.get("/api/users/list").status_code == 200
+        assert checkouts(replica.engine.pool) == replica_before + 1
+
+        # The listener is removed from every engine on exit
+        with sessionmanager.count_queries() as statements:
+            pass
+        client.get("/api/users/list")
+        assert statements == []
@@ -0,0 +1,96 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from utils.redis_client import RedisClient
+
+
+def test_stalled_handshake_times_out_and_is_not_reused():
+    async def scenario() -> int:
+        connections: List[asyncio.StreamWriter] = []
+
+        # Accepts connections but never answers AUTH
+        async def stall(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            connections.append(writer)
+
+        server = await asyncio.start_server(stall, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = RedisClient(f"redis://:secret@127.0.0.1:{port}/1", timeout=0.1)
+        for _ in range(2):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.execute("PING"), 0.5)
+        for writer in connections:
+            writer.close()
+        server.close()
+        await client.close()
+        return len(connections)
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_concurrent_commands_use_separate_pooled_connections():
+    async def scenario() -> List[int]:
+        connections: List[asyncio.StreamWriter] = []
+        in_flight = 0
+        peak = 0
+
+        # Answers every PING after a short delay
+        async def pong(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            nonlocal in_flight, peak
+            connections.append(writer)
+            while await reader.readuntil(b"PING\r\n"):
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.05)
+                in_flight -= 1
+                writer.write(b"+PONG\r\n")
+                await writer.drain()
+
+        server = await asyncio.start_server(pong, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = RedisClient(f"redis://127.0.0.1:{port}/0", max_connections=3)
+        replies = await asyncio.gather(*(client.execute("PING") for _ in range(6)))
+        assert replies == ["PONG"] * 6
+        opened = len(connections)
+        await client.execute("PING")
+        await client.close()
+        for writer in connections:
+            writer.close()
+        server.close()
+        return [opened, len(connections), peak]
+
+    # Three commands at a time, each pooled connection is reused afterwards
+    assert asyncio.run(scenario()) == [3, 3, 3]
+
+
+def test_only_idempotent_commands_are_retried_on_a_dropped_connection():
+    async def scenario() -> List[bytes]:
+        received: List[bytes] = []
+
+        # Answers the first command on a connection with nil, then takes the
+        # second and hangs up without replying
+        async def drop(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            for reply in (b"$-1\r\n", None):
+                count = int((await reader.readuntil(b"\r\n"))[1:-2])
+                args = [await reader.readuntil(b"\r\n") for _ in range(2 * count)]
+                received.append(args[1][:-2])
+                if reply:
+                    writer.write(reply)
+                    await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(drop, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = RedisClient(f"redis://127.0.0.1:{port}/0", max_connections=1)
+        await client.execute("PING")
+        with pytest.raises(ConnectionError):
+            await client.execute("EVAL", "return 1", 0, idempotent=False)
+        await client.execute("PING")
+        assert await client.execute("GET", "key") is None
+        await client.close()
+        server.close()
+        return received
+
+    # The script ran once; the read was sent again on a new connection
+    assert asyncio.run(scenario()) == [b"PING", b"EVAL", b"PING", b"GET", b"GET"]
@@ -0,0 +1,48 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from main import app
+from settings import settings
+from utils.pagination import NEXT_CURSOR_HEADER
+
+
+def test_fast_list_responses_match_validated(monkeypatch):
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={"username": f"fast_{suffix}", "email": f"fast_{suffix}@example.com"},
+        ).json()
+        for order in range(3):
+            client.post(
+                "/api/projects/create",
+                json={
+                    "user_id": user["id"],
+                    "project_name": f"p{order}",
+                    "description": "d",
+                    "highlights": ["a", "b"],
+                    "start_date": "2024-01-31",
+                    "display_order": order,
+                },
+            )
+
+        requests = [
+            ("/api/projects/list", {"user_id": user["id"], "limit": 2}),
+            ("/api/users/list", {"limit": 2}),
+        ]
+        for path, params in requests:
+            monkeypatch.setattr(settings, "RESPONSE_MODE", "validated")
+            validated = client.get(path, params=params)
+            monkeypatch.setattr(settings, "RESPONSE_MODE", "fast")
+            fast = client.get(path, params=params)
+
+            assert fast.status_code == validated.status_code == 200
+            assert fast.headers["content-type"] == "application/json"
+            assert fast.json() == validated.json()
+            assert (
+                fast.headers[NEXT_CURSOR_HEADER]
+                == validated.headers[NEXT_CURSOR_HEADER]
+            )
+
+        client.delete(f"/api/users/{user['id']}")
@@ -0,0 +1,60 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+def test_technology_filters_and_counts():
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={"username": f"tech_{suffix}", "email": f"tech_{suffix}@example.com"},
+        ).json()
+        stacks = [["Rust", "Postgres"], ["Python", "Postgres"], ["Go", "C's"], None]
+        items = [
+            {
+                "user_id": user["id"],
+                "project_name": f"p{order}",
+                "description": "Project",
+                "technologies_used": stack,
+                "display_order": order,
+            }
+            for order, stack in enumerate(stacks)
+        ]
+        ids = [
+            p["id"]
+            for p in client.post("/api/projects/bulk", json={"items": items}).json()[
+                "projects"
+            ]
+        ]
+
+        def listed(**params):
+            response = client.get(
+                "/api/projects/list", params={"user_id": user["id"], **params}
+            )
+            assert response.status_code == 200
+            return [p["id"] for p in response.json()]
+
+        assert listed(technology="Rust") == ids[:1]
+        assert listed(technology="rust") == []
+        assert listed(technology="C's") == ids[2:3]
+        assert listed(technology="Rust'); DROP TABLE projects; --\\") == []
+        assert listed(any_of=["Rust", "Go"]) == [ids[0], ids[2]]
+        assert listed(all_of=["Python", "Postgres"]) == ids[1:2]
+        assert listed(technology="Postgres", view="summary") == ids[:2]
+        assert listed(technology="Postgres", any_of=["Go"]) == []
+
+        counts = client.get(
+            "/api/projects/technologies", params={"user_id": user["id"]}
+        ).json()
+        assert counts == [
+            {"technology": "Postgres", "projects": 2},
+            {"technology": "C's", "projects": 1},
+            {"technology": "Go", "projects": 1},
+            {"technology": "Python", "projects": 1},
+            {"technology": "Rust", "projects": 1},
+        ]
+
+        client.delete(f"/api/users/{user['id']}")
@@ -0,0 +1,65 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from db import sessionmanager
+from main import app
+from schemas.project_schemas import ProjectResponseSchema
+from schemas.user_schemas import UserPortfolioSchema, UserResponseSchema
+
+
+def test_portfolio_returns_user_and_active_projects_in_one_query():
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={"username": f"folio_{suffix}", "email": f"folio_{suffix}@x.com"},
+        ).json()
+        for name, order, is_active in (("b", 2, True), ("a", 1, True), ("x", 0, False)):
+            client.post(
+                "/api/projects/create",
+                json={
+                    "user_id": user["id"],
+                    "project_name": name,
+                    "description": "Project",
+                    "highlights": ["Shipped", "Used by 3 teams"],
+                    "technologies_used": ["Python", "Postgres"],
+                    "start_date": "2026-01-31",
+                    "display_order": order,
+                    "is_active": is_active,
+                },
+            )
+
+        with sessionmanager.query_budget(1):
+            response = client.get(f"/api/users/{user['id']}/portfolio")
+        assert response.status_code == 200
+        portfolio = UserPortfolioSchema.model_validate_json(response.content)
+        assert response.content == portfolio.model_dump_json().encode()
+
+        assert portfolio.model_dump(exclude={"projects"}) == (
+            UserResponseSchema.model_validate(user).model_dump()
+        )
+        listed = client.get(
+            "/api/projects/list", params={"user_id": user["id"], "active_only": True}
+        ).json()
+        assert [p.project_name for p in portfolio.projects] == ["a", "b"]
+        assert portfolio.projects == [
+            ProjectResponseSchema.model_validate(p) for p in listed
+        ]
+
+        client.delete(f"/api/users/{user['id']}")
+        assert client.get(f"/api/users/{user['id']}/portfolio").status_code == 404
+
+
+def test_portfolio_of_user_without_projects():
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={"username": f"empty_{suffix}", "email": f"empty_{suffix}@x.com"},
+        ).json()
+
+        response = client.get(f"/api/users/{user['id']}/portfolio")
+        assert response.json()["projects"] == []
+
+        client.delete(f"/api/users/{user['id']}")
@@ -0,0 +1,47 @@
+import asyncio
+from uuid import uuid4
+
+from httpx import ASGITransport, AsyncClient
+
+from db import sessionmanager
+from main import app
+
+
+def test_concurrent_signups_create_exactly_one_user():
+    suffix = uuid4().hex[:8]
+
+    async def scenario():
+        transport = ASGITransport(app=app)
+        try:
+            async with AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                # Same username, distinct emails
+                responses = await asyncio.gather(
+                    *(
+                        client.post(
+                            "/api/users/create",
+                            json={
+                                "username": f"race_{suffix}",
+                                "email": f"race_{suffix}_{i}@example.com",
+                            },
+                        )
+                        for i in range(50)
+                    )
+                )
+                # Distinct username, email already taken by the winner
+                winner = next(r.json() for r in responses if r.status_code == 201)
+                duplicate_email = await client.post(
+                    "/api/users/create",
+                    json={"username": f"other_{suffix}", "email": winner["email"]},
+                )
+                return responses, duplicate_email
+        finally:
+            await sessionmanager.close()
+
+    responses, duplicate_email = asyncio.run(scenario())
+    codes = [r.status_code for r in responses]
+
+    assert codes.count(201) == 1
+    assert codes.count(400) == 49
+    assert duplicate_email.status_code == 400
@@ -0,0 +1,80 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from db import sessionmanager
+from main import app
+
+
+def test_project_writes_use_single_statement():
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={"username": f"write_{suffix}", "email": f"w_{suffix}@example.com"},
+        ).json()
+        # The owner check is part of the INSERT ... SELECT ... RETURNING
+        with sessionmanager.query_budget(1):
+            project = client.post(
+                "/api/projects/create",
+                json={"user_id": user["id"], "project_name": "p", "description": "d"},
+            ).json()
+
+        with sessionmanager.query_budget(1):
+            response = client.put(
+                f"/api/projects/{project['id']}",
+                params={"user_id": user["id"]},
+                json={"project_name": "renamed"},
+            )
+        assert response.status_code == 200
+        assert response.json()["project_name"] == "renamed"
+        assert response.json()["updated_at"] is not None
+
+        with sessionmanager.query_budget(1):
+            response = client.delete(
+                f"/api/projects/{project['id']}", params={"user_id": user["id"]}
+            )
+        assert response.status_code == 204
+
+        response = client.delete(
+            f"/api/projects/{project['id']}", params={"user_id": user["id"]}
+        )
+        assert response.status_code == 404
+        response = client.put(
+            f"/api/projects/{project['id']}",
+            params={"user_id": user["id"]},
+            json={"project_name": "gone"},
+        )
+        assert response.status_code == 404
+
+
+def test_delete_user_cascades_in_single_statement():
+    with TestClient(app) as client:
+        suffix = uuid4().hex[:8]
+        user = client.post(
+            "/api/users/create",
+            json={"username": f"cascade_{suffix}", "email": f"c_{suffix}@example.com"},
+        ).json()
+        client.post(
+            "/api/projects/bulk",
+            json={
+                "items": [
+                    {"user_id": user["id"], "project_name": f"p{i}", "description": "d"}
+                    for i in range(20)
+                ]
+            },
+        )
+
+        with sessionmanager.query_budget(1):
+            response = client.delete(f"/api/users/{user['id']}")
+        assert response.status_code == 204
+        remaining = client.get(
+            "/api/projects/list", params={"user_id": user["id"]}
+        ).json()
+        assert remaining == []
+
+        response = client.post(
+            "/api/projects/create",
+            json={"user_id": user["id"], "project_name": "late", "description": "d"},
+        )
+        assert response.status_code == 400
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from schemas.common import CacheStatsSchema
+from settings import settings
+from utils.logger import get_logger
+from utils.metrics import CACHE_EVICTIONS, CACHE_LOOKUPS
+from utils.redis_client import RedisClient, RedisError, RespValue
+
+logger = get_logger()
+
+__cache: Optional["CacheBackend"] = None
+
+
+def user_cache_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def project_cache_key(project_id: int, user_id: int) -> str:
+    return f"{user_projects_cache_group(user_id)}{project_id}"
+
+
+def user_projects_cache_group(user_id: int) -> str:
+    return f"project:{user_id}:"
+
+
+class CacheBackend(ABC):
+    """Key/value cache for JSON-serializable values."""
+
+    name: str = ""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def record_hit(self) -> None:
+        self.hits += 1
+        CACHE_LOOKUPS.labels(self.name, "hit").inc()
+
+    def record_miss(self) -> None:
+        self.misses += 1
+        CACHE_LOOKUPS.labels(self.name, "miss").inc()
+
+    def record_eviction(self) -> None:
+        self.evictions += 1
+        CACHE_EVICTIONS.labels(self.name).inc()
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, group: Optional[str] = None) -> None:
+        """Store a value under key, as a member of ``group`` if given.
+
+        A group is a prefix of its keys, e.g. ``project:42:`` for the projects
+        of one user, removed together by ``delete_group``.
+        """
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Remove keys if present."""
+
+    @abstractmethod
+    async def delete_group(self, group: str) -> None:
+        """Remove every key stored as a member of group."""
+
+    async def close(self) -> None:
+        """Release any connection held by the backend."""
+
+    def size(self) -> int:
+        return 0
+
+    def stats(self) -> CacheStatsSchema:
+        lookups = self.hits + self.misses
+        return CacheStatsSchema(
+            backend=self.name,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=self.size(),
+            hit_rate=self.hits / lookups if lookups else 0.0,
+        )
+
+
+class NullCache(CacheBackend):
+    """Cache that never stores anything."""
+
+    name = "none"
+
+    async def get(self, key: str) -> Optional[Any]:
+        self.record_miss()
+        return None
+
+    async def set(self, key: str, value: Any, group: Optional[str] = None) -> None:
+        pass
+
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    async def delete_group(self, group: str) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache bounded by entry count and TTL.
+
+    Each worker holds its own copy, so invalidations only reach the worker
+    that performed the write; keep the TTL short or use the shared backend
+    when running several workers.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.record_miss()
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.record_miss()
+            return None
+
+        self._entries.move_to_end(key)
+        self.record_hit()
+        return value
+
+    async def set(self, key: str, value: Any, group: Optional[str] = None) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.record_eviction()
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def delete_group(self, group: str) -> None:
+        # Entries are few enough to scan; a group is a prefix of its keys
+        for key in [k for k in self._entries if k.startswith(group)]:
+            del self._entries[key]
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """Cache shared by all workers through a Redis-protocol server.
+
+    The keys of a group are listed in a set next to them, so deleting the
+    group touches only its own keys rather than scanning the keyspace. The
+    set expires ``ttl`` after its newest member was stored. Server errors
+    are logged and treated as misses so requests fall back to the database
+    instead of failing.
+    """
+
+    name = "redis"
+    SET_IN_GROUP = """
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+redis.call('SADD', KEYS[2], KEYS[1])
+redis.call('PEXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+    DELETE_GROUP = """
+local keys = redis.call('SMEMBERS', KEYS[1])
+for i = 1, #keys, 500 do
+  redis.call('DEL', unpack(keys, i, math.min(i + 499, #keys)))
+end
+redis.call('DEL', KEYS[1])
+return #keys
+"""
+
+    def __init__(self, client: RedisClient, ttl: float, namespace: str = "cache:"):
+        super().__init__()
+        self.client = client
+        self.ttl_ms = int(ttl * 1000)
+        self.namespace = namespace
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self.client.execute("GET", self.namespace + key)
+        except (OSError, TimeoutError, RedisError) as e:
+            logger.warning("Cache get failed: %r", e)
+            raw = None
+
+        if not isinstance(raw, (bytes, str)):
+            self.record_miss()
+            return None
+        self.record_hit()
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, group: Optional[str] = None) -> None:
+        try:
+            if group is None:
+                await self.client.execute(
+                    "SET", self.namespace + key, json.dumps(value), "PX", self.ttl_ms
+                )
+            else:
+                await self._eval(
+                    self.SET_IN_GROUP,
+                    [self.namespace + key, self._group_key(group)],
+                    [json.dumps(value), self.ttl_ms],
+                )
+        except (OSError, TimeoutError, RedisError) as e:
+            logger.warning("Cache set failed: %r", e)
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self.client.execute("DEL", *(self.namespace + k for k in keys))
+        except (OSError, TimeoutError, RedisError) as e:
+            logger.warning("Cache delete failed: %r", e)
+
+    async def delete_group(self, group: str) -> None:
+        try:
+            await self._eval(self.DELETE_GROUP, [self._group_key(group)], [])
+        except (OSError, TimeoutError, RedisError) as e:
+            logger.warning("Cache delete failed: %r", e)
+
+    def _group_key(self, group: str) -> str:
+        return f"{self.namespace}group:{group}"
+
+    async def _eval(self, script: str, keys: List[str], args: List[Any]) -> RespValue:
+        """Run a script by its SHA1, sending it in full if the server lacks it."""
+        sha = hashlib.sha1(script.encode()).hexdigest()
+        try:
+            return await self.client.execute("EVALSHA", sha, len(keys), *keys, *args)
+        except RedisError as e:
+            if not str(e).startswith("NOSCRIPT"):
+                raise
+        return await self.client.execute("EVAL", script, len(keys), *keys, *args)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+def get_cache() -> CacheBackend:
+    """Cache factory returning the process-wide backend from settings."""
+
+    global __cache
+    if __cache:
+        return __cache
+
+    if settings.CACHE_BACKEND == "redis":
+        client = RedisClient(
+            settings.CACHE_URL, max_connections=settings.REDIS_MAX_CONNECTIONS
+        )
+        __cache = RedisCache(client, settings.CACHE_TTL)
+    elif settings.CACHE_BACKEND == "memory":
+        __cache = MemoryCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL)
+    else:
+        __cache = NullCache()
+    return __cache
+
+
+def set_cache(cache: CacheBackend) -> None:
+    """Replace the process-wide backend, e.g. with a local stand-in in tests."""
+
+    global __cache
+    __cache = cache
@@ -0,0 +1,66 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+
+
+def weak_etag(*parts: Any) -> str:
+    """Weak ETag for a resource version, e.g. ``(id, updated_at)``."""
+    normalized = [
+        part.timestamp() if isinstance(part, datetime) else part for part in parts
+    ]
+    digest = hashlib.blake2b(repr(normalized).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def is_conditional(request: Request) -> bool:
+    headers = request.headers
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime]
+) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when it is absent.
+
+    ETags are compared weakly, as RFC 9110 requires for GET.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        opaque = etag.removeprefix("W/")
+        return any(
+            candidate.strip().removeprefix("W/") == opaque
+            for candidate in if_none_match.split(",")
+        )
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, last_modified),
+    )
@@ -1 +1,11 @@
 API_RATE_LIMIT = "5/minute"
+MAX_BULK_ITEMS = 500
+EXPORT_BATCH_SIZE = 1000
+IMPORT_CHUNK_SIZE = 5000
+MAX_IMPORT_ERRORS = 100
+MAX_SEARCH_TERMS = 8
+# Matches ranked per search of every project, newest first; bounds the cost
+# of common terms
+SEARCH_MAX_CANDIDATES = 1000
+# Set after a write; reads from that client skip the replicas until it expires
+PRIMARY_STICKY_COOKIE = "db_primary_until"
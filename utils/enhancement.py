@@ -0,0 +1,154 @@
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+import httpx
+
+from settings import settings
+from utils.logger import get_logger
+
+logger = get_logger()
+
+__provider: Optional["EnhancementProvider"] = None
+
+# Stored with each enhancement; changing it re-enhances every project
+ENHANCEMENT_PROMPT = (
+    "Rewrite the project description and highlights for a portfolio. Keep "
+    "every fact, use active voice and concrete outcomes, and return one "
+    "highlight per input highlight."
+)
+
+
+class EnhancementInput(NamedTuple):
+    description: str
+    highlights: Optional[List[str]]
+
+
+class EnhancementOutput(NamedTuple):
+    description: str
+    highlights: Optional[List[str]]
+
+
+class EnhancementError(Exception):
+    """Raised when the provider fails or returns an unusable batch."""
+
+
+def content_hash(item: EnhancementInput, prompt: str) -> str:
+    """Key of the enhancement cache: same text and prompt, same output."""
+    payload = json.dumps(
+        [item.description, item.highlights, prompt], separators=(",", ":")
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class EnhancementProvider(ABC):
+    """Model backend rewriting a batch of projects in one call."""
+
+    name: str = ""
+
+    @abstractmethod
+    async def enhance(
+        self, items: Sequence[EnhancementInput], prompt: str
+    ) -> List[EnhancementOutput]:
+        """Return one output per input, in order."""
+
+    async def close(self) -> None:
+        """Release any connection held by the provider."""
+
+
+class StubEnhancementProvider(EnhancementProvider):
+    """Deterministic local rewrite, for tests and development."""
+
+    name = "stub"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    @staticmethod
+    def polish(text: str) -> str:
+        text = " ".join(text.split())
+        if not text:
+            return text
+        text = text[0].upper() + text[1:]
+        return text if text.endswith((".", "!", "?")) else f"{text}."
+
+    async def enhance(
+        self, items: Sequence[EnhancementInput], prompt: str
+    ) -> List[EnhancementOutput]:
+        self.calls += 1
+        return [
+            EnhancementOutput(
+                self.polish(item.description),
+                [self.polish(highlight) for highlight in item.highlights]
+                if item.highlights is not None
+                else None,
+            )
+            for item in items
+        ]
+
+
+class HttpEnhancementProvider(EnhancementProvider):
+    """Posts batches as JSON to a model gateway.
+
+    Request: ``{"prompt": str, "items": [{"description", "highlights"}]}``;
+    the response carries ``items`` in the same shape and order.
+    """
+
+    name = "http"
+
+    def __init__(self, url: str, api_key: Optional[str], timeout: float) -> None:
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.url = url
+        self.client = httpx.AsyncClient(headers=headers, timeout=timeout)
+
+    async def enhance(
+        self, items: Sequence[EnhancementInput], prompt: str
+    ) -> List[EnhancementOutput]:
+        try:
+            response = await self.client.post(
+                self.url,
+                json={"prompt": prompt, "items": [item._asdict() for item in items]},
+            )
+            response.raise_for_status()
+            results: List[Any] = response.json()["items"]
+            outputs = [
+                EnhancementOutput(result["description"], result.get("highlights"))
+                for result in results
+            ]
+        except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+            raise EnhancementError(f"Enhancement request failed: {e!r}") from e
+
+        if len(outputs) != len(items):
+            raise EnhancementError(
+                f"Expected {len(items)} enhancements, got {len(outputs)}"
+            )
+        return outputs
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def get_enhancement_provider() -> EnhancementProvider:
+    """Provider factory returning the process-wide provider from settings."""
+
+    global __provider
+    if __provider:
+        return __provider
+
+    if settings.ENHANCEMENT_PROVIDER == "http":
+        __provider = HttpEnhancementProvider(
+            settings.ENHANCEMENT_URL,
+            settings.ENHANCEMENT_API_KEY,
+            settings.ENHANCEMENT_TIMEOUT,
+        )
+    else:
+        __provider = StubEnhancementProvider()
+    return __provider
+
+
+def set_enhancement_provider(provider: EnhancementProvider) -> None:
+    """Replace the process-wide provider, e.g. with a stub in tests."""
+
+    global __provider
+    __provider = provider
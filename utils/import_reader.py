@@ -0,0 +1,92 @@
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# Record number (1-based) and the decoded record, or None when malformed
+NumberedRecord = Tuple[int, Optional[Dict[str, Any]]]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines, keeping the line endings.
+
+    Lines are left undecoded so that invalid UTF-8 fails only its own record.
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        lines = pending.split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + b"\n"
+    if pending:
+        yield pending
+
+
+async def read_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[NumberedRecord]:
+    number = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = json.loads(line.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            yield number, None
+            continue
+        yield number, record if isinstance(record, dict) else None
+
+
+async def read_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[NumberedRecord]:
+    """Read CSV with a header row; empty cells become None.
+
+    Lines are grouped until the quotes balance, so quoted values may span
+    several lines. A header that is not valid UTF-8 gets replacement
+    characters, so its columns match no field.
+    """
+    header: Optional[List[str]] = None
+    record_lines: List[bytes] = []
+    quotes = 0
+    number = 0
+    async for line in iter_lines(chunks):
+        record_lines.append(line)
+        quotes += line.count(b'"')
+        if quotes % 2:
+            continue
+
+        data = b"".join(record_lines)
+        record_lines, quotes = [], 0
+        if not data.strip():
+            continue
+        if header is None:
+            header = next(csv.reader([data.decode("utf-8", errors="replace")]))
+            continue
+
+        number += 1
+        try:
+            values = next(csv.reader([data.decode("utf-8")]))
+        except UnicodeDecodeError:
+            yield number, None
+            continue
+        if len(values) != len(header):
+            yield number, None
+            continue
+        yield (
+            number,
+            {
+                name: value if value != "" else None
+                for name, value in zip(header, values)
+            },
+        )
+
+    if record_lines and header is not None:
+        yield number + 1, None
+
+
+def read_records(
+    chunks: AsyncIterator[bytes], import_format: ImportFormat
+) -> AsyncIterator[NumberedRecord]:
+    if import_format == "csv":
+        return read_csv(chunks)
+    return read_ndjson(chunks)
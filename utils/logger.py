@@ -1,15 +1,31 @@
+import atexit
+import copy
 import datetime
 import logging
+import os
+import queue
+import random
 from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Dict, Union
 
-from pydantic import BaseModel
 from pythonjsonlogger.json import JsonFormatter
 
+from settings import settings
+from utils.metrics import LOG_RECORDS_DROPPED
 
-class RequestContextVar(BaseModel):
-    request_id: str
-    request_path: str
+
+class RequestContextVar:
+    """Per-request context attached to every log record."""
+
+    __slots__ = ("request_id", "request_path", "db_queries", "db_seconds")
+
+    def __init__(self, request_id: str, request_path: str) -> None:
+        self.request_id = request_id
+        self.request_path = request_path
+        # Updated by the database engine events while the request runs
+        self.db_queries = 0
+        self.db_seconds = 0.0
 
 
 request_ctx_var: ContextVar[Union[RequestContextVar, None]] = ContextVar(
@@ -31,12 +47,16 @@ class CustomJsonFormatter(JsonFormatter):
         log_record["timestamp"] = datetime.datetime.fromtimestamp(
             record.created, tz=datetime.timezone.utc
         ).isoformat()
-        log_record["request_id"] = (
-            var.request_id if (var := request_ctx_var.get()) else None
-        )
-        log_record["request_path"] = (
-            var.request_path if (var := request_ctx_var.get()) else None
-        )
+        if hasattr(record, "request_id"):
+            # Captured by AsyncLogHandler in the emitting task
+            request_id = getattr(record, "request_id")
+            request_path = getattr(record, "request_path")
+        else:
+            var = request_ctx_var.get()
+            request_id = var.request_id if var else None
+            request_path = var.request_path if var else None
+        log_record["request_id"] = request_id
+        log_record["request_path"] = request_path
         log_record["pathname"] = record.pathname
         log_record["line"] = record.lineno
         log_record["severity"] = record.levelname
@@ -44,6 +64,77 @@ class CustomJsonFormatter(JsonFormatter):
         super().add_fields(log_record, record, message_dict)
 
 
+class _BlockingSentinelListener(QueueListener):
+    def __init__(self, log_queue: "queue.Queue[Any]", handler: logging.Handler):
+        super().__init__(log_queue, handler, respect_handler_level=True)
+        self.log_queue = log_queue
+
+    def enqueue_sentinel(self) -> None:
+        # The listener keeps draining, so waiting for room cannot deadlock
+        self.log_queue.put(None)
+
+
+class AsyncLogHandler(QueueHandler):
+    """Hands records to a background thread that formats and writes them.
+
+    The queue is bounded; when it is full, records are dropped and counted in
+    ``dropped`` and the ``log_records_dropped_total`` metric unless ``block``
+    is set. The listener is restarted in forked children.
+    """
+
+    def __init__(self, handler: logging.Handler, maxsize: int, block: bool) -> None:
+        self.log_queue: "queue.Queue[Any]" = queue.Queue(maxsize)
+        super().__init__(self.log_queue)
+        self.handler = handler
+        self.block = block
+        self.dropped = 0
+        self._start()
+        atexit.register(self.stop)
+        os.register_at_fork(after_in_child=self._restart)
+
+    def _start(self) -> None:
+        self.queue_listener = _BlockingSentinelListener(self.log_queue, self.handler)
+        self.queue_listener.start()
+
+    def _restart(self) -> None:
+        # Threads do not survive fork; the inherited queue may hold a lock
+        self.log_queue = self.queue = queue.Queue(self.log_queue.maxsize)
+        self.dropped = 0
+        self._start()
+
+    def stop(self) -> None:
+        """Flush pending records and stop the listener thread."""
+        if self.queue_listener._thread is not None:
+            self.queue_listener.stop()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Capture what depends on the emitting task; formatting happens later.
+        # Other handlers of the logger get the record too, so change a copy.
+        record = copy.copy(record)
+        var = request_ctx_var.get()
+        record.request_id = var.request_id if var else None
+        record.request_path = var.request_path if var else None
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.block:
+            self.log_queue.put(record)
+            return
+        try:
+            self.log_queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+def sample_access_log() -> bool:
+    """Whether to emit the per-request access log for this request."""
+    rate = settings.LOG_ACCESS_SAMPLE_RATE
+    return rate >= 1 or random.random() < rate
+
+
 def get_logger() -> logging.Logger:
     """Logger factory function to create a logger with JSON formatting."""
 
@@ -55,6 +146,15 @@ def get_logger() -> logging.Logger:
     logger.setLevel(logging.INFO)
     handler = logging.StreamHandler()
     handler.setFormatter(CustomJsonFormatter())
-    logger.addHandler(handler)
+    if settings.LOG_QUEUE_SIZE > 0:
+        logger.addHandler(
+            AsyncLogHandler(
+                handler,
+                maxsize=settings.LOG_QUEUE_SIZE,
+                block=settings.LOG_QUEUE_OVERFLOW == "block",
+            )
+        )
+    else:
+        logger.addHandler(handler)
     __logger = logger
     return logger
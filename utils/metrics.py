@@ -0,0 +1,137 @@
+import glob
+import os
+
+from settings import settings
+
+if settings.METRICS_DIR:
+    # prometheus_client picks file-backed values when it is first imported,
+    # and unlabelled metrics open their file as soon as they are defined
+    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = settings.METRICS_DIR
+
+from prometheus_client import (  # noqa: E402
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    disable_created_metrics,
+    generate_latest,
+    multiprocess,
+)
+
+# Not available in multiprocess mode; keeps both modes' output the same
+disable_created_metrics()
+
+
+def render_metrics() -> bytes:
+    """Every metric in the Prometheus text exposition format.
+
+    With ``METRICS_DIR`` set, samples are read from the files of every process
+    writing there (all gunicorn workers and the enhancement worker) and
+    summed; otherwise only this process's metrics are rendered.
+    """
+    if not settings.METRICS_DIR:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=settings.METRICS_DIR)
+    return generate_latest(registry)
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop the live samples (gauges) of an exited process."""
+    if settings.METRICS_DIR:
+        multiprocess.mark_process_dead(pid, settings.METRICS_DIR)
+
+
+def remove_dead_process_files() -> None:
+    """Remove the sample files of processes that are no longer running.
+
+    Files are named ``<kind>_<pid>.db``; those of live processes, such as an
+    enhancement worker started before gunicorn, are kept.
+    """
+    if not settings.METRICS_DIR:
+        return
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, "*.db")):
+        pid = int(os.path.basename(path)[: -len(".db")].rsplit("_", 1)[1])
+        if not process_alive(pid):
+            os.remove(path)
+
+
+def process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"]
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum",
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries issued per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50),
+)
+HTTP_REQUEST_DB_DURATION = Histogram(
+    "http_request_db_seconds",
+    "Time spent in database queries per HTTP request",
+    ["method", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DB_QUERIES = Counter("db_queries_total", "Database statements executed")
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Database statement latency",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total", "Requests rejected by the rate limiter", ["route"]
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Read-through cache lookups", ["backend", "result"]
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total", "Cache entries evicted to stay bounded", ["backend"]
+)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full"
+)
+ENHANCEMENT_PROJECTS = Counter(
+    "enhancement_projects_total",
+    "Projects processed by the enhancement worker",
+    ["result"],
+)
+ENHANCEMENT_MODEL_CALLS = Counter(
+    "enhancement_model_calls_total",
+    "Batched calls to the enhancement model provider",
+    ["provider", "result"],
+)
+ENHANCEMENT_MODEL_DURATION = Histogram(
+    "enhancement_model_call_duration_seconds",
+    "Latency of one batched enhancement model call",
+    ["provider"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
@@ -0,0 +1,163 @@
+import os
+import time
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from settings import settings
+from utils.constants import PRIMARY_STICKY_COOKIE
+from utils.logger import (
+    RequestContextVar,
+    get_logger,
+    request_ctx_var,
+    sample_access_log,
+)
+from utils.metrics import (
+    HTTP_REQUEST_DB_DURATION,
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_FLIGHT,
+)
+
+logger = get_logger()
+
+REQUEST_ID_HEADER = b"x-request-id"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def incoming_request_id(scope: Scope) -> Optional[str]:
+    """Request ID sent by an upstream proxy or client, if usable."""
+    for name, value in scope["headers"]:
+        if name == REQUEST_ID_HEADER:
+            if 0 < len(value) <= 128 and value.isascii():
+                return value.decode("latin-1")
+            return None
+    return None
+
+
+def route_template(scope: Scope) -> str:
+    """Full path template of the matched route, e.g. ``/api/users/{user_id}``.
+
+    ``include_router`` copies routes with the router prefix prepended, so the
+    matched route's path already is the full template.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    return route.path
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware setting the request context for logging.
+
+    Reuses an incoming X-Request-ID or generates one, emits the access log
+    and adds X-Request-ID to the response headers as they are sent, without
+    wrapping the response in an extra task like BaseHTTPMiddleware does.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = incoming_request_id(scope) or os.urandom(16).hex()
+        token = request_ctx_var.set(
+            RequestContextVar(request_id, scope["method"] + " " + scope["path"])
+        )
+        if sample_access_log():
+            extra = {}
+            if settings.ENV == "local":
+                extra["query"] = scope["query_string"].decode("latin-1")
+            logger.info("REquest log", extra=extra)
+
+        header = (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_ctx_var.reset(token)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request count, latency and DB work.
+
+    Requests are labelled with the matched route template so label
+    cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+
+            method = scope["method"]
+            route = route_template(scope)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_REQUEST_DURATION.labels(method, route).observe(elapsed)
+            ctx = request_ctx_var.get()
+            if ctx:
+                HTTP_REQUEST_DB_QUERIES.labels(method, route).observe(ctx.db_queries)
+                HTTP_REQUEST_DB_DURATION.labels(method, route).observe(ctx.db_seconds)
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware pinning a client's reads to the primary after a write.
+
+    Successful unsafe requests get a cookie valid for ``DB_REPLICA_MAX_LAG``
+    seconds, the most a healthy replica can be behind. It is stateless, so it
+    holds across workers. Does nothing when no replicas are configured.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.DB_REPLICA_URLS
+            or scope["method"] in SAFE_METHODS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                max_age = settings.DB_REPLICA_MAX_LAG
+                cookie = (
+                    f"{PRIMARY_STICKY_COOKIE}={time.time() + max_age:.3f}; "
+                    f"Max-Age={max(1, round(max_age))}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", cookie.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,50 @@
+import base64
+import json
+import struct
+from typing import List, Sequence
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Cursor values are bound as Postgres integers, so they must fit in int4
+INT32_MIN = -(2**31)
+INT32_MAX = 2**31 - 1
+
+
+def encode_cursor(values: Sequence[int]) -> str:
+    """Encode keyset values into an opaque cursor string."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[int]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises ValueError if the cursor is malformed, has the wrong shape or holds
+    a value outside the int32 range.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(type(v) is int and INT32_MIN <= v <= INT32_MAX for v in values)
+    ):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def float_to_cursor_value(value: float) -> int:
+    """Exact int32 form of a real (float4) keyset value, for ``encode_cursor``."""
+    return struct.unpack("<i", struct.pack("<f", value))[0]
+
+
+def cursor_value_to_float(value: int) -> float:
+    """Inverse of ``float_to_cursor_value``; raises ValueError when out of range."""
+    try:
+        return struct.unpack("<f", struct.pack("<i", value))[0]
+    except struct.error as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,319 @@
+import asyncio
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Awaitable, Callable, NamedTuple, Optional, Tuple
+
+from fastapi import Request
+
+from settings import settings
+from utils.logger import get_logger
+from utils.metrics import RATE_LIMIT_REJECTIONS
+from utils.middleware import route_template
+from utils.redis_client import RedisClient, RedisError
+
+logger = get_logger()
+
+__limiter: Optional["RateLimiter"] = None
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimit(NamedTuple):
+    amount: int
+    period: float
+
+    @property
+    def interval(self) -> float:
+        return self.period / self.amount
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_at: float
+    retry_after: float
+
+
+class RateLimitExceededError(Exception):
+    """Raised by a limiter dependency when the client is over its limit."""
+
+    def __init__(self, result: RateLimitResult) -> None:
+        super().__init__("Rate limit exceeded")
+        self.result = result
+
+
+def parse_rate(spec: str) -> RateLimit:
+    """Parse limits such as ``5/minute`` or ``100/hour``."""
+    amount, _, period = spec.partition("/")
+    try:
+        return RateLimit(int(amount), PERIODS[period.strip().rstrip("s")])
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"Invalid rate limit {spec!r}") from e
+
+
+def gcra(tat: float, now: float, rate: RateLimit) -> Tuple[float, RateLimitResult]:
+    """Generic cell rate algorithm.
+
+    ``tat`` is the stored theoretical arrival time of the key (``now`` for an
+    unseen key). Returns the TAT to store and the decision. A key whose TAT
+    is in the past holds no information and can be dropped.
+    """
+    tat = max(tat, now)
+    new_tat = tat + rate.interval
+    allow_at = new_tat - rate.period
+    if allow_at - now > 1e-9:
+        return tat, RateLimitResult(False, rate.amount, 0, tat, allow_at - now)
+
+    remaining = int((now - allow_at) / rate.interval + 1e-9)
+    return new_tat, RateLimitResult(True, rate.amount, remaining, new_tat, 0.0)
+
+
+class RateLimitBackend(ABC):
+    """Storage for per-key GCRA state."""
+
+    name: str = ""
+
+    @abstractmethod
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitResult:
+        """Record a request for key and return the decision."""
+
+    async def close(self) -> None:
+        """Release any resource held by the backend."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process backend holding at most ``max_keys`` keys."""
+
+    name = "memory"
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._tats: OrderedDict[str, float] = OrderedDict()
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitResult:
+        now = time.time()
+        tat, result = gcra(self._tats.pop(key, now), now, rate)
+        self._tats[key] = tat
+
+        # Least recently seen keys sit at the front; drop idle ones and
+        # anything over the size bound.
+        while self._tats:
+            oldest_key, oldest_tat = next(iter(self._tats.items()))
+            if oldest_tat > now and len(self._tats) <= self.max_keys:
+                break
+            del self._tats[oldest_key]
+        return result
+
+
+class SharedMemoryRateLimitBackend(RateLimitBackend):
+    """Backend shared by every worker on the host through an mmap'd file.
+
+    The file is a fixed-size open-addressing table of ``(key hash, TAT)``
+    slots, so memory stays bounded. Slots with a TAT in the past are free
+    for reuse; when every probed slot is live, the one closest to expiry is
+    evicted. Access is serialized with ``flock``, taken without blocking
+    the event loop.
+    """
+
+    name = "shared"
+    SLOT = struct.Struct("<Qd")
+    PROBES = 8
+    LOCK_RETRY_MIN = 0.0001
+    LOCK_RETRY_MAX = 0.005
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self.slots = len(self._map) // self.SLOT.size
+        self.evictions = 0
+
+    @classmethod
+    def create(cls, path: str, slots: int) -> None:
+        """Create (or reset) the table file; call once before forking workers."""
+        with open(path, "wb") as f:
+            f.truncate(slots * cls.SLOT.size)
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitResult:
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        key_hash = int.from_bytes(digest, "little") or 1
+
+        await self._lock()
+        try:
+            # Read after waiting for the lock, so a slow wait cannot store a
+            # TAT computed from a time earlier than another worker's
+            now = time.time()
+            slot, tat = self._find_slot(key_hash, now)
+            tat, result = gcra(tat, now, rate)
+            self.SLOT.pack_into(self._map, slot * self.SLOT.size, key_hash, tat)
+        finally:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        return result
+
+    async def _lock(self) -> None:
+        # The lock is held for a few microseconds, so poll it with a short
+        # backoff instead of blocking the loop in flock(). Coroutines of one
+        # process share the file description and never yield while holding
+        # the lock, so only other workers can make this wait.
+        delay = 0.0
+        while True:
+            try:
+                fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                await asyncio.sleep(delay)
+                delay = min(max(delay * 2, self.LOCK_RETRY_MIN), self.LOCK_RETRY_MAX)
+
+    def _find_slot(self, key_hash: int, now: float) -> Tuple[int, float]:
+        start = key_hash % self.slots
+        free: Optional[int] = None
+        victim, victim_tat = start, float("inf")
+
+        for probe in range(self.PROBES):
+            slot = (start + probe) % self.slots
+            slot_hash, tat = self.SLOT.unpack_from(self._map, slot * self.SLOT.size)
+            if slot_hash == key_hash:
+                return slot, tat
+            if slot_hash == 0 or tat <= now:
+                if free is None:
+                    free = slot
+            elif tat < victim_tat:
+                victim, victim_tat = slot, tat
+
+        if free is not None:
+            return free, now
+        self.evictions += 1
+        return victim, now
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Backend shared across hosts through a Redis-protocol server.
+
+    The GCRA step runs as a Lua script so concurrent workers cannot race,
+    and keys expire on their own once idle. Server errors fail open.
+    """
+
+    name = "redis"
+    SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local period = tonumber(ARGV[3])
+local tat = now
+local stored = redis.call('GET', KEYS[1])
+if stored then tat = math.max(tonumber(stored), now) end
+local new_tat = tat + interval
+if new_tat - period - now <= 1e-9 then
+  local ttl = math.ceil((new_tat - now) * 1000)
+  redis.call('SET', KEYS[1], string.format('%.17g', new_tat), 'PX', ttl)
+end
+return string.format('%.17g', tat)
+"""
+    SCRIPT_SHA = hashlib.sha1(SCRIPT.encode()).hexdigest()
+
+    def __init__(self, client: RedisClient, namespace: str = "ratelimit:") -> None:
+        self.client = client
+        self.namespace = namespace
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitResult:
+        now = time.time()
+        # Full-precision floats so the script and gcra() reach the same decision
+        args = (
+            1,
+            self.namespace + key,
+            repr(now),
+            repr(rate.interval),
+            repr(float(rate.period)),
+        )
+        # Not retried on a dropped connection: the hit may already be counted
+        try:
+            try:
+                reply = await self.client.execute(
+                    "EVALSHA", self.SCRIPT_SHA, *args, idempotent=False
+                )
+            except RedisError as e:
+                if not str(e).startswith("NOSCRIPT"):
+                    raise
+                reply = await self.client.execute(
+                    "EVAL", self.SCRIPT, *args, idempotent=False
+                )
+        except (OSError, TimeoutError, RedisError) as e:
+            logger.warning("Rate limit check failed: %r", e)
+            return RateLimitResult(True, rate.amount, rate.amount, now, 0.0)
+
+        assert isinstance(reply, (bytes, str))
+        return gcra(float(reply), now, rate)[1]
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "127.0.0.1"
+
+
+class RateLimiter:
+    """Builds per-route rate limit dependencies on top of a backend."""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        key_func: Callable[[Request], str] = client_ip,
+    ) -> None:
+        self.backend = backend
+        self.key_func = key_func
+        self.rejections = 0
+
+    def limit(self, spec: str) -> Callable[[Request], Awaitable[None]]:
+        """Dependency enforcing ``spec`` per client on the route it guards."""
+        rate = parse_rate(spec)
+
+        async def check_rate_limit(request: Request) -> None:
+            scope = route_template(request.scope)
+            result = await self.backend.hit(f"{scope}:{self.key_func(request)}", rate)
+            if not result.allowed:
+                self.rejections += 1
+                RATE_LIMIT_REJECTIONS.labels(scope).inc()
+                raise RateLimitExceededError(result)
+
+        return check_rate_limit
+
+
+def shared_memory_path() -> str:
+    """Default location of the shared table for this gunicorn master."""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, f"mypy_test-ratelimit-{os.getpid()}")
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Rate limiter factory returning the process-wide limiter from settings.
+
+    The shared backend needs the table created by the gunicorn master (see
+    ``gunicorn.conf.py``); without it a single process falls back to the
+    in-memory backend.
+    """
+
+    global __limiter
+    if __limiter:
+        return __limiter
+
+    backend: RateLimitBackend
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        client = RedisClient(
+            settings.RATE_LIMIT_REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+        )
+        backend = RedisRateLimitBackend(client)
+    elif settings.RATE_LIMIT_BACKEND == "shared" and settings.RATE_LIMIT_SHM_PATH:
+        backend = SharedMemoryRateLimitBackend(settings.RATE_LIMIT_SHM_PATH)
+    else:
+        backend = MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+    __limiter = RateLimiter(backend)
+    return __limiter
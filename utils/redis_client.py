@@ -0,0 +1,172 @@
+import asyncio
+from typing import Any, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+RespValue = Union[None, int, bytes, str, List[Any]]
+
+
+class RedisError(Exception):
+    """Error reply returned by the server."""
+
+
+def encode_command(*args: Union[str, bytes, int, float]) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+class RedisConnection:
+    """One connection to the server, used by a single command at a time."""
+
+    def __init__(
+        self, host: str, port: int, db: int, password: Optional[str], timeout: float
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        try:
+            await asyncio.wait_for(self._handshake(), self.timeout)
+        except BaseException:
+            # A half set up connection would be reused as if it were ready
+            self.close()
+            raise
+
+    async def call(self, *args: Union[str, bytes, int, float]) -> RespValue:
+        """Send a command and return its decoded reply."""
+        return await asyncio.wait_for(self._call(*args), self.timeout)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+    async def _handshake(self) -> None:
+        if self.password:
+            await self._call("AUTH", self.password)
+        if self.db:
+            await self._call("SELECT", self.db)
+
+    async def _call(self, *args: Union[str, bytes, int, float]) -> RespValue:
+        assert self._reader is not None and self._writer is not None
+        self._writer.write(encode_command(*args))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self) -> RespValue:
+        assert self._reader is not None
+        line = await self._reader.readuntil(b"\r\n")
+        kind, body = line[:1], line[1:-2]
+
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise RedisError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length == -1:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(body)
+            if count == -1:
+                return None
+            return [await self._read_reply() for _ in range(count)]
+        raise RedisError(f"Unexpected reply type {kind!r}")
+
+
+class RedisClient:
+    """Minimal asyncio client speaking the Redis protocol (RESP2).
+
+    Only what the cache and rate limiter need: a pool of up to
+    ``max_connections`` lazily opened connections, so concurrent commands
+    run in parallel instead of queueing behind one socket. A connection is
+    dropped after a connection error or timeout and reopened on demand. Any
+    server that speaks RESP (Redis, Valkey, KeyDB or a local stand-in) can
+    be used.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0, max_connections: int = 10):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.password = parsed.password
+        self.timeout = timeout
+        self._idle: List[RedisConnection] = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def execute(
+        self, *args: Union[str, bytes, int, float], idempotent: bool = True
+    ) -> RespValue:
+        """Send a command on a pooled connection and return its decoded reply.
+
+        Pass ``idempotent=False`` for commands that must not run twice, such
+        as a script with side effects; they are never retried.
+        """
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else self._new_connection()
+            try:
+                reply = await self._execute(connection, args, idempotent)
+            except RedisError:
+                # The whole error reply was read, so the connection is clean
+                self._idle.append(connection)
+                raise
+            except BaseException:
+                # A reply may be left unread on the socket
+                connection.close()
+                raise
+            self._idle.append(connection)
+            return reply
+
+    async def close(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
+
+    def _new_connection(self) -> RedisConnection:
+        return RedisConnection(
+            self.host, self.port, self.db, self.password, self.timeout
+        )
+
+    async def _execute(
+        self,
+        connection: RedisConnection,
+        args: Tuple[Union[str, bytes, int, float], ...],
+        idempotent: bool,
+    ) -> RespValue:
+        reused = connection.is_open
+        try:
+            if not reused:
+                await connection.connect()
+            return await connection.call(*args)
+        except asyncio.IncompleteReadError as e:
+            connection.close()
+            if not reused or e.partial or not idempotent:
+                raise ConnectionError("Connection closed by server") from e
+
+        # The server dropped an idle connection before replying, possibly
+        # after running the command: retry once, as running it again is safe
+        try:
+            await connection.connect()
+            return await connection.call(*args)
+        except asyncio.IncompleteReadError as e:
+            raise ConnectionError("Connection closed by server") from e
@@ -0,0 +1,121 @@
+import csv
+import io
+from typing import Any, Collection, Iterable, List, Sequence, Type
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import (
+    JSON,
+    ColumnElement,
+    DateTime,
+    FromClause,
+    Row,
+    Text,
+    case,
+    cast,
+    func,
+)
+from starlette.responses import Response
+
+
+def response_columns(
+    table: FromClause, schema: Type[BaseModel]
+) -> List[ColumnElement[Any]]:
+    """Columns of ``table`` backing the fields of a response schema, in order."""
+    return named_columns(table, schema.model_fields)
+
+
+def json_columns(
+    table: FromClause, schema: Type[BaseModel]
+) -> List[ColumnElement[Any]]:
+    """``response_columns`` for documents that Postgres encodes to JSON.
+
+    Timestamps are rendered the way pydantic serializes them and JSON values
+    are re-encoded compactly, so the document matches the response schema's
+    own encoding.
+    """
+    return [
+        json_timestamp(column).label(column.name)
+        if isinstance(column.type, DateTime)
+        else compact_json(column).label(column.name)
+        if isinstance(column.type, JSON)
+        else column
+        for column in response_columns(table, schema)
+    ]
+
+
+def compact_json(column: ColumnElement[Any]) -> ColumnElement[Any]:
+    """A json or jsonb value re-encoded without whitespace, e.g. ``["a","b"]``.
+
+    ``row_to_json`` embeds json as stored and jsonb as printed, both with a
+    space after each comma; ``json_strip_nulls`` parses and writes it again.
+    It also drops null object fields, which the string arrays stored here
+    never have.
+    """
+    return func.json_strip_nulls(cast(column, JSON), type_=JSON)
+
+
+def json_timestamp(column: ColumnElement[Any]) -> ColumnElement[str]:
+    """A timestamptz as pydantic's ISO 8601 UTC form, e.g. ``2026-01-31T09:30:00.250000Z``.
+
+    Microseconds are printed as six digits and omitted when zero; NULL stays
+    NULL.
+    """
+    utc = func.timezone("UTC", column)
+    microseconds = func.to_char(utc, "US", type_=Text)
+    return (
+        func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS', type_=Text)
+        + case((microseconds == "000000", ""), else_="." + microseconds)
+        + "Z"
+    )
+
+
+def named_columns(table: FromClause, names: Iterable[str]) -> List[ColumnElement[Any]]:
+    """Columns of ``table`` by name; raises ``KeyError`` for unknown names."""
+    return [table.c[name] for name in names]
+
+
+def rows_to_json(rows: Sequence[Row], exclude: Collection[str] = ()) -> bytes:
+    """Encode selected rows straight to JSON bytes.
+
+    Column types are trusted as-is, so rows are not validated against the
+    response schema; select them with ``response_columns`` to keep the shape.
+    Columns named in ``exclude`` are selected for the caller, not the body.
+    """
+    if exclude:
+        return to_json(
+            [
+                {
+                    name: value
+                    for name, value in row._mapping.items()
+                    if name not in exclude
+                }
+                for row in rows
+            ]
+        )
+    return to_json([row._asdict() for row in rows])
+
+
+def rows_to_ndjson(rows: Sequence[Row]) -> bytes:
+    """Encode rows as newline-delimited JSON, one object per line."""
+    return b"".join(to_json(row._asdict()) + b"\n" for row in rows)
+
+
+def rows_to_csv(rows: Sequence[Row], header: bool = False) -> bytes:
+    """Encode rows as CSV; list and dict values are written as JSON."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header and rows:
+        writer.writerow(rows[0]._fields)
+    for row in rows:
+        writer.writerow(
+            to_json(value).decode() if isinstance(value, (list, dict)) else value
+            for value in row
+        )
+    return buffer.getvalue().encode()
+
+
+class RawJSONResponse(Response):
+    """JSON response whose body is already encoded."""
+
+    media_type = "application/json"